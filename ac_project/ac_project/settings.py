@@ -94,6 +94,20 @@ DATABASES = {
     # No sensitive data is ever committed to GitHub.
 }
 
+# Optional read replica / columnar copy for the mv_* reporting models
+# (see accounts_core.routers.MatViewRouter)
+ANALYTICS_DB_HOST = config("ANALYTICS_DB_HOST", default="")
+if ANALYTICS_DB_HOST:
+    DATABASES["analytics"] = {
+        **DATABASES["default"],
+        "NAME": config("ANALYTICS_DB_NAME", default=DATABASES["default"]["NAME"]),
+        "HOST": ANALYTICS_DB_HOST,
+        "PORT": config("ANALYTICS_DB_PORT", default="5432"),
+        "TEST": {"MIRROR": "default"},  # tests read the primary
+    }
+
+DATABASE_ROUTERS = ["accounts_core.routers.MatViewRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -144,6 +158,11 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "accounts_core.User"
 
+# Update AccountBalanceSnapshot in a Celery task after a journal's post()
+# commits, instead of inside post()'s transaction
+ACCOUNTS_SNAPSHOTS_ASYNC = config(
+    "ACCOUNTS_SNAPSHOTS_ASYNC", default=False, cast=bool)
+
 # Schedule background full recomputation with Celery beat
 
 
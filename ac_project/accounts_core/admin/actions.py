@@ -30,7 +30,9 @@ def post_journal_entries(
         try:
             with transaction.atomic():
                 # re-load & lock the row to avoid race conditions
-                je_locked = JournalEntry.objects.select_for_update().get(pk=je.pk)
+                # (FOR UPDATE, same lock JournalEntry.post() takes)
+                je_locked = JournalEntry.objects.select_for_update().get(
+                    pk=je.pk)
                 # call the model-level post logic (which itself is transactional/idempotent)
                 je_locked.post(user=request.user)
             success += 1
@@ -1,4 +1,5 @@
 from django import forms
+from django.forms.models import BaseInlineFormSet
 from decimal import Decimal
 from django.core.exceptions import ValidationError
 from django.contrib.auth.forms import (
@@ -102,6 +103,16 @@ class JournalLineInlineForm(forms.ModelForm):
         return cleaned
 
 
+# Inline formset for JournalLine (admin)
+class JournalLineInlineFormSet(BaseInlineFormSet):
+    def full_clean(self):
+        # Load the parent journal once for all rows
+        # before each row's model clean() runs
+        JournalLine.prefetch_parents(
+            [form.instance for form in self.forms])
+        super().full_clean()
+
+
 class FixedAssetAdminForm(forms.ModelForm):
     class Meta:
         model = FixedAsset
@@ -3,7 +3,8 @@ from django.contrib import admin
 from accounts_core.models import (BankTransactionBill, BankTransactionInvoice,
                                   BillLine, InvoiceLine, JournalLine, Account)
 
-from .forms import InvoiceLineForm, JournalLineInlineForm
+from .forms import (InvoiceLineForm, JournalLineInlineForm,
+                    JournalLineInlineFormSet)
 from .mixins import TenantAdminMixin
 
 # ---------- Helpful inline admin classes ----------
@@ -18,6 +19,7 @@ class JournalLineInline(
 
     model = JournalLine
     form = JournalLineInlineForm # Inline form for JournalLine (admin)
+    formset = JournalLineInlineFormSet  # parent journal read once per formset
     extra = 0  # don’t show “empty” rows by default (prevents clutter)
     fields = (
         "account", 
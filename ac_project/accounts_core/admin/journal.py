@@ -1,7 +1,7 @@
 from decimal import Decimal
 from django.contrib import admin
 from django.utils.html import format_html
-from django.db.models import Prefetch
+from django.db.models import Prefetch, Sum
 from .actions import post_journal_entries
 from .inlines import JournalLineInline
 from .mixins import TenantAdminMixin
@@ -60,13 +60,21 @@ class JournalEntryAdmin(TenantAdminMixin, admin.ModelAdmin):
         journalline_qs = JournalLine.objects.select_related("account")
         return qs.select_related("company", "created_by").prefetch_related(
             Prefetch("lines", queryset=journalline_qs, to_attr="prefetched_lines")
+        ).annotate(
+            # totals for the "balanced" column, computed in the list query
+            total_debit=Sum("lines__debit_local"),
+            total_credit=Sum("lines__credit_local"),
         )
 
     """ Computed column for balance check """
     # Show total debits / total credits for each journal
     def balanced(self, obj):
-        # check if entries balance with `compute_totals()` (model method)
-        d, c = obj.compute_totals()
+        # totals annotated by get_queryset(); else `compute_totals()`
+        # (model method)
+        if hasattr(obj, "total_debit"):
+            d, c = obj.total_debit, obj.total_credit
+        else:
+            d, c = obj.compute_totals()
         # format: bold debits / small credits
         return format_html(
             "<b>{}</b> / <small>{}</small>",
@@ -12,6 +12,9 @@ class PeriodAdmin(TenantAdminMixin, admin.ModelAdmin):
         "id", "company", "name", "start_date", "end_date", "is_closed")
     list_filter = ("company", "is_closed")
     search_fields = ("name",)
+    # Period has no Meta.ordering; keep the list (and FK dropdowns
+    # that use this admin) sorted by company, then chronologically
+    ordering = ("company", "start_date")
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -8,3 +8,30 @@ class AlreadyPostedDifferentPayload(Exception):
     """Raised when a JournalEntry already posted with different payload"""
 
     pass
+
+
+class ReadOnlyModelError(Exception):
+    """Raised on writes to a model maintained in SQL (mv_* reporting views)"""
+
+    pass
+
+
+def is_trigger_violation(exc, message):
+    """True if IntegrityError exc came from one of the guard triggers
+    (RAISE ... USING ERRCODE = 'check_violation', no constraint name)
+    and its message starts with message; anything else is re-raised
+    unchanged by the callers"""
+    diag = getattr(exc.__cause__, "diag", None)
+    return (
+        diag is not None
+        and diag.sqlstate == "23514"  # check_violation
+        and diag.constraint_name is None
+        and (diag.message_primary or "").startswith(message)
+    )
+
+
+def is_constraint_violation(exc, constraint_name):
+    """True if IntegrityError exc was raised by the named DB constraint
+    (FK / unique / check); same diag-based match as is_trigger_violation"""
+    diag = getattr(exc.__cause__, "diag", None)
+    return diag is not None and diag.constraint_name == constraint_name
@@ -1,5 +1,6 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.db import models
+from .exceptions import ReadOnlyModelError
 
 
 # -----------------------------------------
@@ -101,3 +102,17 @@ class UnitPriceManager(models.Manager):
             kwargs["unit_price"] = getattr(item, "default_unit_price", None)
         kwargs["item"] = item
         return super().create(**kwargs)
+
+
+# Reject ORM writes to the mv_* reporting models
+# (rows come from SQL: views, triggers, REFRESH MATERIALIZED VIEW)
+class ReadOnlyQuerySet(models.QuerySet):
+    def _read_only(self, *args, **kwargs):
+        raise ReadOnlyModelError(
+            f"{self.model.__name__} is read-only (maintained in SQL)")
+
+    create = get_or_create = update_or_create = _read_only
+    bulk_create = bulk_update = update = delete = _read_only
+
+
+ReadOnlyManager = models.Manager.from_queryset(ReadOnlyQuerySet)
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-16 09:12
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0033_bankaccount_ledger_account_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="invoiceline",
+            name="line_total",
+        ),
+        migrations.AddField(
+            model_name="invoiceline",
+            name="line_total",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("quantity"), "*", models.F("unit_price")
+                ),
+                output_field=models.DecimalField(
+                    decimal_places=2, max_digits=18),
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0034_remove_invoiceline_line_total_and_more"),
+    ]
+
+    """ Paid invoices are immutable:
+        - Row-level BEFORE UPDATE trigger, fires only when OLD.status = 'paid'
+        - Rejects changes to invoice_number, total or company_id
+        - Holds for every writer (admin, API, services, raw SQL),
+          so Invoice.clean() no longer re-reads the row to compare
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION accounts_core_invoice_paid_immutable()
+            RETURNS trigger AS $$
+            BEGIN
+                IF NEW.invoice_number IS DISTINCT FROM OLD.invoice_number
+                   OR NEW.total IS DISTINCT FROM OLD.total
+                   OR NEW.company_id IS DISTINCT FROM OLD.company_id THEN
+                    RAISE EXCEPTION 'Cannot modify a paid invoice (id=%)', OLD.id
+                        USING ERRCODE = 'check_violation';
+                END IF;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS invoice_paid_immutable ON accounts_core_invoice;
+            CREATE TRIGGER invoice_paid_immutable
+                BEFORE UPDATE ON accounts_core_invoice
+                FOR EACH ROW
+                WHEN (OLD.status = 'paid')
+                EXECUTE FUNCTION accounts_core_invoice_paid_immutable();
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS invoice_paid_immutable ON accounts_core_invoice;
+            DROP FUNCTION IF EXISTS accounts_core_invoice_paid_immutable();
+            """,
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0035_invoice_paid_immutable_trigger"),
+    ]
+
+    """ Tenant safety for invoice lines, enforced by Postgres:
+        - UNIQUE (id, company_id) on invoice / item / account
+          (redundant with the PK, but makes them composite FK targets;
+          kept out of Model.Meta so full_clean() doesn't query for them)
+        - Composite FKs from accounts_core_invoiceline so a line's
+          company_id must equal its invoice's, item's and account's
+        - Nullable item_id / account_id: MATCH SIMPLE skips the check
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE accounts_core_invoice
+                ADD CONSTRAINT uq_invoice_id_company UNIQUE (id, company_id);
+            ALTER TABLE accounts_core_item
+                ADD CONSTRAINT uq_item_id_company UNIQUE (id, company_id);
+            ALTER TABLE accounts_core_account
+                ADD CONSTRAINT uq_account_id_company UNIQUE (id, company_id);
+
+            ALTER TABLE accounts_core_invoiceline
+                ADD CONSTRAINT fk_invl_invoice_company
+                FOREIGN KEY (invoice_id, company_id)
+                REFERENCES accounts_core_invoice (id, company_id)
+                ON DELETE CASCADE;
+            ALTER TABLE accounts_core_invoiceline
+                ADD CONSTRAINT fk_invl_item_company
+                FOREIGN KEY (item_id, company_id)
+                REFERENCES accounts_core_item (id, company_id);
+            ALTER TABLE accounts_core_invoiceline
+                ADD CONSTRAINT fk_invl_account_company
+                FOREIGN KEY (account_id, company_id)
+                REFERENCES accounts_core_account (id, company_id);
+            """,
+            reverse_sql="""
+            ALTER TABLE accounts_core_invoiceline
+                DROP CONSTRAINT IF EXISTS fk_invl_account_company;
+            ALTER TABLE accounts_core_invoiceline
+                DROP CONSTRAINT IF EXISTS fk_invl_item_company;
+            ALTER TABLE accounts_core_invoiceline
+                DROP CONSTRAINT IF EXISTS fk_invl_invoice_company;
+            ALTER TABLE accounts_core_account
+                DROP CONSTRAINT IF EXISTS uq_account_id_company;
+            ALTER TABLE accounts_core_item
+                DROP CONSTRAINT IF EXISTS uq_item_id_company;
+            ALTER TABLE accounts_core_invoice
+                DROP CONSTRAINT IF EXISTS uq_invoice_id_company;
+            """,
+        ),
+    ]
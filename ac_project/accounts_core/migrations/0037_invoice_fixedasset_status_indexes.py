@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-16 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0036_invoiceline_composite_tenant_fks"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="fixedasset",
+            index=models.Index(
+                fields=["company", "status"], name="accounts_co_company_e65820_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["draft", "open", "partially_paid"])
+                ),
+                fields=["company", "status"],
+                name="inv_company_open_idx",
+            ),
+        ),
+    ]
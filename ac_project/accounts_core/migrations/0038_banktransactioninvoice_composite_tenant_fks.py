@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0037_invoice_fixedasset_status_indexes"),
+    ]
+
+    """ Tenant safety for invoice payment applications:
+        - UNIQUE (id, company_id) on banktransaction
+          (invoice's target already exists, see 0036)
+        - Composite FKs from accounts_core_banktransactioninvoice:
+          row, invoice and bank transaction all share one company_id,
+          so invoice.company = bank_transaction.company transitively
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE accounts_core_banktransaction
+                ADD CONSTRAINT uq_banktransaction_id_company
+                UNIQUE (id, company_id);
+
+            ALTER TABLE accounts_core_banktransactioninvoice
+                ADD CONSTRAINT fk_btinv_invoice_company
+                FOREIGN KEY (invoice_id, company_id)
+                REFERENCES accounts_core_invoice (id, company_id)
+                ON DELETE CASCADE;
+            ALTER TABLE accounts_core_banktransactioninvoice
+                ADD CONSTRAINT fk_btinv_bank_transaction_company
+                FOREIGN KEY (bank_transaction_id, company_id)
+                REFERENCES accounts_core_banktransaction (id, company_id)
+                ON DELETE CASCADE;
+            """,
+            reverse_sql="""
+            ALTER TABLE accounts_core_banktransactioninvoice
+                DROP CONSTRAINT IF EXISTS fk_btinv_bank_transaction_company;
+            ALTER TABLE accounts_core_banktransactioninvoice
+                DROP CONSTRAINT IF EXISTS fk_btinv_invoice_company;
+            ALTER TABLE accounts_core_banktransaction
+                DROP CONSTRAINT IF EXISTS uq_banktransaction_id_company;
+            """,
+        ),
+    ]
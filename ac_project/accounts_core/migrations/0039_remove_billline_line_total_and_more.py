@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-16 12:05
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0038_banktransactioninvoice_composite_tenant_fks"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="billline",
+            name="line_total",
+        ),
+        migrations.AddField(
+            model_name="billline",
+            name="line_total",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("quantity"), "*", models.F("unit_price")
+                ),
+                output_field=models.DecimalField(
+                    decimal_places=2, max_digits=18),
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-16 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0039_remove_billline_line_total_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="banktransactioninvoice",
+            index=models.Index(
+                fields=["invoice"],
+                include=("applied_amount",),
+                name="btinv_invoice_applied_cov",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="invoiceline",
+            index=models.Index(
+                fields=["invoice"],
+                include=("line_total",),
+                name="invl_invoice_linetotal_cov",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-16 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0040_invoiceline_btinv_covering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("status__in", ["open", "partially_paid"])),
+                fields=["company", "customer"],
+                include=("outstanding_amount",),
+                name="inv_open_ar_idx",
+            ),
+        ),
+    ]
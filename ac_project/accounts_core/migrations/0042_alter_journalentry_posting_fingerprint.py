@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-16 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0041_invoice_inv_open_ar_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="journalentry",
+            name="posting_fingerprint",
+            field=models.CharField(blank=True, max_length=80, null=True),
+        ),
+    ]
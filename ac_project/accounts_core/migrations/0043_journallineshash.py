@@ -0,0 +1,145 @@
+# Generated by Django 5.2.5 on 2026-10-16 13:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0042_alter_journalentry_posting_fingerprint"),
+    ]
+
+    """ Incremental, order-independent digest of each journal's lines:
+        - lines_hash = XOR of sha256(id|account_id|debit|credit|description)
+          over the journal's lines (line id keeps equal lines from cancelling)
+        - AFTER INSERT/UPDATE/DELETE triggers on journalline XOR the old
+          line digest out and the new one in: O(1) per line write,
+          and JournalEntry._fingerprint() reads one 32-byte row
+        - Writes that bypass save() (QuerySet.update) are tracked too,
+          so post() still detects tampering with posted lines
+        - Backfilled for existing journals with an XOR aggregate
+    """
+
+    operations = [
+        migrations.CreateModel(
+            name="JournalLinesHash",
+            fields=[
+                (
+                    "journal",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="lines_hash",
+                        serialize=False,
+                        to="accounts_core.journalentry",
+                    ),
+                ),
+                ("lines_hash", models.BinaryField(max_length=32)),
+            ],
+            options={
+                "db_table": "accounts_core_journal_lines_hash",
+                "managed": False,
+            },
+        ),
+        migrations.RunSQL(
+            r"""
+            CREATE TABLE accounts_core_journal_lines_hash (
+                journal_id bigint PRIMARY KEY
+                    REFERENCES accounts_core_journalentry (id)
+                    ON DELETE CASCADE,
+                lines_hash bytea NOT NULL
+            );
+
+            CREATE OR REPLACE FUNCTION accounts_core_bytea_xor(a bytea, b bytea)
+            RETURNS bytea AS $$
+            DECLARE
+                r bytea := a;
+            BEGIN
+                FOR i IN 0 .. length(a) - 1 LOOP
+                    r := set_byte(r, i, get_byte(a, i) # get_byte(b, i));
+                END LOOP;
+                RETURN r;
+            END;
+            $$ LANGUAGE plpgsql IMMUTABLE STRICT;
+
+            CREATE AGGREGATE accounts_core_bytea_xor_agg (bytea) (
+                SFUNC = accounts_core_bytea_xor,
+                STYPE = bytea,
+                INITCOND = '\x0000000000000000000000000000000000000000000000000000000000000000'
+            );
+
+            CREATE OR REPLACE FUNCTION accounts_core_journalline_digest(
+                line_id bigint, account_id bigint,
+                debit numeric, credit numeric, description text)
+            RETURNS bytea AS $$
+                SELECT sha256(convert_to(concat_ws('|',
+                    line_id, account_id, debit, credit,
+                    coalesce(description, '')), 'UTF8'));
+            $$ LANGUAGE sql IMMUTABLE;
+
+            CREATE OR REPLACE FUNCTION accounts_core_journalline_hash_sync()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE accounts_core_journal_lines_hash
+                    SET lines_hash = accounts_core_bytea_xor(
+                        lines_hash,
+                        accounts_core_journalline_digest(
+                            OLD.id, OLD.account_id, OLD.debit_original,
+                            OLD.credit_original, OLD.description))
+                    WHERE journal_id = OLD.journal_id;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO accounts_core_journal_lines_hash AS h
+                        (journal_id, lines_hash)
+                    VALUES (
+                        NEW.journal_id,
+                        accounts_core_journalline_digest(
+                            NEW.id, NEW.account_id, NEW.debit_original,
+                            NEW.credit_original, NEW.description))
+                    ON CONFLICT (journal_id) DO UPDATE
+                    SET lines_hash = accounts_core_bytea_xor(
+                        h.lines_hash, EXCLUDED.lines_hash);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER journalline_hash_ins_del
+                AFTER INSERT OR DELETE ON accounts_core_journalline
+                FOR EACH ROW
+                EXECUTE FUNCTION accounts_core_journalline_hash_sync();
+
+            -- only when a hashed column really changes (not is_posted)
+            CREATE TRIGGER journalline_hash_upd
+                AFTER UPDATE ON accounts_core_journalline
+                FOR EACH ROW
+                WHEN (
+                    OLD.journal_id IS DISTINCT FROM NEW.journal_id
+                    OR OLD.account_id IS DISTINCT FROM NEW.account_id
+                    OR OLD.debit_original IS DISTINCT FROM NEW.debit_original
+                    OR OLD.credit_original IS DISTINCT FROM NEW.credit_original
+                    OR OLD.description IS DISTINCT FROM NEW.description
+                )
+                EXECUTE FUNCTION accounts_core_journalline_hash_sync();
+
+            INSERT INTO accounts_core_journal_lines_hash (journal_id, lines_hash)
+            SELECT journal_id, accounts_core_bytea_xor_agg(
+                accounts_core_journalline_digest(
+                    id, account_id, debit_original,
+                    credit_original, description))
+            FROM accounts_core_journalline
+            GROUP BY journal_id;
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS journalline_hash_upd ON accounts_core_journalline;
+            DROP TRIGGER IF EXISTS journalline_hash_ins_del ON accounts_core_journalline;
+            DROP FUNCTION IF EXISTS accounts_core_journalline_hash_sync();
+            DROP FUNCTION IF EXISTS accounts_core_journalline_digest(
+                bigint, bigint, numeric, numeric, text);
+            DROP AGGREGATE IF EXISTS accounts_core_bytea_xor_agg (bytea);
+            DROP FUNCTION IF EXISTS accounts_core_bytea_xor(bytea, bytea);
+            DROP TABLE IF EXISTS accounts_core_journal_lines_hash;
+            """,
+        ),
+    ]
@@ -0,0 +1,77 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0043_journallineshash"),
+    ]
+
+    """ Tenant safety for journal lines, enforced by Postgres:
+        - UNIQUE (id, company_id) on journalentry / bill / fixedasset
+          (invoice, account, banktransaction targets exist, see 0036/0038)
+        - Composite FKs from accounts_core_journalline so a line's
+          company_id must equal its journal's, account's and any linked
+          invoice's, bill's, bank transaction's and fixed asset's
+        - Nullable links: MATCH SIMPLE skips the check when NULL
+        - Lets trusted callers save(skip_validation=True) without
+          losing the cross-company guarantee
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE accounts_core_journalentry
+                ADD CONSTRAINT uq_journalentry_id_company UNIQUE (id, company_id);
+            ALTER TABLE accounts_core_bill
+                ADD CONSTRAINT uq_bill_id_company UNIQUE (id, company_id);
+            ALTER TABLE accounts_core_fixedasset
+                ADD CONSTRAINT uq_fixedasset_id_company UNIQUE (id, company_id);
+
+            ALTER TABLE accounts_core_journalline
+                ADD CONSTRAINT fk_jl_journal_company
+                FOREIGN KEY (journal_id, company_id)
+                REFERENCES accounts_core_journalentry (id, company_id)
+                ON DELETE CASCADE;
+            ALTER TABLE accounts_core_journalline
+                ADD CONSTRAINT fk_jl_account_company
+                FOREIGN KEY (account_id, company_id)
+                REFERENCES accounts_core_account (id, company_id);
+            ALTER TABLE accounts_core_journalline
+                ADD CONSTRAINT fk_jl_invoice_company
+                FOREIGN KEY (invoice_id, company_id)
+                REFERENCES accounts_core_invoice (id, company_id);
+            ALTER TABLE accounts_core_journalline
+                ADD CONSTRAINT fk_jl_bill_company
+                FOREIGN KEY (bill_id, company_id)
+                REFERENCES accounts_core_bill (id, company_id);
+            ALTER TABLE accounts_core_journalline
+                ADD CONSTRAINT fk_jl_bank_transaction_company
+                FOREIGN KEY (bank_transaction_id, company_id)
+                REFERENCES accounts_core_banktransaction (id, company_id);
+            ALTER TABLE accounts_core_journalline
+                ADD CONSTRAINT fk_jl_fixed_asset_company
+                FOREIGN KEY (fixed_asset_id, company_id)
+                REFERENCES accounts_core_fixedasset (id, company_id);
+            """,
+            reverse_sql="""
+            ALTER TABLE accounts_core_journalline
+                DROP CONSTRAINT IF EXISTS fk_jl_fixed_asset_company;
+            ALTER TABLE accounts_core_journalline
+                DROP CONSTRAINT IF EXISTS fk_jl_bank_transaction_company;
+            ALTER TABLE accounts_core_journalline
+                DROP CONSTRAINT IF EXISTS fk_jl_bill_company;
+            ALTER TABLE accounts_core_journalline
+                DROP CONSTRAINT IF EXISTS fk_jl_invoice_company;
+            ALTER TABLE accounts_core_journalline
+                DROP CONSTRAINT IF EXISTS fk_jl_account_company;
+            ALTER TABLE accounts_core_journalline
+                DROP CONSTRAINT IF EXISTS fk_jl_journal_company;
+            ALTER TABLE accounts_core_fixedasset
+                DROP CONSTRAINT IF EXISTS uq_fixedasset_id_company;
+            ALTER TABLE accounts_core_bill
+                DROP CONSTRAINT IF EXISTS uq_bill_id_company;
+            ALTER TABLE accounts_core_journalentry
+                DROP CONSTRAINT IF EXISTS uq_journalentry_id_company;
+            """,
+        ),
+    ]
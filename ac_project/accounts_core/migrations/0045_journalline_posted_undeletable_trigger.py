@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0044_journalline_composite_tenant_fks"),
+    ]
+
+    """ Posted journal lines can't be deleted:
+        - Row-level BEFORE DELETE trigger, fires only when OLD.is_posted
+          (set on every line by JournalEntry.post())
+        - Holds for every writer (admin, API, services, QuerySet.delete(),
+          cascades from a posted JournalEntry), atomically with the DELETE,
+          so JournalLine.delete() no longer pre-checks the parent
+        - UPDATEs are not blocked here: posted-line edits are rejected
+          by JournalLine.clean(), and raw updates must still reach
+          post()'s fingerprint check (AlreadyPostedDifferentPayload)
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION accounts_core_journalline_posted_undeletable()
+            RETURNS trigger AS $$
+            BEGIN
+                RAISE EXCEPTION 'Cannot delete a posted journal line (id=%)', OLD.id
+                    USING ERRCODE = 'check_violation';
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS journalline_posted_undeletable ON accounts_core_journalline;
+            CREATE TRIGGER journalline_posted_undeletable
+                BEFORE DELETE ON accounts_core_journalline
+                FOR EACH ROW
+                WHEN (OLD.is_posted)
+                EXECUTE FUNCTION accounts_core_journalline_posted_undeletable();
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS journalline_posted_undeletable ON accounts_core_journalline;
+            DROP FUNCTION IF EXISTS accounts_core_journalline_posted_undeletable();
+            """,
+        ),
+    ]
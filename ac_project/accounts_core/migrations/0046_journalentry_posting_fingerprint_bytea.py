@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0045_journalline_posted_undeletable_trigger"),
+    ]
+
+    """ posting_fingerprint: hex text → raw bytea
+        - 32 digest bytes instead of 64 hex chars (plus varlena header)
+        - Existing sha256 hex values are decoded in place, not re-hashed
+        - A plain AlterField would cast the hex *text* to bytea,
+          so the column change is hand-written (state kept in sync)
+    """
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    r"""
+                    ALTER TABLE accounts_core_journalentry
+                        ALTER COLUMN posting_fingerprint TYPE bytea
+                        USING decode(posting_fingerprint, 'hex');
+                    """,
+                    reverse_sql=r"""
+                    ALTER TABLE accounts_core_journalentry
+                        ALTER COLUMN posting_fingerprint TYPE varchar(80)
+                        USING encode(posting_fingerprint, 'hex');
+                    """,
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="journalentry",
+                    name="posting_fingerprint",
+                    field=models.BinaryField(blank=True, max_length=32, null=True),
+                ),
+            ],
+        ),
+    ]
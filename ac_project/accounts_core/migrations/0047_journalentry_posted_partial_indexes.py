@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-16 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0046_journalentry_posting_fingerprint_bytea"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journalentry",
+            index=models.Index(
+                condition=models.Q(("status", "posted")),
+                fields=["company", "date"],
+                name="je_posted_company_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journalentry",
+            index=models.Index(
+                condition=models.Q(("status", "posted")),
+                fields=["period"],
+                name="je_posted_period_idx",
+            ),
+        ),
+    ]
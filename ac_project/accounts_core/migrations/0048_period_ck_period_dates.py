@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0047_journalentry_posted_partial_indexes"),
+    ]
+
+    """ Period dates enforced by Postgres:
+        - CHECK (start_date < end_date), same rule as Period.clean()
+        - Holds for bulk_create() / save(skip_validation=True) too
+        - Kept out of Model.Meta so full_clean() doesn't run a query
+          to evaluate it (clean() already checks it in Python)
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE accounts_core_period
+                ADD CONSTRAINT ck_period_dates CHECK (start_date < end_date);
+            """,
+            reverse_sql="""
+            ALTER TABLE accounts_core_period
+                DROP CONSTRAINT IF EXISTS ck_period_dates;
+            """,
+        ),
+    ]
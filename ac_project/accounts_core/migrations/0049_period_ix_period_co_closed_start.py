@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-16 14:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0048_period_ck_period_dates"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="period",
+            name="accounts_co_company_148470_idx",
+        ),
+        migrations.AddIndex(
+            model_name="period",
+            index=models.Index(
+                fields=["company", "is_closed", "start_date"],
+                name="ix_period_co_closed_start",
+            ),
+        ),
+    ]
@@ -0,0 +1,342 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0049_period_ix_period_co_closed_start"),
+    ]
+
+    """ Incremental period rollup instead of full REFRESH:
+        - mv_jl_agg_period becomes a plain table (same columns, same
+          md5 id, same unique grain company × period × account),
+          backfilled once from posted journal lines
+        - accounts_core_jl_agg_add() upserts a delta for one key:
+          ON CONFLICT (id) DO UPDATE SET total = total + EXCLUDED.total
+        - journalline trigger: a line of a posted journal adds its
+          amounts (INSERT), swaps old for new (UPDATE of an amount,
+          account, fx_rate or journal) or subtracts them (DELETE)
+        - journalentry trigger: entering / leaving 'posted', or a posted
+          journal changing period/date, moves all of its lines at once
+        - account trigger: code/name/type renames copied onto the rows
+        - mv_trial_balance_period and mv_pl_period become plain views
+          over the table, so nothing has to be refreshed any more
+        - last_txn_date is a high-water mark: removals don't lower it
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            DROP MATERIALIZED VIEW IF EXISTS mv_pl_period;
+            DROP MATERIALIZED VIEW IF EXISTS mv_trial_balance_period;
+            DROP MATERIALIZED VIEW IF EXISTS mv_jl_agg_period CASCADE;
+
+            CREATE TABLE mv_jl_agg_period (
+                id varchar(32) PRIMARY KEY,
+                company_id bigint NOT NULL,
+                period_id bigint,
+                last_txn_date date,
+                account_id bigint NOT NULL,
+                account_code varchar(50) NOT NULL,
+                account_name varchar(255) NOT NULL,
+                account_type varchar(50) NOT NULL,
+                total_debit_original numeric NOT NULL DEFAULT 0,
+                total_credit_original numeric NOT NULL DEFAULT 0,
+                net_amount_original numeric NOT NULL DEFAULT 0,
+                total_debit_local numeric NOT NULL DEFAULT 0,
+                total_credit_local numeric NOT NULL DEFAULT 0,
+                net_amount_local numeric NOT NULL DEFAULT 0
+            );
+
+            INSERT INTO mv_jl_agg_period
+            SELECT
+                md5(jl.company_id::text || '-' || COALESCE(je.period_id::text, '') || '-' || jl.account_id::text),
+                jl.company_id,
+                je.period_id,
+                MAX(je.date::date),
+                jl.account_id,
+                a.code,
+                a.name,
+                a.ac_type,
+                SUM(jl.debit_original),
+                SUM(jl.credit_original),
+                SUM(jl.debit_original) - SUM(jl.credit_original),
+                SUM(jl.debit_original * COALESCE(jl.fx_rate, 1.0)),
+                SUM(jl.credit_original * COALESCE(jl.fx_rate, 1.0)),
+                SUM(jl.debit_original * COALESCE(jl.fx_rate, 1.0))
+                    - SUM(jl.credit_original * COALESCE(jl.fx_rate, 1.0))
+            FROM accounts_core_journalline jl
+            JOIN accounts_core_journalentry je ON je.id = jl.journal_id
+            JOIN accounts_core_account a ON a.id = jl.account_id
+            WHERE je.status = 'posted'
+            GROUP BY jl.company_id, je.period_id, jl.account_id, a.code, a.name, a.ac_type;
+
+            CREATE UNIQUE INDEX ux_mv_jl_agg_period_company_period_account
+                ON mv_jl_agg_period (company_id, period_id, account_id);
+
+            CREATE INDEX ix_mv_jl_agg_period_company_account
+                ON mv_jl_agg_period (company_id, account_id);
+
+            -- add one (company, period, account) delta; negate to remove
+            CREATE OR REPLACE FUNCTION accounts_core_jl_agg_add(
+                p_company bigint, p_period bigint, p_account bigint,
+                p_date date, p_debit numeric, p_credit numeric,
+                p_debit_local numeric, p_credit_local numeric)
+            RETURNS void AS $$
+                INSERT INTO mv_jl_agg_period AS m
+                SELECT
+                    md5(p_company::text || '-' || COALESCE(p_period::text, '') || '-' || p_account::text),
+                    p_company, p_period, p_date, a.id, a.code, a.name, a.ac_type,
+                    p_debit, p_credit, p_debit - p_credit,
+                    p_debit_local, p_credit_local, p_debit_local - p_credit_local
+                FROM accounts_core_account a
+                WHERE a.id = p_account
+                ON CONFLICT (id) DO UPDATE SET
+                    last_txn_date = GREATEST(m.last_txn_date, EXCLUDED.last_txn_date),
+                    total_debit_original = m.total_debit_original + EXCLUDED.total_debit_original,
+                    total_credit_original = m.total_credit_original + EXCLUDED.total_credit_original,
+                    net_amount_original = m.net_amount_original + EXCLUDED.net_amount_original,
+                    total_debit_local = m.total_debit_local + EXCLUDED.total_debit_local,
+                    total_credit_local = m.total_credit_local + EXCLUDED.total_credit_local,
+                    net_amount_local = m.net_amount_local + EXCLUDED.net_amount_local;
+            $$ LANGUAGE sql;
+
+            CREATE OR REPLACE FUNCTION accounts_core_jl_agg_line_sync()
+            RETURNS trigger AS $$
+            DECLARE
+                je record;
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    SELECT status, period_id INTO je
+                    FROM accounts_core_journalentry WHERE id = OLD.journal_id;
+                    IF je.status = 'posted' THEN
+                        PERFORM accounts_core_jl_agg_add(
+                            OLD.company_id, je.period_id, OLD.account_id, NULL,
+                            -OLD.debit_original, -OLD.credit_original,
+                            -OLD.debit_original * COALESCE(OLD.fx_rate, 1.0),
+                            -OLD.credit_original * COALESCE(OLD.fx_rate, 1.0));
+                    END IF;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    SELECT status, period_id, date INTO je
+                    FROM accounts_core_journalentry WHERE id = NEW.journal_id;
+                    IF je.status = 'posted' THEN
+                        PERFORM accounts_core_jl_agg_add(
+                            NEW.company_id, je.period_id, NEW.account_id, je.date::date,
+                            NEW.debit_original, NEW.credit_original,
+                            NEW.debit_original * COALESCE(NEW.fx_rate, 1.0),
+                            NEW.credit_original * COALESCE(NEW.fx_rate, 1.0));
+                    END IF;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER journalline_jl_agg_ins_del
+                AFTER INSERT OR DELETE ON accounts_core_journalline
+                FOR EACH ROW
+                EXECUTE FUNCTION accounts_core_jl_agg_line_sync();
+
+            -- only when an aggregated column really changes (not is_posted)
+            CREATE TRIGGER journalline_jl_agg_upd
+                AFTER UPDATE ON accounts_core_journalline
+                FOR EACH ROW
+                WHEN (
+                    OLD.journal_id IS DISTINCT FROM NEW.journal_id
+                    OR OLD.company_id IS DISTINCT FROM NEW.company_id
+                    OR OLD.account_id IS DISTINCT FROM NEW.account_id
+                    OR OLD.debit_original IS DISTINCT FROM NEW.debit_original
+                    OR OLD.credit_original IS DISTINCT FROM NEW.credit_original
+                    OR OLD.fx_rate IS DISTINCT FROM NEW.fx_rate
+                )
+                EXECUTE FUNCTION accounts_core_jl_agg_line_sync();
+
+            CREATE OR REPLACE FUNCTION accounts_core_jl_agg_entry_sync()
+            RETURNS trigger AS $$
+            DECLARE
+                r record;
+            BEGIN
+                -- one upsert per account (not per line)
+                IF OLD.status = 'posted' THEN
+                    FOR r IN
+                        SELECT company_id, account_id,
+                            SUM(debit_original) AS debit,
+                            SUM(credit_original) AS credit,
+                            SUM(debit_original * COALESCE(fx_rate, 1.0)) AS debit_local,
+                            SUM(credit_original * COALESCE(fx_rate, 1.0)) AS credit_local
+                        FROM accounts_core_journalline
+                        WHERE journal_id = OLD.id
+                        GROUP BY company_id, account_id
+                    LOOP
+                        PERFORM accounts_core_jl_agg_add(
+                            r.company_id, OLD.period_id, r.account_id, NULL,
+                            -r.debit, -r.credit, -r.debit_local, -r.credit_local);
+                    END LOOP;
+                END IF;
+                IF NEW.status = 'posted' THEN
+                    FOR r IN
+                        SELECT company_id, account_id,
+                            SUM(debit_original) AS debit,
+                            SUM(credit_original) AS credit,
+                            SUM(debit_original * COALESCE(fx_rate, 1.0)) AS debit_local,
+                            SUM(credit_original * COALESCE(fx_rate, 1.0)) AS credit_local
+                        FROM accounts_core_journalline
+                        WHERE journal_id = NEW.id
+                        GROUP BY company_id, account_id
+                    LOOP
+                        PERFORM accounts_core_jl_agg_add(
+                            r.company_id, NEW.period_id, r.account_id, NEW.date::date,
+                            r.debit, r.credit, r.debit_local, r.credit_local);
+                    END LOOP;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER journalentry_jl_agg_upd
+                AFTER UPDATE ON accounts_core_journalentry
+                FOR EACH ROW
+                WHEN (
+                    (OLD.status = 'posted' OR NEW.status = 'posted')
+                    AND (
+                        OLD.status IS DISTINCT FROM NEW.status
+                        OR OLD.period_id IS DISTINCT FROM NEW.period_id
+                        OR OLD.date IS DISTINCT FROM NEW.date
+                    )
+                )
+                EXECUTE FUNCTION accounts_core_jl_agg_entry_sync();
+
+            CREATE OR REPLACE FUNCTION accounts_core_jl_agg_account_sync()
+            RETURNS trigger AS $$
+            BEGIN
+                UPDATE mv_jl_agg_period
+                SET account_code = NEW.code,
+                    account_name = NEW.name,
+                    account_type = NEW.ac_type
+                WHERE account_id = NEW.id;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER account_jl_agg_upd
+                AFTER UPDATE ON accounts_core_account
+                FOR EACH ROW
+                WHEN (
+                    OLD.code IS DISTINCT FROM NEW.code
+                    OR OLD.name IS DISTINCT FROM NEW.name
+                    OR OLD.ac_type IS DISTINCT FROM NEW.ac_type
+                )
+                EXECUTE FUNCTION accounts_core_jl_agg_account_sync();
+
+            -- same grain as the rollup: a straight projection
+            CREATE VIEW mv_trial_balance_period AS
+            SELECT
+                id,
+                company_id,
+                period_id,
+                account_id,
+                account_code,
+                account_name,
+                account_type,
+                total_debit_original AS period_debit_original,
+                total_credit_original AS period_credit_original,
+                net_amount_original AS period_balance_original,
+                total_debit_local AS period_debit_local,
+                total_credit_local AS period_credit_local,
+                net_amount_local AS period_balance_local
+            FROM mv_jl_agg_period;
+
+            CREATE VIEW mv_pl_period AS
+            SELECT
+                md5(company_id::text || '-' || COALESCE(period_id::text, '')) AS id,
+                company_id,
+                period_id,
+                SUM(CASE WHEN account_type IN ('income','revenue') THEN total_credit_original ELSE 0 END) AS total_income_original,
+                SUM(CASE WHEN account_type IN ('expense','cost') THEN total_debit_original ELSE 0 END) AS total_expense_original,
+                SUM(CASE WHEN account_type IN ('income','revenue') THEN total_credit_original ELSE 0 END)
+                    - SUM(CASE WHEN account_type IN ('expense','cost') THEN total_debit_original ELSE 0 END) AS net_profit_original,
+                SUM(CASE WHEN account_type IN ('income','revenue') THEN total_credit_local ELSE 0 END) AS total_income_local,
+                SUM(CASE WHEN account_type IN ('expense','cost') THEN total_debit_local ELSE 0 END) AS total_expense_local,
+                SUM(CASE WHEN account_type IN ('income','revenue') THEN total_credit_local ELSE 0 END)
+                    - SUM(CASE WHEN account_type IN ('expense','cost') THEN total_debit_local ELSE 0 END) AS net_profit_local
+            FROM mv_jl_agg_period
+            GROUP BY company_id, period_id;
+            """,
+            # back to the full-refresh materialized views of 0015/0016/0018
+            reverse_sql="""
+            DROP VIEW IF EXISTS mv_pl_period;
+            DROP VIEW IF EXISTS mv_trial_balance_period;
+            DROP TRIGGER IF EXISTS account_jl_agg_upd ON accounts_core_account;
+            DROP TRIGGER IF EXISTS journalentry_jl_agg_upd ON accounts_core_journalentry;
+            DROP TRIGGER IF EXISTS journalline_jl_agg_upd ON accounts_core_journalline;
+            DROP TRIGGER IF EXISTS journalline_jl_agg_ins_del ON accounts_core_journalline;
+            DROP FUNCTION IF EXISTS accounts_core_jl_agg_account_sync();
+            DROP FUNCTION IF EXISTS accounts_core_jl_agg_entry_sync();
+            DROP FUNCTION IF EXISTS accounts_core_jl_agg_line_sync();
+            DROP FUNCTION IF EXISTS accounts_core_jl_agg_add(
+                bigint, bigint, bigint, date, numeric, numeric, numeric, numeric);
+            DROP TABLE IF EXISTS mv_jl_agg_period;
+
+            CREATE MATERIALIZED VIEW mv_jl_agg_period AS
+            SELECT
+                md5(jl.company_id::text || '-' || COALESCE(je.period_id::text, '') || '-' || jl.account_id::text) AS id,
+                jl.company_id,
+                je.period_id,
+                MAX(je.date::date) AS last_txn_date,
+                jl.account_id,
+                a.code AS account_code,
+                a.name AS account_name,
+                a.ac_type AS account_type,
+                SUM(jl.debit_original) AS total_debit_original,
+                SUM(jl.credit_original) AS total_credit_original,
+                SUM(jl.debit_original) - SUM(jl.credit_original) AS net_amount_original,
+                SUM(jl.debit_original * COALESCE(jl.fx_rate, 1.0)) AS total_debit_local,
+                SUM(jl.credit_original * COALESCE(jl.fx_rate, 1.0)) AS total_credit_local,
+                SUM(jl.debit_original * COALESCE(jl.fx_rate, 1.0))
+                    - SUM(jl.credit_original * COALESCE(jl.fx_rate, 1.0)) AS net_amount_local
+            FROM accounts_core_journalline jl
+            JOIN accounts_core_journalentry je ON je.id = jl.journal_id
+            JOIN accounts_core_account a ON a.id = jl.account_id
+            WHERE je.status = 'posted'
+            GROUP BY jl.company_id, je.period_id, jl.account_id, a.code, a.name, a.ac_type;
+
+            CREATE UNIQUE INDEX ux_mv_jl_agg_period_company_period_account
+                ON mv_jl_agg_period (company_id, period_id, account_id);
+            CREATE INDEX ix_mv_jl_agg_period_company_account
+                ON mv_jl_agg_period (company_id, account_id);
+
+            CREATE MATERIALIZED VIEW mv_trial_balance_period AS
+            SELECT
+                id, company_id, period_id, account_id,
+                account_code, account_name, account_type,
+                total_debit_original AS period_debit_original,
+                total_credit_original AS period_credit_original,
+                net_amount_original AS period_balance_original,
+                total_debit_local AS period_debit_local,
+                total_credit_local AS period_credit_local,
+                net_amount_local AS period_balance_local
+            FROM mv_jl_agg_period;
+
+            CREATE UNIQUE INDEX ux_mv_trial_balance_period_company_period_account
+                ON mv_trial_balance_period (company_id, period_id, account_id);
+
+            CREATE MATERIALIZED VIEW mv_pl_period AS
+            SELECT
+                md5(company_id::text || '-' || COALESCE(period_id::text, '')) AS id,
+                company_id,
+                period_id,
+                SUM(CASE WHEN account_type IN ('income','revenue') THEN total_credit_original ELSE 0 END) AS total_income_original,
+                SUM(CASE WHEN account_type IN ('expense','cost') THEN total_debit_original ELSE 0 END) AS total_expense_original,
+                SUM(CASE WHEN account_type IN ('income','revenue') THEN total_credit_original ELSE 0 END)
+                    - SUM(CASE WHEN account_type IN ('expense','cost') THEN total_debit_original ELSE 0 END) AS net_profit_original,
+                SUM(CASE WHEN account_type IN ('income','revenue') THEN total_credit_local ELSE 0 END) AS total_income_local,
+                SUM(CASE WHEN account_type IN ('expense','cost') THEN total_debit_local ELSE 0 END) AS total_expense_local,
+                SUM(CASE WHEN account_type IN ('income','revenue') THEN total_credit_local ELSE 0 END)
+                    - SUM(CASE WHEN account_type IN ('expense','cost') THEN total_debit_local ELSE 0 END) AS net_profit_local
+            FROM mv_jl_agg_period
+            GROUP BY company_id, period_id;
+
+            CREATE UNIQUE INDEX ux_mv_pl_period_company_period
+                ON mv_pl_period (company_id, period_id);
+            """,
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.5 on 2026-10-16 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0050_mv_jl_agg_period_incremental"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="vendor",
+            name="payment_terms_days",
+            field=models.PositiveSmallIntegerField(default=30),
+        ),
+        migrations.AlterField(
+            model_name="journallineaggperiod",
+            name="company_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="journallineaggperiod",
+            name="period_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="journallineaggperiod",
+            name="account_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="trialbalanceperiod",
+            name="company_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="trialbalanceperiod",
+            name="period_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="trialbalanceperiod",
+            name="account_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="trialbalancerunning",
+            name="company_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="trialbalancerunning",
+            name="account_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="profitlossperiod",
+            name="company_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="profitlossperiod",
+            name="period_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="balancesheetrunning",
+            name="company_id",
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="balancesheetrunning",
+            name="account_id",
+            field=models.BigIntegerField(),
+        ),
+    ]
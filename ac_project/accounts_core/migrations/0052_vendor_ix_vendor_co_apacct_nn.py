@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-16 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0051_alter_vendor_payment_terms_days_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="vendor",
+            name="accounts_co_company_c1608f_idx",
+        ),
+        migrations.AddIndex(
+            model_name="vendor",
+            index=models.Index(
+                condition=models.Q(("default_ap_account__isnull", False)),
+                fields=["company", "default_ap_account"],
+                name="ix_vendor_co_apacct_nn",
+            ),
+        ),
+    ]
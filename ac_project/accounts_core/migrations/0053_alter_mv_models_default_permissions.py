@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-16 15:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0052_vendor_ix_vendor_co_apacct_nn"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="balancesheetrunning",
+            options={
+                "default_permissions": (),
+                "managed": False,
+                "verbose_name": "Balance Sheet Running",
+                "verbose_name_plural": "Balance Sheet Running Records",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="journallineaggperiod",
+            options={
+                "default_permissions": (),
+                "managed": False,
+                "verbose_name": "Journal Line Period Aggregate",
+                "verbose_name_plural": "Journal Line Period Aggregate Records",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="profitlossperiod",
+            options={
+                "default_permissions": (),
+                "managed": False,
+                "verbose_name": "Profit & Loss Period",
+                "verbose_name_plural": "Profit & Loss Period Records",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="trialbalanceperiod",
+            options={
+                "default_permissions": (),
+                "managed": False,
+                "verbose_name": "Trial Balance Period",
+                "verbose_name_plural": "Trial Balance Period Records",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="trialbalancerunning",
+            options={
+                "default_permissions": (),
+                "managed": False,
+                "verbose_name": "Trial Balance Running",
+                "verbose_name_plural": "Trial Balance Running Records",
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0053_alter_mv_models_default_permissions"),
+    ]
+
+    """ Tenant safety for balance snapshots, enforced by Postgres:
+        - Composite FK (account_id, company_id) -> account (id, company_id)
+          (UNIQUE target from 0036/0038), same pattern as 0044
+        - A snapshot can't point at another company's account, for every
+          writer (save(), bulk_create, raw SQL)
+        - AccountBalanceSnapshot.clean() no longer loads the account
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE accounts_core_accountbalancesnapshot
+                ADD CONSTRAINT fk_abs_account_company
+                FOREIGN KEY (account_id, company_id)
+                REFERENCES accounts_core_account (id, company_id);
+            """,
+            reverse_sql="""
+            ALTER TABLE accounts_core_accountbalancesnapshot
+                DROP CONSTRAINT IF EXISTS fk_abs_account_company;
+            """,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-16 16:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0054_accountbalancesnapshot_composite_tenant_fk"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="period",
+            options={},
+        ),
+    ]
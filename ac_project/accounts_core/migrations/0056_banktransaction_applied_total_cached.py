@@ -0,0 +1,38 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0055_alter_period_options"),
+    ]
+
+    """ BankTransaction.applied_total_cached
+        - Denormalized SUM(applied_amount) of the invoice and bill
+          join rows, kept current by the payment services' UPDATEs
+        - Backfilled once from the existing join rows
+    """
+
+    operations = [
+        migrations.AddField(
+            model_name="banktransaction",
+            name="applied_total_cached",
+            field=models.DecimalField(
+                decimal_places=2, default=Decimal("0.00"), max_digits=18
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE accounts_core_banktransaction bt
+               SET applied_total_cached =
+                   COALESCE((SELECT SUM(bti.applied_amount)
+                               FROM accounts_core_banktransactioninvoice bti
+                              WHERE bti.bank_transaction_id = bt.id), 0)
+                 + COALESCE((SELECT SUM(btb.applied_amount)
+                               FROM accounts_core_banktransactionbill btb
+                              WHERE btb.bank_transaction_id = bt.id), 0);
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,51 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_payment_fingerprint(apps, schema_editor):
+    BankTransactionInvoice = apps.get_model(
+        "accounts_core", "BankTransactionInvoice")
+    JournalEntry = apps.get_model("accounts_core", "JournalEntry")
+    # Same key as services.posting._payment_fingerprint()
+    entries = []
+    for bti in BankTransactionInvoice.objects.filter(
+            journal_entry__isnull=False).only(
+                "bank_transaction_id", "invoice_id", "applied_amount",
+                "journal_entry_id"):
+        payload = (f"{bti.bank_transaction_id}|{bti.invoice_id}|"
+                   f"{bti.applied_amount:.2f}")
+        entries.append(JournalEntry(
+            pk=bti.journal_entry_id,
+            payment_fingerprint=hashlib.blake2b(
+                payload.encode(), digest_size=16).digest(),
+        ))
+    JournalEntry.objects.bulk_update(
+        entries, ["payment_fingerprint"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0056_banktransaction_applied_total_cached"),
+    ]
+
+    """ JournalEntry.payment_fingerprint
+        - Idempotency key of a payment JE (bank transaction, invoice,
+          amount), looked up through its unique index
+        - Backfilled from the BankTransactionInvoice rows that already
+          link a journal entry
+    """
+
+    operations = [
+        migrations.AddField(
+            model_name="journalentry",
+            name="payment_fingerprint",
+            field=models.BinaryField(
+                blank=True, max_length=16, null=True, unique=True
+            ),
+        ),
+        migrations.RunPython(
+            backfill_payment_fingerprint,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-16 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts_core", "0057_journalentry_payment_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journalentry",
+            index=models.Index(
+                fields=["source_type", "source_id"], name="je_source_idx"
+            ),
+        ),
+    ]
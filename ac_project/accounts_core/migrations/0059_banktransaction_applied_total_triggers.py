@@ -0,0 +1,84 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0058_journalentry_je_source_idx"),
+    ]
+
+    """ BankTransaction.applied_total_cached, maintained by Postgres:
+        - AFTER INSERT/UPDATE/DELETE triggers on the invoice and bill
+          join rows add NEW.applied_amount / subtract OLD.applied_amount
+          on the referenced bank transaction
+        - Holds for every writer (admin edits and deletes, bulk_create,
+          QuerySet.update/delete), so the counter can't drift from the
+          rows it sums; the payment services only set the status
+        - Re-backfilled here from the join rows (0056 only kept it
+          current on the service paths)
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION accounts_core_bt_applied_total_sync()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE accounts_core_banktransaction
+                    SET applied_total_cached = applied_total_cached - OLD.applied_amount
+                    WHERE id = OLD.bank_transaction_id;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    UPDATE accounts_core_banktransaction
+                    SET applied_total_cached = applied_total_cached + NEW.applied_amount
+                    WHERE id = NEW.bank_transaction_id;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER btinv_applied_total_ins_del
+                AFTER INSERT OR DELETE ON accounts_core_banktransactioninvoice
+                FOR EACH ROW
+                EXECUTE FUNCTION accounts_core_bt_applied_total_sync();
+            -- only when the summed columns really change (not journal_entry)
+            CREATE TRIGGER btinv_applied_total_upd
+                AFTER UPDATE ON accounts_core_banktransactioninvoice
+                FOR EACH ROW
+                WHEN (
+                    OLD.bank_transaction_id IS DISTINCT FROM NEW.bank_transaction_id
+                    OR OLD.applied_amount IS DISTINCT FROM NEW.applied_amount
+                )
+                EXECUTE FUNCTION accounts_core_bt_applied_total_sync();
+
+            CREATE TRIGGER btbill_applied_total_ins_del
+                AFTER INSERT OR DELETE ON accounts_core_banktransactionbill
+                FOR EACH ROW
+                EXECUTE FUNCTION accounts_core_bt_applied_total_sync();
+            CREATE TRIGGER btbill_applied_total_upd
+                AFTER UPDATE ON accounts_core_banktransactionbill
+                FOR EACH ROW
+                WHEN (
+                    OLD.bank_transaction_id IS DISTINCT FROM NEW.bank_transaction_id
+                    OR OLD.applied_amount IS DISTINCT FROM NEW.applied_amount
+                )
+                EXECUTE FUNCTION accounts_core_bt_applied_total_sync();
+
+            UPDATE accounts_core_banktransaction bt
+               SET applied_total_cached =
+                   COALESCE((SELECT SUM(bti.applied_amount)
+                               FROM accounts_core_banktransactioninvoice bti
+                              WHERE bti.bank_transaction_id = bt.id), 0)
+                 + COALESCE((SELECT SUM(btb.applied_amount)
+                               FROM accounts_core_banktransactionbill btb
+                              WHERE btb.bank_transaction_id = bt.id), 0);
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS btbill_applied_total_upd ON accounts_core_banktransactionbill;
+            DROP TRIGGER IF EXISTS btbill_applied_total_ins_del ON accounts_core_banktransactionbill;
+            DROP TRIGGER IF EXISTS btinv_applied_total_upd ON accounts_core_banktransactioninvoice;
+            DROP TRIGGER IF EXISTS btinv_applied_total_ins_del ON accounts_core_banktransactioninvoice;
+            DROP FUNCTION IF EXISTS accounts_core_bt_applied_total_sync();
+            """,
+        ),
+    ]
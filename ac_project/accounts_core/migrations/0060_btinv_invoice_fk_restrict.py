@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0059_banktransaction_applied_total_triggers"),
+    ]
+
+    """ fk_btinv_invoice_company (0038): ON DELETE CASCADE → RESTRICT
+        - A payment applied to an invoice must never be removed by the
+          invoice's DELETE: with CASCADE, a payment committed between
+          Invoice.delete()'s check and its DELETE went silently with it
+        - RESTRICT rejects that DELETE instead; ORM cascades are
+          unaffected (Django's collector deletes join rows before the
+          invoice they reference)
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE accounts_core_banktransactioninvoice
+                DROP CONSTRAINT IF EXISTS fk_btinv_invoice_company;
+            ALTER TABLE accounts_core_banktransactioninvoice
+                ADD CONSTRAINT fk_btinv_invoice_company
+                FOREIGN KEY (invoice_id, company_id)
+                REFERENCES accounts_core_invoice (id, company_id)
+                ON DELETE RESTRICT;
+            """,
+            reverse_sql="""
+            ALTER TABLE accounts_core_banktransactioninvoice
+                DROP CONSTRAINT IF EXISTS fk_btinv_invoice_company;
+            ALTER TABLE accounts_core_banktransactioninvoice
+                ADD CONSTRAINT fk_btinv_invoice_company
+                FOREIGN KEY (invoice_id, company_id)
+                REFERENCES accounts_core_invoice (id, company_id)
+                ON DELETE CASCADE;
+            """,
+        ),
+    ]
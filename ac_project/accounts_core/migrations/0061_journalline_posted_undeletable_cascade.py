@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0060_btinv_invoice_fk_restrict"),
+    ]
+
+    """ journalline_posted_undeletable (0045) lets parent deletes through:
+        - A posted line whose journal row is already gone is being
+          removed by that journal's cascade (fk_jl_journal_company,
+          or a company delete): allowed
+        - Deleting a posted line on its own still raises
+        - Django's collector deletes lines before their journal, so the
+          JournalEntry pre_delete receiver (signals.py) clears is_posted
+          on the journal's lines first, in the same transaction
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION accounts_core_journalline_posted_undeletable()
+            RETURNS trigger AS $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM accounts_core_journalentry
+                    WHERE id = OLD.journal_id
+                ) THEN
+                    RETURN OLD;
+                END IF;
+                RAISE EXCEPTION 'Cannot delete a posted journal line (id=%)', OLD.id
+                    USING ERRCODE = 'check_violation';
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="""
+            CREATE OR REPLACE FUNCTION accounts_core_journalline_posted_undeletable()
+            RETURNS trigger AS $$
+            BEGIN
+                RAISE EXCEPTION 'Cannot delete a posted journal line (id=%)', OLD.id
+                    USING ERRCODE = 'check_violation';
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def backfill_snapshots_applied(apps, schema_editor):
+    JournalEntry = apps.get_model("accounts_core", "JournalEntry")
+    # Journals posted so far already had their snapshot refresh
+    JournalEntry.objects.filter(status="posted").update(
+        snapshots_applied=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0061_journalline_posted_undeletable_cascade"),
+    ]
+
+    """ JournalEntry.snapshots_applied
+        - Set by update_snapshots_for_journal() in the same transaction
+          as the balance UPDATE: a second run (retried or duplicated
+          Celery task, sync + async) finds it set and adds nothing
+        - Backfilled True for journals already posted
+    """
+
+    operations = [
+        migrations.AddField(
+            model_name="journalentry",
+            name="snapshots_applied",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(
+            backfill_snapshots_applied,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts_core", "0062_journalentry_snapshots_applied"),
+    ]
+
+    """ Paid bills are immutable, like invoices (0035):
+        - Row-level BEFORE UPDATE trigger, fires only when OLD.status = 'paid'
+        - Rejects changes to bill_number, total or company_id
+        - Holds for writers that skip Bill.clean() too
+          (Bill.bulk_recalc_totals(), queryset updates, raw SQL)
+    """
+
+    operations = [
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION accounts_core_bill_paid_immutable()
+            RETURNS trigger AS $$
+            BEGIN
+                IF NEW.bill_number IS DISTINCT FROM OLD.bill_number
+                   OR NEW.total IS DISTINCT FROM OLD.total
+                   OR NEW.company_id IS DISTINCT FROM OLD.company_id THEN
+                    RAISE EXCEPTION 'Cannot modify a paid bill (id=%)', OLD.id
+                        USING ERRCODE = 'check_violation';
+                END IF;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS bill_paid_immutable ON accounts_core_bill;
+            CREATE TRIGGER bill_paid_immutable
+                BEFORE UPDATE ON accounts_core_bill
+                FOR EACH ROW
+                WHEN (OLD.status = 'paid')
+                EXECUTE FUNCTION accounts_core_bill_paid_immutable();
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS bill_paid_immutable ON accounts_core_bill;
+            DROP FUNCTION IF EXISTS accounts_core_bill_paid_immutable();
+            """,
+        ),
+    ]
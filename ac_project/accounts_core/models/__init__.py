@@ -9,7 +9,7 @@ from .entitymembership import Company, EntityMembership, User
 from .fixed_asset import FixedAsset
 from .invoice import BankTransactionInvoice, Invoice, InvoiceLine
 from .item import Item
-from .journal import JournalEntry, JournalLine
+from .journal import JournalEntry, JournalLine, JournalLinesHash
 from .matview import (BalanceSheetRunning, JournalLineAggPeriod,
                       ProfitLossPeriod, TrialBalancePeriod,
                       TrialBalanceRunning)
@@ -114,6 +114,8 @@ class Account(models.Model):
             models.UniqueConstraint(
                 fields=["company", "code"], name="uq_company_account_code"
             )
+            # + UNIQUE (id, company_id) target for InvoiceLine's composite
+            # tenant FKs, created in migration 0036 (DB-only: no full_clean query)
         ]
 
     def __str__(self):
@@ -21,6 +21,13 @@ BT_STATUS_CHOICES = [
     ("fully_applied", "Fully applied"),
 ]
 
+# Current state vs. allowed next states (built once at import)
+BT_STATUS_TRANSITIONS = {
+    "unapplied": frozenset({"partially_applied", "fully_applied"}),
+    "partially_applied": frozenset({"fully_applied"}),
+    "fully_applied": frozenset(),  # "fully_applied" → (no further transitions)
+}
+
 
 # ---------- Banking ----------
 
@@ -80,6 +87,12 @@ class BankTransaction(
     status = models.CharField(
         max_length=20, choices=BT_STATUS_CHOICES, default="unapplied"
     )  # other statuses: partially_applied, fully_applied
+    # Running sum of applied_amount over invoice + bill applications,
+    # kept by DB triggers on both join tables (migration 0059): never
+    # written from Python, so no SUM on the hot path and no drift
+    applied_total_cached = models.DecimalField(
+        max_digits=18, decimal_places=2, default=Decimal("0.00")
+    )
     reference = models.CharField(max_length=200, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
 
@@ -100,6 +113,8 @@ class BankTransaction(
             models.UniqueConstraint(
                 fields=["company", "reference"], name="uq_bt_company_ref"
             )
+            # + UNIQUE (id, company_id) target for BankTransactionInvoice's
+            # composite tenant FKs, created in migration 0038 (DB-only)
         ]
 
     def clean(self):  # auto-runs when you call full_clean() before saving
@@ -119,15 +134,10 @@ class BankTransaction(
         # Only check related rows
         # if this transaction already saved/exists in DB
         if self.pk:
-            from .invoice import BankTransactionInvoice
-
             # Applied amount check - ensure sum of applied <= amount
-            # Find all join rows
-            # where this bank transaction was applied against invoices
-            sumOfApplied = models.Sum("applied_amount")
-            applied = BankTransactionInvoice.objects.filter(
-                bank_transaction=self
-            ).aggregate(total=sumOfApplied)["total"] or Decimal("0")
+            # (invoice + bill applications, same total the payment
+            # services guard on)
+            applied = self.applied_total()
 
             # Prevent over-allocation:
             # you can’t apply more than actual bank transaction’s amount
@@ -137,6 +147,17 @@ class BankTransaction(
 
     def save(self, *args, **kwargs):
         self.full_clean()  # run validations before saving
+        # applied_total_cached belongs to the triggers: an instance loaded
+        # before a payment must not write its stale value back
+        if not self._state.adding:
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                update_fields = [
+                    f.name for f in self._meta.concrete_fields
+                    if not f.primary_key]
+            kwargs["update_fields"] = [
+                name for name in update_fields
+                if name != "applied_total_cached"]
         return super().save(*args, **kwargs)
 
     # Show something human-readable in Django Admin
@@ -148,22 +169,16 @@ class BankTransaction(
         status = self.status
         return f"{bacn} - {payd} - {amt} {ccode} ({status})"
 
-    """How much of this transaction has been applied to invoices?"""
+    """How much of this transaction has been applied to invoices and bills?"""
 
     def applied_total(self):
-        return self.banktransactioninvoice_set.aggregate(
-            total=models.Sum("applied_amount")
-        )["total"] or Decimal("0.00")
+        # current trigger-kept column (one value, no SUM over join rows)
+        return BankTransaction._base_manager.filter(pk=self.pk).values_list(
+            "applied_total_cached", flat=True).first() or Decimal("0.00")
 
     def transition_to(self, new_status):
-        # Current state vs. allowed next states
-        allowed = {
-            "unapplied": ["partially_applied", "fully_applied"],
-            "partially_applied": ["fully_applied"],
-            "fully_applied": [],  # "fully_applied" → (no further transitions)
-        }
         # Look up what states are allowed from current self.status
-        if new_status not in allowed.get(self.status, []):
+        if new_status not in BT_STATUS_TRANSITIONS.get(self.status, frozenset()):
             # If requested new_status isn’t allowed → block it
             raise ValidationError(
                 f"Cannot go from {self.status} to {new_status}")
@@ -1,18 +1,36 @@
 from decimal import Decimal
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from ..exceptions import is_trigger_violation
 from ..managers import TenantManager, UnitPriceManager
 from .account import Account
 from .entitymembership import Company
 from .item import Item
+from .mixins import TenantFKMixin
 from .vendor import Vendor
 
+# Shared constants for the totals hot paths (built once at import)
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+MONEY = models.DecimalField(max_digits=18, decimal_places=2)
+# Message prefix of the bill_paid_immutable trigger (migration 0063)
+BILL_PAID_TRIGGER_MESSAGE = "Cannot modify a paid bill"
+
 BILL_STATUS_CHOICES = [
     ("draft", "Draft"),
     ("posted", "Posted"),
     ("paid", "Paid"),
 ]
 
+# Current state vs. allowed next states (built once at import)
+BILL_STATUS_TRANSITIONS = {
+    "draft": frozenset({"posted"}),
+    "posted": frozenset({"paid"}),
+    "paid": frozenset(),  # "paid" → (no further transitions)
+}
+
 # ---------- Bills / BillLines ----------
 
 # Header represents vendor bill (Accounts Payable document)
@@ -71,6 +89,8 @@ class Bill(models.Model):
                 fields=["company", "bill_number"],
                 name="uq_bill_company_number"
             )
+            # + UNIQUE (id, company_id) target for JournalLine's composite
+            # tenant FKs, created in migration 0044 (DB-only)
         ]
 
     def __str__(self):
@@ -82,23 +102,57 @@ class Bill(models.Model):
 
     def recalc_totals(self):  # Recompute bill totals every time
         # Defined bill FK with related_name="lines" on BillLine model
-        lines = (
-            self.lines.all()
-        )  # So, reverse relation `lines` auto-created on Bill model
-        # Calculate sum of all BillLine.line_totals
-        total = sum((line.line_total for line in lines), Decimal("0.00"))
+        # So, reverse relation `lines` auto-created on Bill model
+        # Let the DB sum BillLine.line_totals (one row back, no line objects)
+        total = self.lines.aggregate(t=Coalesce(
+            Sum("line_total"), ZERO, output_field=MONEY))["t"]
         self.total = total  # Set total
 
         from .banking import BankTransactionBill as BtBill
 
         # Sum of all applied payments
-        paid = sum(
-            bt.applied_amount for bt in BtBill.objects.filter(bill=self)
-        )
+        paid = BtBill.objects.filter(bill=self).aggregate(
+            p=Coalesce(Sum("applied_amount"), ZERO,
+                       output_field=MONEY))["p"]
 
         # Calculate outstanding_amount = total - sum(payments applied)
         # if payments overshoot for any reason, it caps at 0, not negative
-        self.outstanding_amount = max(total - paid, Decimal("0.00"))
+        # quantize once at the boundary: always 2-decimal scale
+        self.outstanding_amount = max(total - paid, ZERO).quantize(CENT)
+
+    """ Recompute totals for many bills in one UPDATE statement
+    (month-end runs, imports) """
+
+    @classmethod
+    def bulk_recalc_totals(cls, bill_ids):
+        from .banking import BankTransactionBill as BtBill
+
+        zero = Value(ZERO, output_field=MONEY)
+        # Correlated per-bill sums, evaluated inside the UPDATE
+        line_sum = (
+            BillLine.objects.filter(bill=OuterRef("pk"))
+            .values("bill").annotate(t=Sum("line_total")).values("t")
+        )
+        paid_sum = (
+            BtBill.objects.filter(bill=OuterRef("pk"))
+            .values("bill").annotate(p=Sum("applied_amount")).values("p")
+        )
+        total = Coalesce(Subquery(line_sum, output_field=MONEY), zero)
+        paid = Coalesce(Subquery(paid_sum, output_field=MONEY), zero)
+        try:
+            # savepoint keeps the caller's transaction usable on failure
+            with transaction.atomic():
+                return cls._base_manager.filter(pk__in=bill_ids).update(
+                    total=total,
+                    # caps at 0, same as recalc_totals()
+                    outstanding_amount=Greatest(total - paid, zero),
+                )
+        except IntegrityError as exc:
+            # bill_paid_immutable trigger: a paid bill's total moved
+            if not is_trigger_violation(exc, BILL_PAID_TRIGGER_MESSAGE):
+                raise
+            raise ValidationError(
+                "Cannot modify total on a paid bill.") from exc
 
     def clean(self):
         """Make paid bills immutable in all code paths
@@ -155,14 +209,8 @@ class Bill(models.Model):
         return super().delete(*args, **kwargs)
 
     def transition_to(self, new_status):
-        # Current state vs. allowed next states
-        allowed = {
-            "draft": ["posted"],
-            "posted": ["paid"],
-            "paid": [],  # "paid" → (no further transitions)
-        }
         # Look up what states are allowed from current self.status
-        if new_status not in allowed.get(self.status, []):
+        if new_status not in BILL_STATUS_TRANSITIONS.get(self.status, frozenset()):
             # If requested new_status isn’t allowed → block it
             raise ValidationError(
                 f"Cannot go from {self.status} to {new_status}")
@@ -173,7 +221,7 @@ class Bill(models.Model):
 
 
 class BillLine(
-    models.Model
+    TenantFKMixin, models.Model
 ):  # Detail line represents individual items/services on the bill
 
     # Belongs to both a company and its parent bill
@@ -200,8 +248,11 @@ class BillLine(
     unit_price = models.DecimalField(
         max_digits=18, decimal_places=4, default=Decimal("0.00")
     )
-    line_total = models.DecimalField(
-        max_digits=18, decimal_places=2, default=Decimal("0.00")
+    # Computed and stored by the database on every insert/update
+    line_total = models.GeneratedField(
+        expression=F("quantity") * F("unit_price"),
+        output_field=models.DecimalField(max_digits=18, decimal_places=2),
+        db_persist=True,
     )
 
     # Posts to the correct expense (or inventory/asset) account in the GL
@@ -241,33 +292,23 @@ class BillLine(
         if self.unit_price < 0:  # Unit price must be non-negative
             raise ValidationError("Unit price must be >= 0")
 
-        # line_total must equal quantity * unit_price
-        selfQty = self.quantity
-        selfUP = self.unit_price
-        expected = (selfQty or Decimal("0")) * (selfUP or Decimal("0"))
-        # If it doesn’t, it recalculates (self-healing)
-        if self.line_total != expected:
-            self.line_total = expected
-
-        # Tenant safety check
-        # Never dereference self.bill directly unless bill_id exists
+        # Tenant safety check: compare *_id values, never load the rows
         billId = getattr(self, "bill_id", None)
         comId = getattr(self, "company_id", None)
         if billId and comId:
-            """safely obtain parent company_id from DB"""
-            bill_company_id = (
-                Bill.objects.only("company_id").get(pk=self.bill_id).company_id
-            )
+            """company_id of bill, item and account in one query
+            (memoized per FK value after the first read)"""
+            companies = self._fk_company_ids("bill", "item", "account")
             # Only raise a tenant-mismatch error if both sides are known
-            if self.company_id != bill_company_id:
+            if self.company_id != companies["bill"]:
                 raise ValidationError(
                     "BillLine.company must match Bill.company")
             # Check for tenant-mismatch in item
-            if self.company_id != self.item.company_id:
+            if self.item_id and companies["item"] != self.company_id:
                 raise ValidationError(
                     "BillLine.company must match Item.company")
             # Check for tenant-mismatch in account
-            if self.company_id != self.account.company_id:
+            if self.account_id and companies["account"] != self.company_id:
                 raise ValidationError(
                     "BillLine.company must match Account.company")
 
@@ -278,10 +319,7 @@ class BillLine(
         comId = getattr(self, "company_id", None)
         billId = getattr(self, "bill_id", None)
         if not comId and billId:
-            self.company_id = (
-                Bill.objects.only("company_id").get(pk=self.bill_id).company_id
-            )
-        # Force line_total to be recomputed before save, regardless of input
-        self.line_total = (self.quantity or 0) * (self.unit_price or 0)
+            # same cached read that clean() reuses below
+            self.company_id = self._fk_company_id("bill")
         self.full_clean()  # Run all validations in clean() again
         return super().save(*args, **kwargs)  # Then finally save
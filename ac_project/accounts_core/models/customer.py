@@ -66,7 +66,11 @@ class Customer(models.Model):
         return self.name
 
     def clean(self):
-        ar = self.default_ar_account
+        # One narrow read of the AR account (or the attached instance)
+        ar = self._default_ar_account()
+        if self.default_ar_account_id and ar is None:
+            raise ValidationError("Default AR account does not exist")
+
         # Ensure AR account belongs to the same company
         if (
             ar
@@ -84,6 +88,19 @@ class Customer(models.Model):
 
         return super().clean()
 
+    def _default_ar_account(self):
+        """AR account with just the columns clean() needs:
+        cached instance if attached, else one query"""
+        if not self.default_ar_account_id:
+            return None
+        if Customer.default_ar_account.is_cached(self):
+            return self.default_ar_account
+        return Account.objects.only(
+            "company_id", "is_control_account"
+        ).filter(pk=self.default_ar_account_id).first()
+
     def save(self, *args, **kwargs):
-        self.full_clean()  # run validations before saving
+        # run validations before saving; clean() already reads the AR
+        # account, so skip the FK's separate existence query
+        self.full_clean(exclude=["default_ar_account"])
         return super().save(*args, **kwargs)
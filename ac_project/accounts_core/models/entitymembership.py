@@ -177,28 +177,27 @@ class EntityMembership(
         has a membership for that company.  Allow the current (unsaved)
         EntityMembership being validated to satisfy that requirement.
         """
-        if self.user and self.user.default_company:
-            # Use PKs for comparisons to avoid instance vs int mismatch
-            default_company_pk = getattr(self.user.default_company, "pk", None)
-
-            # Collect existing membership company_ids for the user, 
-            if self.pk:
-                existing_company_ids = list(
-                    # excluding this record if updating
-                    self.user.memberships.exclude(pk=self.pk).values_list("company_id", flat=True)
-                )
-            else:
-                existing_company_ids = list(
-                    self.user.memberships.values_list("company_id", flat=True)
-                )
-
-            # The default company must be among existing memberships of the user.
-            # If not, allow it if the current (unsaved) membership is for that company.
-            current_company_pk = getattr(self.company, "pk", None)
-            if default_company_pk not in existing_company_ids and default_company_pk != current_company_pk:
-                raise ValidationError(
-                    f"Default company {self.user.default_company} must be a user's membership."
-                )
+        if not self.user_id:
+            return
+        # Use PKs for comparisons to avoid instance vs int mismatch
+        default_company_pk = self.user.default_company_id
+        # The current (unsaved) membership satisfies the rule by itself
+        if not default_company_pk or default_company_pk == self.company_id:
+            return
+
+        # Otherwise the default company must be among the user's other
+        # memberships: one EXISTS on the (user, company) unique index
+        has_membership = (
+            EntityMembership.objects.filter(
+                user_id=self.user_id, company_id=default_company_pk)
+            # excluding this record if updating
+            .exclude(pk=self.pk)
+            .exists()
+        )
+        if not has_membership:
+            raise ValidationError(
+                f"Default company {self.user.default_company} must be a user's membership."
+            )
 
     def save(self, *args, **kwargs):
         self.full_clean()  # run validations before saving
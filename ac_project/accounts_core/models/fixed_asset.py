@@ -4,12 +4,13 @@ from django.db import models
 from ..managers import TenantManager
 from .account import Account
 from .entitymembership import Company
+from .mixins import TenantFKMixin
 from .vendor import Vendor
 
 
 # ---------- Fixed Assets ----------
 class FixedAsset(
-    models.Model
+    TenantFKMixin, models.Model
 ):  # tracks long-term assets and handle depreciation over time
     # Each fixed asset belongs to a company (multi-tenant)
     company = models.ForeignKey(Company, on_delete=models.CASCADE)
@@ -71,7 +72,11 @@ class FixedAsset(
     class Meta:
         # Index makes lookup faster by company, asset_code
         # (since assets are often tracked by code)
-        indexes = [models.Index(fields=["company", "asset_code"])]
+        indexes = [
+            models.Index(fields=["company", "asset_code"]),
+            # Asset lists filtered by lifecycle state (e.g. capitalized)
+            models.Index(fields=["company", "status"]),
+        ]
 
         constraints = [
             # Within one company, each fixed asset must be unique
@@ -80,6 +85,8 @@ class FixedAsset(
                 fields=["company", "asset_code"],
                 name="uq_fa_company_asset_code"
             )
+            # + UNIQUE (id, company_id) target for JournalLine's composite
+            # tenant FKs, created in migration 0044 (DB-only)
         ]
 
     def __str__(self):
@@ -87,12 +94,14 @@ class FixedAsset(
         return self.description
 
     def clean(self):
-        # Tenancy checks
+        # Tenancy checks (compare ids, never hydrate the related rows):
+        # account's and vendor's company_id in one query
+        companies = self._fk_company_ids("account", "vendor")
         # Ensure account chosen belongs to the same company
-        if self.account and self.account.company != self.company:
+        if self.account_id and companies["account"] != self.company_id:
             raise ValidationError("Account must belong to the same company.")
         # Ensure vendor chosen belongs to the same company
-        if self.vendor and self.vendor.company != self.company:
+        if self.vendor_id and companies["vendor"] != self.company_id:
             raise ValidationError("Vendor must belong to the same company.")
 
         # Prevent assets from being marked as depreciable
@@ -1,12 +1,16 @@
 from decimal import Decimal
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from ..exceptions import is_constraint_violation, is_trigger_violation
 from ..managers import TenantManager, UnitPriceManager
 from .account import Account
 from .banking import BankTransaction
 from .customer import Customer
 from .entitymembership import Company
 from .item import Item
+from .mixins import TenantFKMixin
 
 INV_STATUS_CHOICES = [
     ("draft", "Draft"),
@@ -15,6 +19,31 @@ INV_STATUS_CHOICES = [
     ("paid", "Paid"),
 ]
 
+# Current state vs. allowed next states (built once at import)
+INV_STATUS_TRANSITIONS = {
+    "draft": frozenset({"open"}),
+    "open": frozenset({"paid"}),
+    "paid": frozenset(),  # "paid" → (no further transitions)
+}
+
+# Derived columns: saving only these needs no re-validation
+INV_TOTAL_FIELDS = frozenset({"total", "outstanding_amount"})
+
+# Shared constants for the totals hot paths (built once at import)
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+MONEY = models.DecimalField(max_digits=18, decimal_places=2)
+
+# Columns frozen once an invoice is paid (attnames, stable order)
+INV_IMMUTABLE_FIELDS = ("invoice_number", "total", "company_id")
+# ... as update_fields may spell them (field names or attnames)
+INV_IMMUTABLE_NAMES = frozenset(
+    INV_IMMUTABLE_FIELDS + ("company",))
+# Load-time snapshot kept for clean()'s paid-invoice check (attnames)
+INV_SNAPSHOT_FIELDS = INV_IMMUTABLE_FIELDS + ("status",)
+# Message prefix of the invoice_paid_immutable trigger (migration 0035)
+INV_PAID_TRIGGER_MESSAGE = "Cannot modify a paid invoice"
+
 
 class Invoice(models.Model):  # Represents a customer invoice
 
@@ -70,6 +99,20 @@ class Invoice(models.Model):  # Represents a customer invoice
         indexes = [
             models.Index(fields=["company", "invoice_number"]),
             models.Index(fields=["company", "customer"]),
+            # Unpaid-invoice lists; partial, so paid rows stay out of it
+            models.Index(
+                fields=["company", "status"],
+                condition=models.Q(
+                    status__in=["draft", "open", "partially_paid"]),
+                name="inv_company_open_idx",
+            ),
+            # Outstanding-AR reports: index-only sum per customer
+            models.Index(
+                fields=["company", "customer"],
+                include=["outstanding_amount"],
+                condition=models.Q(status__in=["open", "partially_paid"]),
+                name="inv_open_ar_idx",
+            ),
         ]
 
         constraints = [
@@ -79,6 +122,8 @@ class Invoice(models.Model):  # Represents a customer invoice
                 fields=["company", "invoice_number"],
                 name="uq_invoice_company_number"
             )
+            # + UNIQUE (id, company_id) target for InvoiceLine's composite
+            # tenant FKs, created in migration 0036 (DB-only: no full_clean query)
         ]
 
     def __str__(self):
@@ -93,39 +138,124 @@ class Invoice(models.Model):  # Represents a customer invoice
         # safe to call only when invoice has a pk (or okay to return zeros)
         # guard if no pk: there are no lines yet
         if not getattr(self, "pk", None):
-            self.total = Decimal("0.00")
-            self.outstanding_amount = Decimal("0.00")
+            self.total = ZERO
+            self.outstanding_amount = ZERO
             return
 
         # Defined invoice FK with related_name="lines" on InvoiceLine model
-        lines = (
-            self.lines.all()
-        )  # So, reverse relation `lines` auto-created on Invoice model
-        # Calculate sum of all InvoiceLine.line_totals
-        total = sum((line.line_total for line in lines), Decimal("0.00"))
+        # So, reverse relation `lines` auto-created on Invoice model
+        # Let the DB sum InvoiceLine.line_totals (one row back, no line objects)
+        total = self.lines.aggregate(t=Coalesce(
+            Sum("line_total"), ZERO, output_field=MONEY))["t"]
         self.total = total  # Set total
 
         # Sum of all applied payments
-        paid = sum(
-            bt.applied_amount
-            for bt in BankTransactionInvoice.objects.filter(invoice=self)
-        )
+        paid = BankTransactionInvoice.objects.filter(invoice=self).aggregate(
+            p=Coalesce(Sum("applied_amount"), ZERO,
+                       output_field=MONEY))["p"]
 
         # Calculate outstanding_amount = total - sum(payments applied)
         # if payments overshoot for any reason, it caps at 0, not negative
-        self.outstanding_amount = max(total - paid, Decimal("0.00"))
+        # quantize once at the boundary: always 2-decimal scale
+        self.outstanding_amount = max(total - paid, ZERO).quantize(CENT)
+
+    """ Recompute totals for many invoices in one UPDATE statement
+    (line signals, batch payment runs) """
+
+    @classmethod
+    def bulk_recalc_totals(cls, invoice_ids):
+        zero = Value(ZERO, output_field=MONEY)
+        # Correlated per-invoice sums, evaluated inside the UPDATE
+        line_sum = (
+            InvoiceLine.objects.filter(invoice=OuterRef("pk"))
+            .values("invoice").annotate(t=Sum("line_total")).values("t")
+        )
+        paid_sum = (
+            BankTransactionInvoice.objects.filter(invoice=OuterRef("pk"))
+            .values("invoice").annotate(p=Sum("applied_amount")).values("p")
+        )
+        total = Coalesce(Subquery(line_sum, output_field=MONEY), zero)
+        paid = Coalesce(Subquery(paid_sum, output_field=MONEY), zero)
+        try:
+            # savepoint keeps the caller's transaction usable on failure
+            with transaction.atomic():
+                return cls._base_manager.filter(pk__in=invoice_ids).update(
+                    total=total,
+                    # caps at 0, same as recalc_totals()
+                    outstanding_amount=Greatest(total - paid, zero),
+                )
+        except IntegrityError as exc:
+            # invoice_paid_immutable trigger: a paid invoice's total moved
+            if not is_trigger_violation(exc, INV_PAID_TRIGGER_MESSAGE):
+                raise
+            raise ValidationError(
+                "Cannot modify total on a paid invoice.") from exc
+
+    """ Sync one invoice's stored totals without loading or saving it
+    (line CRUD hooks): no SELECT, no full-row UPDATE """
+
+    @classmethod
+    def refresh_totals_in_db(cls, pk):
+        return cls.bulk_recalc_totals([pk])
+
+    """ Refresh every invoice touched by a batch of payment applications
+    (bank statement imports): one UPDATE instead of a save() per invoice """
+
+    @classmethod
+    def apply_payments_bulk(cls, bt_inv_rows):
+        invoice_ids = {row.invoice_id for row in bt_inv_rows if row.invoice_id}
+        if not invoice_ids:
+            return 0
+        return cls.bulk_recalc_totals(invoice_ids)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot the guarded columns as loaded (deferred ones are skipped)
+        instance._loaded_values = {
+            name: value
+            for name, value in zip(field_names, values)
+            if name in INV_SNAPSHOT_FIELDS
+        }
+        return instance
+
+    def _reset_loaded_values(self, names=None):
+        """Move the load-time snapshot to the current values once they
+        match the row (after save() / refresh_from_db()); names: the
+        fields just written or read, None = every loaded field"""
+        attnames = None if names is None else {
+            getattr(self._meta.get_field(name), "attname", name)
+            for name in names}
+        deferred = self.get_deferred_fields()
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        for attname in INV_SNAPSHOT_FIELDS:
+            if attname in deferred:
+                loaded.pop(attname, None)
+            elif attnames is None or attname in attnames:
+                loaded[attname] = getattr(self, attname)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(
+            using=using, fields=fields, from_queryset=from_queryset)
+        self._reset_loaded_values(fields)
 
     def clean(self):
         """Make paid invoices immutable in all code paths
         (admin, DRF API, custom services)"""
-        # If object already exists and is paid, prevent edits
-        if self.pk and self.status == "paid":
-            orig = Invoice.objects.get(pk=self.pk)
-            changed_fields = []
-            for field in ["invoice_number", "total", "company"]:
-                # Check for edits
-                if getattr(orig, field) != getattr(self, field):
-                    changed_fields.append(field)
+        # Compare against the load-time snapshot: no SELECT.
+        # Rows not fetched from the DB are still guarded by the
+        # invoice_paid_immutable trigger (migration 0035)
+        # Whatever the loaded status: moving to paid may change the
+        # status only, never an immutable field in the same save (the
+        # trigger only sees rows that were already paid)
+        loaded = getattr(self, "_loaded_values", None)
+        if self.pk and self.status == "paid" and loaded:
+            changed_fields = [
+                attname.removesuffix("_id")
+                for attname in INV_IMMUTABLE_FIELDS
+                if attname in loaded and
+                loaded[attname] != getattr(self, attname)
+            ]
             if changed_fields:
                 raise ValidationError(
                     f"Cannot modify {changed_fields} on a paid invoice."
@@ -133,7 +263,8 @@ class Invoice(models.Model):  # Represents a customer invoice
 
     """ Prevent “dirty totals” or “negative receivables” from persisting """
 
-    def save(self, *args, **kwargs):
+    @transaction.atomic
+    def save(self, *args, skip_validation=False, **kwargs):
         """If this is a new invoice (no pk yet),
         persist it first so inlines can reference it safely"""
         is_new = not bool(self.pk)
@@ -144,40 +275,89 @@ class Invoice(models.Model):  # Represents a customer invoice
                     "Customer must belong to the same company.")
             # Save parent first to get a PK.
             super().save(*args, **kwargs)
+            self._reset_loaded_values()
             return
 
         """ Existing invoice
                 Recompute before saving """
-        self.recalc_totals()
+        # Let update_fields say what actually gets written:
+        # - only totals: caller already computed them (signals, payments)
+        # - no totals: recomputing them would not be persisted anyway
+        # - validation covers just the written columns (see _clean_written)
+        update_fields = kwargs.get("update_fields")
+        written = None if update_fields is None else set(update_fields)
+        skip_recalc = skip_validation or written is not None and (
+            written <= INV_TOTAL_FIELDS
+            or written.isdisjoint(INV_TOTAL_FIELDS)
+        )
+        # Otherwise always recomputed: this save writes the totals, and
+        # only the aggregates see line / payment writes made through
+        # queryset updates, bulk paths or other workers
+        if not skip_recalc:
+            self.recalc_totals()
         # ensure outstanding_amount non-negative
         if self.outstanding_amount < 0:
             # important, otherwise credits/payments could accidentally
             # overpay an invoice and mess up reporting
             raise ValidationError("Outstanding amount cannot be negative")
-        self.full_clean()  # will trigger clean()
-        # Then saves normally
-        super().save(*args, **kwargs)
+        if skip_validation:
+            pass
+        elif written is None:
+            self.full_clean()  # will trigger clean()
+        else:
+            self._clean_written(written)
+        """ Paid invoices are immutable: enforced by the
+        invoice_paid_immutable DB trigger (migration 0035) """
+        try:
+            # Then saves normally; on failure the method's own atomic
+            # block rolls back, keeping the caller's transaction usable
+            super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            # only the paid-invoice trigger's error; unique / FK
+            # violations keep their own IntegrityError
+            if not is_trigger_violation(exc, INV_PAID_TRIGGER_MESSAGE):
+                raise
+            raise ValidationError(
+                "Cannot modify invoice_number, total or company "
+                "on a paid invoice.") from exc
+        # the row now holds what was written: next clean() compares to it
+        self._reset_loaded_values(written)
+
+    def _clean_written(self, written):
+        """full_clean() for an update_fields save: field validators
+        (e.g. status choices) and constraints of the written columns only"""
+        exclude = {
+            f.name for f in self._meta.concrete_fields
+            if f.name not in written and f.attname not in written
+        }
+        self.clean_fields(exclude=exclude)
+        # clean() guards the immutable columns of a paid invoice: only
+        # needed when one is written (the trigger backs it up anyway)
+        if not written.isdisjoint(INV_IMMUTABLE_NAMES):
+            self.clean()
+        self.validate_unique(exclude=exclude)
+        self.validate_constraints(exclude=exclude)
 
     """ Prevent deleting invoices that already have payments applied """
 
     def delete(self, *args, **kwargs):
-        BtInv = BankTransactionInvoice
-        has_payments = BtInv.objects.filter(invoice=self).exists()
-        if has_payments:
+        # No pre-check here: the pre_delete signal rejects invoices with
+        # payments, and fk_btinv_invoice_company (RESTRICT, migration
+        # 0060) rejects the DELETE if one was committed since
+        # Void or credit an invoice, instead of deleting it outright
+        try:
+            # savepoint keeps the caller's transaction usable on failure
+            with transaction.atomic():
+                return super().delete(*args, **kwargs)
+        except IntegrityError as exc:
+            if not is_constraint_violation(exc, "fk_btinv_invoice_company"):
+                raise
             raise ValidationError(
-                "Cannot delete an invoice with applied payments.")
-            # Void or credit an invoice, instead of deleting it outright
-        return super().delete(*args, **kwargs)
+                "Cannot delete an invoice with applied payments.") from exc
 
     def transition_to(self, new_status):
-        # Current state vs. allowed next states
-        allowed = {
-            "draft": ["open"],
-            "open": ["paid"],
-            "paid": [],  # "paid" → (no further transitions)
-        }
         # Look up what states are allowed from current self.status
-        if new_status not in allowed.get(self.status, []):
+        if new_status not in INV_STATUS_TRANSITIONS.get(self.status, frozenset()):
             # If requested new_status isn’t allowed → block it
             raise ValidationError(
                 f"Cannot go from {self.status} to {new_status}")
@@ -188,7 +368,7 @@ class Invoice(models.Model):  # Represents a customer invoice
 
 
 class InvoiceLine(
-    models.Model
+    TenantFKMixin, models.Model
 ):  # Each line describes a product/service sold on the invoice
 
     # Line belongs to both company and parent invoice
@@ -214,8 +394,11 @@ class InvoiceLine(
     unit_price = models.DecimalField(
         max_digits=18, decimal_places=4, default=Decimal("0.00")
     )
-    line_total = models.DecimalField(
-        max_digits=18, decimal_places=2, default=Decimal("0.00")
+    # Computed and stored by the database on every insert/update
+    line_total = models.GeneratedField(
+        expression=F("quantity") * F("unit_price"),
+        output_field=models.DecimalField(max_digits=18, decimal_places=2),
+        db_persist=True,
     )
 
     # Post to the correct revenue GL account
@@ -237,6 +420,12 @@ class InvoiceLine(
         indexes = [
             models.Index(fields=["company", "invoice"]),
             models.Index(fields=["company", "account"]),
+            # Covers SUM(line_total) per invoice: index-only scan
+            models.Index(
+                fields=["invoice"],
+                include=["line_total"],
+                name="invl_invoice_linetotal_cov",
+            ),
         ]
 
         # Ensure quantity & unit_price are never negative
@@ -255,64 +444,104 @@ class InvoiceLine(
         selfLt = self.line_total
         return f"Invoice: {selfInvNo} - Item: {selfItem} - Total: {selfLt}"
 
-    """ Ensure individual line amounts are valid """
+    """ Ensure line stays inside its tenant
+    (non-negative amounts: invl_non_negative_amounts constraint) """
 
     def clean(self):
-        if (
-            self.quantity is not None and self.quantity < 0
-        ):  # Quantity must be non-negative
-            raise ValidationError("Quantity must be >= 0")
-        if (
-            self.unit_price is not None and self.unit_price < 0
-        ):  # Unit price must be non-negative
-            raise ValidationError("Unit price must be >= 0")
-
-        # compute expected total
-        selfQty = self.quantity
-        selfUp = self.unit_price
-        expected = (selfQty or Decimal("0")) * (selfUp or Decimal("0"))
-        # If it doesn’t, it recalculates (self-healing)
-        if self.line_total != expected:
-            self.line_total = expected
-
-        # Tenant safety:
-        # Never dereference self.invoice directly unless invoice_id exists
-        comId = getattr(self, "company_id", None)
-        invId = getattr(self, "invoice_id", None)
-        if comId and invId:
-            """safely obtain parent company_id from DB"""
-            selfInv = self.invoice_id
-            inv_company_id = (
-                Invoice.objects.only("company_id").get(pk=selfInv).company_id
-            )
-            # Only raise a tenant-mismatch error if both sides are known
-            if self.company_id != inv_company_id:
+        # Tenant safety is enforced by the composite FKs
+        # (invoice_id|item_id|account_id, company_id) from migration 0036.
+        # Here: friendly errors from whatever is already in memory, no SELECTs
+        if not self.company_id:
+            return
+        companies = self._fk_company_ids(
+            "invoice", "item", "account", fetch=False)
+        if companies["invoice"] is not None and \
+                self.company_id != companies["invoice"]:
+            raise ValidationError(
+                "InvoiceLine.company must match Invoice.company")
+        # Check for tenant-mismatch in item
+        if companies["item"] is not None and \
+                self.company_id != companies["item"]:
+            raise ValidationError(
+                "InvoiceLine.company must match Item.company")
+        # Check for tenant-mismatch in account
+        if companies["account"] is not None and \
+                self.company_id != companies["account"]:
+            raise ValidationError(
+                "InvoiceLine.company must match Account.company")
+
+    """ Validate many lines at once (imports, bulk_create paths) """
+
+    @classmethod
+    def bulk_validate(cls, lines):
+        # One IN query per related table instead of lazy FK reads per line
+        inv_ids = {line.invoice_id for line in lines if line.invoice_id}
+        item_ids = {line.item_id for line in lines if line.item_id}
+        acc_ids = {line.account_id for line in lines if line.account_id}
+        inv_companies = dict(
+            Invoice.objects.filter(pk__in=inv_ids)
+            .values_list("pk", "company_id"))
+        item_companies = dict(
+            Item.objects.filter(pk__in=item_ids)
+            .values_list("pk", "company_id"))
+        acc_companies = dict(
+            Account.objects.filter(pk__in=acc_ids)
+            .values_list("pk", "company_id"))
+
+        # Pure in-memory tenancy comparisons
+        for line in lines:
+            if not line.invoice_id:
+                continue
+            inv_company_id = inv_companies.get(line.invoice_id)
+            if inv_company_id is None:
+                raise ValidationError(
+                    f"Invoice {line.invoice_id} does not exist")
+            # cache for a later save()/clean() on the same instance
+            line._prime_fk_company_id("invoice", inv_company_id)
+            if not line.company_id:
+                line.company_id = inv_company_id
+            if line.company_id != inv_company_id:
                 raise ValidationError(
                     "InvoiceLine.company must match Invoice.company")
-            # Check for tenant-mismatch in item
-            if self.company_id != self.item.company_id:
+            if line.item_id and \
+                    item_companies.get(line.item_id) != line.company_id:
                 raise ValidationError(
                     "InvoiceLine.company must match Item.company")
-            # Check for tenant-mismatch in account
-            if self.company_id != self.account.company_id:
+            if line.account_id and \
+                    acc_companies.get(line.account_id) != line.company_id:
                 raise ValidationError(
                     "InvoiceLine.company must match Account.company")
 
+    """ Create many lines for one invoice (imports):
+    bulk INSERT, no per-line full_clean() / signals """
+
+    @classmethod
+    def bulk_create_for(cls, invoice, specs, batch_size=1000):
+        # specs: dicts of InvoiceLine field values (item, quantity, ...)
+        lines = [
+            cls(invoice=invoice, company_id=invoice.company_id, **spec)
+            for spec in specs
+        ]
+        for line in lines:
+            # per-field validators only; FK checks are batched below
+            line.clean_fields(
+                exclude=["company", "invoice", "item", "account"])
+        cls.bulk_validate(lines)
+        with transaction.atomic():
+            created = cls.objects.bulk_create(lines, batch_size=batch_size)
+            # bulk_create skips post_save: sync parent totals once
+            Invoice.refresh_totals_in_db(invoice.pk)
+        return created
+
     """ Ensure no inconsistent invoice line can ever be persisted """
 
+    @transaction.atomic
     def save(self, *args, **kwargs):
         comId = getattr(self, "company_id", None)
         invId = getattr(self, "invoice_id", None)
-        # copy company_id from DB if invoice_id is present
+        # copy company_id from parent invoice if invoice_id is present
         if not comId and invId:
-            selfInv = self.invoice_id
-            self.company_id = (
-                Invoice.objects.only("company_id").get(pk=selfInv).company_id
-            )
-        # compute line_total always
-        self.line_total = (self.quantity or Decimal("0")) * (
-            self.unit_price or Decimal("0")
-        )
+            self.company_id = self._fk_company_id("invoice")
         # Run validation, this will call clean()
         self.full_clean()
         return super().save(*args, **kwargs)
@@ -344,6 +573,12 @@ class BankTransactionInvoice(
         indexes = [
             models.Index(fields=["company", "bank_transaction"]),
             models.Index(fields=["company", "invoice"]),
+            # Covers SUM(applied_amount) per invoice: index-only scan
+            models.Index(
+                fields=["invoice"],
+                include=["applied_amount"],
+                name="btinv_invoice_applied_cov",
+            ),
         ]
 
         constraints = [
@@ -371,40 +606,54 @@ class BankTransactionInvoice(
         # basic applied_amount checks
         if self.applied_amount is None:
             return  # let required-field validators handle it
-
-        if self.applied_amount < 0:
-            raise ValidationError("Applied must be non-negative")
+        # negative amounts: bt_inv_non_negative_amounts constraint
 
         # only check outstanding_amount when invoice is set
         if self.invoice_id:
-            if self.applied_amount > self.invoice.outstanding_amount:
+            if BankTransactionInvoice.invoice.is_cached(self) and \
+                    self.invoice.pk == self.invoice_id:
+                remaining = self.invoice.outstanding_amount
+            else:
+                # one column, no Invoice hydration
+                remaining = Invoice.objects.filter(
+                    pk=self.invoice_id).values_list(
+                    "outstanding_amount", flat=True).first()
+            if remaining is not None and self.applied_amount > remaining:
                 raise ValidationError("Applied amount cannot exceed invoice outstanding")
 
-        # attempt to infer company_id from provided relations (do not access related object if id is None)
-        inferred_company_id = None
-        if self.company_id:
-            inferred_company_id = self.company_id
-        elif self.bank_transaction_id:
-            inferred_company_id = self.bank_transaction.company_id
-        elif self.invoice_id:
-            inferred_company_id = self.invoice.company_id
-
-        # if both bank_transaction and company are present, ensure they match
-        if self.bank_transaction_id and self.company_id:
-            if self.bank_transaction.company_id != self.company_id:
-                raise ValidationError("Bank transaction must belong to the same company.")
-
-        # if invoice provided and company present, ensure they match
-        if self.invoice_id and self.company_id:
-            if self.invoice.company_id != self.company_id:
-                raise ValidationError("Invoice must belong to the same company.")
-
-        # if both invoice and bank_transaction exist, they must match
-        if self.invoice_id and self.bank_transaction_id:
-            if self.invoice.company_id != self.bank_transaction.company_id:
-                raise ValidationError("Invoice and BankTransaction must belong to same company")
-
-        # if nothing is known about company yet, it's okay; model/DB-level validators should catch missing company where required
+        # Tenant safety is enforced by the composite FKs
+        # (invoice_id|bank_transaction_id, company_id) from migration 0038,
+        # which also makes invoice and bank transaction share a company.
+        # Here: friendly errors from parents already in memory, no SELECTs
+        cls = BankTransactionInvoice
+        if self.company_id and self.bank_transaction_id and \
+                cls.bank_transaction.is_cached(self) and \
+                self.bank_transaction.company_id != self.company_id:
+            raise ValidationError("Bank transaction must belong to the same company.")
+        if self.company_id and self.invoice_id and \
+                cls.invoice.is_cached(self) and \
+                self.invoice.company_id != self.company_id:
+            raise ValidationError("Invoice must belong to the same company.")
+
+    """ Validate many applications at once (batch payment runs) """
+
+    @classmethod
+    def bulk_validate(cls, applications):
+        # One IN query per parent table, then in-memory clean() per row
+        invoices = Invoice.objects.only(
+            "company", "outstanding_amount").in_bulk(
+            {ap.invoice_id for ap in applications if ap.invoice_id})
+        bank_txs = BankTransaction.objects.only("company").in_bulk(
+            {ap.bank_transaction_id for ap in applications
+             if ap.bank_transaction_id})
+        for ap in applications:
+            if ap.invoice_id in invoices:
+                ap.invoice = invoices[ap.invoice_id]
+            if ap.bank_transaction_id in bank_txs:
+                ap.bank_transaction = bank_txs[ap.bank_transaction_id]
+            if not ap.company_id and ap.bank_transaction_id in bank_txs:
+                ap.company_id = ap.bank_transaction.company_id
+            ap.clean()
 
     def save(self, *args, **kwargs):
         # If company not set, try to infer from bank_transaction or invoice (this helps admin inline)
@@ -422,7 +671,7 @@ class BankTransactionInvoice(
         # After save: apply payment only once, 
         # only when applied_amount > 0 and no journal_entry saved yet.
         # Use a simple guard: if journal_entry is already set, skip.
-        if self.applied_amount and self.applied_amount > Decimal("0.00") and not self.journal_entry:
+        if self.applied_amount and self.applied_amount > ZERO and not self.journal_entry_id:
             # avoid recursion: check a flag or journal_entry presence
             from ..services.payment import apply_payment_to_invoice
             # attach optional executer metadata (admin view can set _applied_by_user)
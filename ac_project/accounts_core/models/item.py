@@ -1,6 +1,6 @@
 from decimal import Decimal
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from ..managers import TenantManager
 from .account import Account
 from .entitymembership import Company
@@ -53,7 +53,7 @@ class Item(models.Model):  # Represents something a company sells & purchases
     on_hand_quantity = models.DecimalField(
         max_digits=14,
         decimal_places=4,  # Allow precise tracking
-        default=0,  # Default = 0
+        default=Decimal("0.0"),  # Default = 0 (Decimal, like the column)
     )
 
     # store standard prices per product
@@ -73,6 +73,8 @@ class Item(models.Model):  # Represents something a company sells & purchases
             models.UniqueConstraint(
                 fields=["company", "sku"], name="uq_company_item_sku"
             )
+            # + UNIQUE (id, company_id) target for InvoiceLine's composite
+            # tenant FKs, created in migration 0036 (DB-only: no full_clean query)
         ]
 
     def __str__(self):
@@ -82,19 +84,67 @@ class Item(models.Model):  # Represents something a company sells & purchases
     but point it to an Account from Company B """
 
     def clean(self):
-        sac = self.sales_account
-        if sac and sac.company_id != self.company_id:
+        # One lookup for both accounts' company_id (or none if cached)
+        companies = self._account_company_ids()
+        if self.sales_account_id and \
+                companies.get(self.sales_account_id) != self.company_id:
             raise ValidationError(
                 "Sales account must belong to the same company as the item."
             )
-        if (
-            self.purchase_account
-            and self.purchase_account.company_id != self.company_id
-        ):
+        if self.purchase_account_id and \
+                companies.get(self.purchase_account_id) != self.company_id:
             raise ValidationError(
                 "Purchase account must belong to the same company as the item."
             )
 
+    def _account_company_ids(self):
+        """{account pk: company_id} for sales/purchase accounts"""
+        # Pre-filled by bulk_save() for a whole batch
+        companies = getattr(self, "_account_companies", None)
+        if companies is not None:
+            return companies
+        companies = {}
+        missing = set()
+        for name in ("sales_account", "purchase_account"):
+            acc_id = getattr(self, f"{name}_id")
+            if not acc_id:
+                continue
+            # Reuse an account object the caller already attached
+            if getattr(Item, name).is_cached(self):
+                companies[acc_id] = getattr(self, name).company_id
+            else:
+                missing.add(acc_id)
+        if missing:
+            companies.update(
+                Account.objects.filter(pk__in=missing)
+                .values_list("pk", "company_id"))
+        return companies
+
+    """ Save many items (imports, seed data) with one Account query """
+
+    @classmethod
+    def bulk_save(cls, items):
+        acc_ids = {
+            acc_id
+            for item in items
+            for acc_id in (item.sales_account_id, item.purchase_account_id)
+            if acc_id
+        }
+        companies = dict(
+            Account.objects.filter(pk__in=acc_ids)
+            .values_list("pk", "company_id"))
+        with transaction.atomic():
+            for item in items:
+                item._account_companies = companies
+                try:
+                    item.save()
+                finally:
+                    # batch map only; later saves look up afresh
+                    del item._account_companies
+        return items
+
     def save(self, *args, **kwargs):
-        self.full_clean()  # run validations before saving
+        # Account FKs: clean() checks existence + tenancy in one query,
+        # so skip Django's per-FK existence SELECTs
+        self.full_clean(exclude=["sales_account", "purchase_account"])
         return super().save(*args, **kwargs)
@@ -3,10 +3,11 @@ import json
 from decimal import ROUND_HALF_UP, Decimal
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
-from django.db.models import Sum
-from ..exceptions import AlreadyPostedDifferentPayload, UnbalancedJournalError
+from django.db.models import Count, F, Q, Sum
+from ..exceptions import (AlreadyPostedDifferentPayload,
+                          UnbalancedJournalError, is_trigger_violation)
 from ..managers import JournalLineCurrencyManager, TenantManager
 from .account import Account
 from .currency import Currency
@@ -15,6 +16,34 @@ from .period import Period
 from ..services.audit_helper import log_action
 from ..services.periods import resolve_period
 
+
+def _to_local(amount, rate):
+    """amount * rate rounded half-up to cents.
+
+    Amounts carry 2 decimal places and fx_rate 6, so the product is
+    done on scaled ints (cents * micro-units) and only the result is
+    turned back into a Decimal. Anything wider falls back to Decimal.
+    """
+    if rate == 1:
+        return amount
+    a, r = Decimal(amount), Decimal(rate)
+    if a.as_tuple().exponent < -2 or r.as_tuple().exponent < -6:
+        return (a * r).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    scaled = int(a * 100) * int(r * 1_000_000)
+    # half-up = away from zero on ties, like ROUND_HALF_UP
+    cents = (abs(scaled) + 500_000) // 1_000_000
+    return Decimal(cents if scaled >= 0 else -cents).scaleb(-2)
+
+
+# Lines referencing an invoice / bill / fixed asset must post to a
+# control account: (FK attname, message), checked by clean()
+CONTROL_ACCOUNT_RULES = (
+    ("invoice_id", "Invoice postings must use a control AR account."),
+    ("bill_id", "Bill postings must use a control AP account."),
+    ("fixed_asset_id", "Fixed asset postings must use a control account."),
+)
+
+
 JOURNAL_STATUS = [
     ("draft", "Draft"),  # still editable
     ("ready", "Ready"),  # validated but not yet posted
@@ -61,8 +90,17 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
     )  # Helps trace back where the JE originated
     source_id = models.BigIntegerField(null=True, blank=True)
     # Fingerprint-based idempotency (safe to call twice if nothing has changed)
-    posting_fingerprint = models.CharField(
-        max_length=64, null=True, blank=True)
+    # raw sha256 digest (hashlib goes through OpenSSL: SHA-NI where the
+    # CPU has it)
+    posting_fingerprint = models.BinaryField(
+        max_length=32, null=True, blank=True)
+    # Payment JEs only: 16-byte blake2b of "bank_tx|invoice|amount"
+    # (idempotency key: one unique-index probe instead of a lines join)
+    payment_fingerprint = models.BinaryField(
+        max_length=16, null=True, blank=True, unique=True)
+    # Balance snapshots already include this journal's lines
+    # (set once by update_snapshots_for_journal, makes it idempotent)
+    snapshots_applied = models.BooleanField(default=False)
 
     # Enforce tenant scoping
     objects = TenantManager()
@@ -73,6 +111,21 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
         indexes = [
             models.Index(fields=["company", "date"]),
             models.Index(fields=["company", "status"]),
+            # Posted-only lists/reports by date (partial: drafts excluded)
+            models.Index(
+                fields=["company", "date"],
+                condition=models.Q(status="posted"),
+                name="je_posted_company_date_idx",
+            ),
+            # "Does this period have posted journals?" (period delete guard)
+            models.Index(
+                fields=["period"],
+                condition=models.Q(status="posted"),
+                name="je_posted_period_idx",
+            ),
+            # Idempotency gates: "already a JE for this invoice / source?"
+            models.Index(
+                fields=["source_type", "source_id"], name="je_source_idx"),
         ]
 
         constraints = [
@@ -81,6 +134,8 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
             models.UniqueConstraint(
                 fields=["company", "reference"], name="uq_je_company_ref"
             )
+            # + UNIQUE (id, company_id) target for JournalLine's composite
+            # tenant FKs, created in migration 0044 (DB-only)
         ]
 
     def __str__(self):
@@ -100,8 +155,26 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
 
     # True if double-entry rule holds: total debits = total credits
     def is_balanced(self):
-        debit, credit = self.compute_totals()
-        return debit == credit
+        # Compared in SQL (GROUP BY journal HAVING SUM <> SUM LIMIT 1):
+        # one boolean back, no Decimal sums built in Python
+        return not self.lines.values("journal").annotate(
+            debit=Sum("debit_local"), credit=Sum("credit_local"),
+        ).exclude(debit=F("credit")).exists()
+
+    @classmethod
+    def batch_balance_status(cls, pks):
+        """{pk: balanced?} for many journals in one GROUP BY query
+        (list pages / previews) instead of is_balanced() per row"""
+        pks = set(pks)
+        unbalanced = set(
+            JournalLine.objects.filter(journal_id__in=pks)
+            .values("journal_id")
+            .annotate(debit=Sum("debit_local"), credit=Sum("credit_local"))
+            .exclude(debit=F("credit"))
+            .values_list("journal_id", flat=True)
+        )
+        # journals without lines are balanced (0 == 0), as in is_balanced()
+        return {pk: pk not in unbalanced for pk in pks}
 
     def _posting_payload(self):
         """Deterministic representation of what matters for posting
@@ -117,15 +190,19 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
         """
         lines = [
             {
-                "acct": line.account_id,
-                "debit": str(line.debit_original),
-                "credit": str(line.credit_original),
-                "desc": line.description or "",
+                "acct": acct,
+                "debit": str(debit),
+                "credit": str(credit),
+                "desc": desc or "",
             }
             # Get all lines for this journal entry,
             # always in the same order (id ascending)
-            # For each line l, build a dict with fields that matter for posting
-            for line in self.lines.order_by("id").all()
+            # values_list: plain tuples of the posting fields,
+            # no JournalLine instances built just to read four columns
+            for acct, debit, credit, desc in self.lines.order_by(
+                "id").values_list(
+                    "account_id", "debit_original",
+                    "credit_original", "description")
         ]
 
         # Build a dictionary for the whole journal
@@ -138,10 +215,34 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
         # Converts payload dict into a compact JSON string
         return json.dumps(payload, separators=(",", ":"), sort_keys=True)
 
+    def _lines_digest(self):
+        """Order-independent digest of all lines, kept current by
+        the journalline_hash_* DB triggers (migration 0043)"""
+        lines_hash = JournalLinesHash.objects.filter(
+            journal_id=self.pk).values_list("lines_hash", flat=True).first()
+        # no row yet = no lines ever written
+        return bytes(lines_hash).hex() if lines_hash else "0" * 64
+
     def _fingerprint(self):
-        # hash (sha256) JSON string
-        # from _posting_payload() to produce a fingerprint
-        return hashlib.sha256(self._posting_payload().encode()).hexdigest()
+        # hash company, date and the incremental lines digest:
+        # constant work (one row read) regardless of line count
+        payload = (
+            f"{self.company_id}|{self.date.isoformat()}|{self._lines_digest()}"
+        )
+        return hashlib.sha256(payload.encode()).digest()
+
+    def _legacy_fingerprint(self):
+        # Full-payload fingerprint stored by journals posted before 0043
+        return hashlib.sha256(self._posting_payload().encode()).digest()
+
+    def _matches_posted_fingerprint(self):
+        """Stored posting_fingerprint still matches the current lines"""
+        # bytea comes back as memoryview: compare raw bytes
+        stored_fp = bytes(self.posting_fingerprint or b"")
+        if stored_fp == self._fingerprint():
+            return True
+        # Posted before incremental digests: compare the old way
+        return stored_fp == self._legacy_fingerprint()
 
     # Post the entry safely inside a database transaction
     @transaction.atomic
@@ -152,28 +253,49 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
         """
 
         # Lock row + lines to prevent concurrent modifications
+        # Plain FOR UPDATE, not NO KEY UPDATE: it conflicts with the KEY
+        # SHARE lock a new line's FK check takes on this JE, so no line
+        # can be added between the checks below and marking lines posted
         je = JournalEntry.objects.select_for_update().get(pk=self.pk)
 
+        # Replays of an already-posted entry (retries, webhook repeats):
+        # unchanged lines → return before any line validation
+        if je.status == "posted" and je._matches_posted_fingerprint():
+            # Idempotent: safe to return without raising
+            return je
+
         # Lock all journal lines to prevent race conditions
         # so no other transaction can modify them while posting is in progress
-        lines = je.lines.select_for_update().all()
+        # (evaluated here: an unevaluated queryset locks nothing)
+        lines = je.lines.select_for_update()
+        list(lines.values_list("pk", flat=True))
 
         # lazy import to avoid circular import at module load time
         from ..services.update import update_snapshots_for_journal
 
+        # One round-trip for every line check below (and the audit log):
+        # count, local totals, original totals, cross-company lines.
+        # Plain aggregate - Postgres rejects FOR UPDATE with aggregates;
+        # lines.update() below locks the rows it marks posted
+        aggs = je.lines.aggregate(
+            n=Count("id"),
+            bad_co=Count("id", filter=~Q(company_id=je.company_id)),
+            total_debit=Sum("debit_local"),
+            total_credit=Sum("credit_local"),
+            debit_original=Sum("debit_original"),
+            credit_original=Sum("credit_original"),
+        )
+
         """ Business validations """
-        if not lines.exists():  # Prevent posting an empty entry
+        if not aggs["n"]:  # Prevent posting an empty entry
             raise ValidationError(
                 "JournalEntry must have at least one JournalLine.")
 
-        # Recompute totals fresh from DB & ignore any stale cached values
-        total_debit = Decimal("0.00")
-        total_credit = Decimal("0.00")
-        total_debit, total_credit = self.compute_totals()
+        # Totals fresh from DB; ignore any stale cached values
+        td = aggs["total_debit"] or Decimal("0.0")
+        tc = aggs["total_credit"] or Decimal("0.0")
 
         # Enforce double-entry rule: debits = credits
-        td = total_debit
-        tc = total_credit
         if tc != td:
             # Use custom exception
             raise UnbalancedJournalError(
@@ -182,7 +304,7 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
 
         # Enforce tenant consistency
         # every line must belong to same company as journal
-        if lines.exclude(company=self.company).exists():
+        if aggs["bad_co"]:
             raise ValidationError(
                 "All journal lines must belong to same company as journal."
             )
@@ -197,17 +319,15 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
         if je.period and je.period.is_closed:
             raise ValidationError("Period is closed")
 
-        # Compute fingerprint
-        fp = je._fingerprint()
-
         """ Idempotency & immutability """
         if je.status == "posted":
-            if je.posting_fingerprint == fp:
-                # Idempotent: safe to return without raising
-                return je
+            # Fingerprint didn't match above: lines changed since posting
             raise AlreadyPostedDifferentPayload(
                 "Journal already posted with different payload."
             )
+
+        # Compute fingerprint
+        fp = je._fingerprint()
         
         # Resolve and lock the accounting period
         if not je.date:
@@ -234,12 +354,8 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
             instance=self,
             user=user,
             changes={
-                "debits": str(self.lines.aggregate(
-                    total=Sum("debit_original")
-                )["total"]),
-                "credits": str(self.lines.aggregate(
-                    total=Sum("credit_original")
-                )["total"]),
+                "debits": str(aggs["debit_original"]),
+                "credits": str(aggs["credit_original"]),
             },
         )
 
@@ -249,7 +365,14 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
         # Service layer function to trigger snapshot update
         # Recalculate AccountBalanceSnapshot
         # for all accounts affected by this journal
-        update_snapshots_for_journal(je)
+        if getattr(settings, "ACCOUNTS_SNAPSHOTS_ASYNC", False):
+            from ..tasks import update_journal_snapshots
+            # Queue after commit: the worker sees the posted lines and
+            # the locks taken above aren't held while snapshots update
+            transaction.on_commit(
+                lambda: update_journal_snapshots.delay(je.pk))
+        else:
+            update_snapshots_for_journal(je)
         return je
 
     def clean(self):
@@ -257,14 +380,15 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
         if (
             self.pk and self.status == "posted"
         ):  # If it has a primary key and status is posted, it's an update
-            # Load original DB version before edits
-            orig = JournalEntry.objects.get(pk=self.pk)
+            # Load original DB values before edits (only the compared ones)
+            orig = JournalEntry.objects.filter(pk=self.pk).values(
+                "status", "description", "period_id").first()
             # if attempting to change any core fields after posted
-            if orig.status == "posted":
+            if orig and orig["status"] == "posted":
                 changed = False  # allow no changes if posted (strict)
                 # compare changes in "description", "period_id" fields
                 for f in ("description", "period_id"):
-                    if getattr(orig, f) != getattr(self, f):
+                    if orig[f] != getattr(self, f):
                         # If they differ,
                         # then user is trying to change something after posting
                         changed = True
@@ -284,10 +408,11 @@ class JournalEntry(models.Model):  # Represents one accounting transaction
 
     def save(self, *args, **kwargs):
         if self.pk:  # Does this row already exist in DB?
-            # Fetch "original" row to update
-            orig = JournalEntry.objects.get(pk=self.pk)
+            # Fetch the stored status only (no full row hydration)
+            orig_status = type(self).objects.filter(pk=self.pk).values_list(
+                "status", flat=True).first()
             # Check if journal was already posted
-            if orig.status == "posted" and self.status != "posted":
+            if orig_status == "posted" and self.status != "posted":
                 # disallow toggling posted flag
                 raise ValidationError("Cannot unpost a posted journal")
             """ If self.status != "posted"
@@ -453,17 +578,20 @@ class JournalLine(models.Model):  # Stores Lines ( credits / debits )
         # If parent journal exists and is posted, 
         # block any create/update that modifies amounts/accounts/etc.
         if self.journal_id:
-            if JournalEntry.objects.filter(pk=self.journal_id, status="posted").exists():
+            if self._journal_is_posted():
                 # allow no changes at all (creation is also blocked because parent is posted)
                 if self.pk:
                     # comparing to original will still be done below, but short-circuit for speed
-                    orig = JournalLine.objects.filter(pk=self.pk).first()
+                    # only the compared columns; ids avoid lazy FK loads
+                    orig = JournalLine.objects.filter(pk=self.pk).values(
+                        "debit_original", "credit_original",
+                        "account_id", "invoice_id").first()
                     if orig:
                         changed = (
-                            orig.debit_original != self.debit_original
-                            or orig.credit_original != self.credit_original
-                            or orig.account_id != (self.account.id if self.account else None)
-                            or orig.invoice_id != (self.invoice.id if self.invoice else None)
+                            orig["debit_original"] != self.debit_original
+                            or orig["credit_original"] != self.credit_original
+                            or orig["account_id"] != self.account_id
+                            or orig["invoice_id"] != self.invoice_id
                         )
                         if changed:
                             raise ValidationError("Cannot modify JournalLine: parent JournalEntry is posted.")
@@ -490,16 +618,9 @@ class JournalLine(models.Model):  # Stores Lines ( credits / debits )
                     "JournalLine requires a non-0 amount on either debit or credit"
                 )
 
-            # Derive effective company_id safely 
-            company_id = getattr(self, "company_id", None)
-
-            # If inline has journal_id (JE saved), query it
-            if company_id is None and getattr(self, "journal_id", None):
-                company_id = JournalEntry.objects.only("company_id").filter(pk=self.journal_id).values_list("company_id", flat=True).first()
-
-            # If JE is present but unsaved, maybe form set journal.company already
-            if company_id is None and getattr(self, "journal", None):
-                company_id = getattr(self.journal, "company_id", None) or (self.journal.company.id if getattr(self.journal, "company", None) else None)
+            # Derive effective company_id safely
+            # (own field, else parent's: attached instance or one lookup)
+            company_id = self.company_id or self._journal_company_id()
 
             # Enforce cross company checks only if company_id available
             if self.account and company_id is not None and self.account.company_id != company_id:
@@ -518,7 +639,7 @@ class JournalLine(models.Model):  # Stores Lines ( credits / debits )
 
             # Company consistency
             # Every line must belong to same company as its parent journal
-            if self.journal_id and self.company_id != self.journal.company_id:
+            if self.journal_id and self.company_id != self._journal_company_id():
                 raise ValidationError(
                     "JournalLine.company must" " equal JournalEntry.company"
                 )
@@ -547,15 +668,10 @@ class JournalLine(models.Model):  # Stores Lines ( credits / debits )
 
             # Check if an Invoice/Bill/Asset
             # references a non-control account → block it
-            if self.invoice_id and not self.account.is_control_account:
-                raise ValidationError(
-                    "Invoice postings must " "use a control AR account.")
-            if self.bill_id and not self.account.is_control_account:
-                raise ValidationError(
-                    "Bill postings must " "use a control AP account.")
-            if self.fixed_asset_id and not self.account.is_control_account:
-                raise ValidationError(
-                    "Fixed asset postings " "must use a control account.")
+            if not self.account.is_control_account:
+                for attname, message in CONTROL_ACCOUNT_RULES:
+                    if getattr(self, attname):
+                        raise ValidationError(message)
 
             # Check if fx_rate valid
             if self.currency_id != self.journal.company.default_currency_id:
@@ -566,16 +682,88 @@ class JournalLine(models.Model):  # Stores Lines ( credits / debits )
                 raise ValidationError(
                     "fx_rate must be None " "or 1.0 for default currency")
     
+    def _journal_company_id(self):
+        """Parent journal's company_id, read at most once per instance
+        (clean() and save() share it)"""
+        cached = getattr(self, "_cached_je_company_id", None)
+        if cached is not None:
+            return cached
+        # Reuse the parent when caller already attached it (no query),
+        # including an unsaved JE whose company is already set
+        if JournalLine.journal.is_cached(self) and \
+                self.journal.pk == self.journal_id:
+            cached = self.journal.company_id
+        elif self.journal_id:
+            # Fall back to a single-column lookup
+            cached = JournalEntry.objects.filter(
+                pk=self.journal_id).values_list("company_id", flat=True).first()
+        self._cached_je_company_id = cached
+        return cached
+
+    def _journal_is_posted(self):
+        """Parent journal status: primed by prefetch_parents() for
+        formsets/batches, otherwise one EXISTS query"""
+        status = getattr(self, "_cached_journal_status", None)
+        if status is not None:
+            return status == "posted"
+        return JournalEntry.objects.filter(
+            pk=self.journal_id, status="posted").exists()
+
+    @classmethod
+    def prefetch_parents(cls, lines):
+        # One query for every parent journal (+ company) of the batch
+        journals = JournalEntry.objects.select_related("company").in_bulk(
+            {line.journal_id for line in lines if line.journal_id})
+        for line in lines:
+            je = journals.get(line.journal_id)
+            if je is None:
+                continue
+            line._cached_journal_status = je.status
+            line._cached_je_company_id = je.company_id
+            if not line.company_id:
+                line.company_id = je.company_id
+            # keep a caller-attached parent (e.g. the admin's form instance)
+            if not JournalLine.journal.is_cached(line):
+                line.journal = je
+
+    @classmethod
+    def clean_many(cls, lines):
+        """clean() for many lines (formsets, imports): parents and
+        referenced rows are loaded with one IN query per table"""
+        cls.prefetch_parents(lines)
+        for name in ("account", "invoice", "bill",
+                     "bank_transaction", "fixed_asset"):
+            field = cls._meta.get_field(name)
+            pending = [
+                line for line in lines
+                if getattr(line, field.attname) and not field.is_cached(line)
+            ]
+            if not pending:
+                continue
+            rows = field.related_model._base_manager.in_bulk(
+                {getattr(line, field.attname) for line in pending})
+            for line in pending:
+                if getattr(line, field.attname) in rows:
+                    setattr(line, name, rows[getattr(line, field.attname)])
+        for line in lines:
+            line.clean()
+
     def delete(self, *args, **kwargs):
-        # Prevent deletion if parent journal is posted
-        if self.journal_id:
-            if JournalEntry.objects.filter(
-                pk=self.journal_id, status="posted"
-            ).exists():
-                raise ValidationError(
-                    "Cannot delete JournalLine: parent JournalEntry is posted."
-                )
-        return super().delete(*args, **kwargs)
+        # Prevent deletion if parent journal is posted:
+        # journalline_posted_undeletable trigger (migrations 0045/0061)
+        # rejects it race-free, no pre-check SELECT
+        try:
+            # savepoint keeps the caller's transaction usable on failure
+            with transaction.atomic():
+                return super().delete(*args, **kwargs)
+        except IntegrityError as exc:
+            # only the trigger's error; FK / other violations pass through
+            if not is_trigger_violation(
+                    exc, "Cannot delete a posted journal line"):
+                raise
+            raise ValidationError(
+                "Cannot delete JournalLine: parent JournalEntry is posted."
+            ) from exc
 
     """ Treat fx_rate as 1.0 when it is NULL """
 
@@ -590,14 +778,13 @@ class JournalLine(models.Model):  # Stores Lines ( credits / debits )
         return self.amount_original * self.effective_fx_rate
 
     # save() override
-    def save(self, *args, **kwargs):
+    # skip_validation=True: trusted callers that already validated
+    # (e.g. clean_many()); tenancy is still enforced by the composite
+    # FKs from migration 0044 and amounts by the CheckConstraints
+    def save(self, *args, skip_validation=False, **kwargs):
         # If company not set but JE is known, get company_id from JE
-        if not getattr(self, "company_id", None) and getattr(self, "journal_id", None):
-            # JE saved
-            self.company_id = JournalEntry.objects.only("company_id").get(pk=self.journal_id).company_id
-        elif not getattr(self, "company_id", None) and getattr(self, "journal", None):
-            # JE maybe unsaved but its company field could be set on JE model instance
-            self.company = getattr(self.journal, "company", None)
+        if not self.company_id:
+            self.company_id = self._journal_company_id()
 
         """Calculate debit_local / credit_local:
         - Local amounts are always stored,
@@ -606,13 +793,56 @@ class JournalLine(models.Model):  # Stores Lines ( credits / debits )
         """
         rate = self.fx_rate or Decimal("1.0")  # treat None as 1.0
         # round to 2 decimal places before assigning
-        self.debit_local = (self.debit_original * rate).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
-        self.credit_local = (self.credit_original * rate).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
+        self.debit_local = _to_local(self.debit_original, rate)
+        self.credit_local = _to_local(self.credit_original, rate)
 
         # clean() + field validation always run when saving a JournalLine programmatically
-        self.full_clean()
-        return super().save(*args, **kwargs)
+        if not skip_validation:
+            self.full_clean()
+        result = super().save(*args, **kwargs)
+        # status primed by prefetch_parents() is only good for this save
+        self.__dict__.pop("_cached_journal_status", None)
+        return result
+
+    """ Create many lines for one journal (imports / batch posting):
+    local amounts in one pass, clean_many() (one IN query per related
+    table), bulk INSERT, no per-line full_clean() / save() """
+
+    @classmethod
+    def bulk_create_for(cls, journal, specs, batch_size=1000):
+        # specs: dicts of JournalLine field values (account, debit_original, ...)
+        lines = [
+            cls(journal=journal, company_id=journal.company_id, **spec)
+            for spec in specs
+        ]
+        for line in lines:
+            rate = line.fx_rate or Decimal("1.0")  # treat None as 1.0
+            line.debit_local = _to_local(line.debit_original, rate)
+            line.credit_local = _to_local(line.credit_original, rate)
+            # per-field validators only; clean_many() runs clean()
+            line.clean_fields(exclude=[
+                "company", "journal", "account", "currency", "invoice",
+                "bill", "bank_transaction", "fixed_asset"])
+        cls.clean_many(lines)
+        return cls.objects.bulk_create(lines, batch_size=batch_size)
+
+
+class JournalLinesHash(models.Model):
+    """
+    Running digest of a journal's lines: XOR of sha256(id|account|debit|
+    credit|description) per line. Maintained only by DB triggers on
+    accounts_core_journalline, so it also tracks writes that bypass save().
+    Kept off JournalEntry so a stale in-memory entry can't overwrite it.
+    """
+
+    journal = models.OneToOneField(
+        JournalEntry,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,  # DB cascades (see migration 0043)
+        related_name="lines_hash",
+    )
+    lines_hash = models.BinaryField(max_length=32)
+
+    class Meta:
+        managed = False  # Django won’t try to create/drop this
+        db_table = "accounts_core_journal_lines_hash"
@@ -1,17 +1,80 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import F, Sum
+from django.db.models.functions import Cast
+from ..exceptions import ReadOnlyModelError
+from ..managers import ReadOnlyManager
 
 # ------------------------ Materialized Views ----------------------
 
+
+def cents_to_decimal(cents):
+    """int cents from scan_columnar(cents=True) → Decimal (serialization)"""
+    return Decimal(cents).scaleb(-2)
+
+
+class ReadOnlyModelMixin:
+    """ Instance-level guard; ReadOnlyManager covers the QuerySet side """
+
+    def save(self, *args, **kwargs):
+        raise ReadOnlyModelError(
+            f"{type(self).__name__} is read-only (maintained in SQL)")
+
+    def delete(self, *args, **kwargs):
+        raise ReadOnlyModelError(
+            f"{type(self).__name__} is read-only (maintained in SQL)")
+
+
+class ColumnScanMixin:
+    """ Column-oriented bulk reads for the reporting views """
+
+    @classmethod
+    def scan_columnar(cls, fields, chunk_size=10000, cents=False, **filters):
+        """Return {field: [values...]} for the matching rows.
+
+        values_list() tuples (no model instances), streamed through a
+        server-side cursor in chunk_size batches, transposed into one
+        list per column for column-wise sums / grouping.
+
+        cents=True: money (DecimalField) columns come back as int cents,
+        scaled in SQL ((col * 100)::bigint), so sums run on ints;
+        convert with cents_to_decimal() at the output boundary.
+        """
+        qs = cls.objects.filter(**filters)
+        select = list(fields)
+        if cents:
+            money = [
+                field for field in fields
+                if isinstance(cls._meta.get_field(field), models.DecimalField)
+            ]
+            qs = qs.annotate(**{
+                f"{field}_cents": Cast(F(field) * 100, models.BigIntegerField())
+                for field in money
+            })
+            select = [
+                f"{field}_cents" if field in money else field
+                for field in fields
+            ]
+        columns = {field: [] for field in fields}
+        appenders = [columns[field].append for field in fields]
+        rows = qs.values_list(*select).iterator(chunk_size=chunk_size)
+        for row in rows:
+            for append, value in zip(appenders, row):
+                append(value)
+        return columns
+
+
 """  Base aggregation by company/period/account """
 
 
-class JournalLineAggPeriod(models.Model):
+class JournalLineAggPeriod(ReadOnlyModelMixin, ColumnScanMixin, models.Model):
     # Field types must line up with materialized view’s columns
+    # (*_id are bigint, like the BigAutoField keys they come from)
     id = models.CharField(max_length=32, primary_key=True) # set id as primary key
-    company_id = models.IntegerField()
-    period_id = models.IntegerField()
+    company_id = models.BigIntegerField()
+    period_id = models.BigIntegerField()
     last_txn_date = models.DateField()
-    account_id = models.IntegerField()
+    account_id = models.BigIntegerField()
     account_code = models.CharField(max_length=50)
     account_name = models.CharField(max_length=255)
     account_type = models.CharField(max_length=50)
@@ -23,16 +86,22 @@ class JournalLineAggPeriod(models.Model):
     total_credit_local = models.DecimalField(max_digits=18, decimal_places=2)
     net_amount_local = models.DecimalField(max_digits=18, decimal_places=2)
 
+    objects = ReadOnlyManager()
+
     class Meta:
+        # Trigger-maintained rollup table since 0050 (incremental upserts
+        # per company/period/account); still created in SQL, not by Django
         managed = False  # Django won’t try to create/drop this
-        db_table = "mv_jl_agg_period"  # must match the materialized view name
+        db_table = "mv_jl_agg_period"  # must match the rollup table name
+        default_permissions = ()  # read-only: no add/change/delete/view rows
         verbose_name = "Journal Line Period Aggregate"
         verbose_name_plural = "Journal Line Period Aggregate Records"
-        # mirror unique index from SQL
-        constraints = [
-            models.UniqueConstraint(
+        # unique index ux_mv_jl_agg_period_company_period_account lives in SQL;
+        # a plain Index here (no validate_unique() SELECTs)
+        indexes = [
+            models.Index(
                 fields=["company_id", "period_id", "account_id"],
-                name="ux_mv_jl_agg_period_company_period_account",
+                name="mv_jlagg_co_period_acct",
             ),
         ]
 
@@ -40,11 +109,11 @@ class JournalLineAggPeriod(models.Model):
 """ Trial balance totals per period """
 
 
-class TrialBalancePeriod(models.Model):
+class TrialBalancePeriod(ReadOnlyModelMixin, ColumnScanMixin, models.Model):
     id = models.CharField(max_length=32, primary_key=True) # set id as primary key
-    company_id = models.IntegerField()
-    period_id = models.IntegerField()
-    account_id = models.IntegerField()
+    company_id = models.BigIntegerField()
+    period_id = models.BigIntegerField()
+    account_id = models.BigIntegerField()
     account_code = models.CharField(max_length=50)
     account_name = models.CharField(max_length=255)
     account_type = models.CharField(max_length=50)
@@ -58,26 +127,43 @@ class TrialBalancePeriod(models.Model):
     period_credit_local = models.DecimalField(max_digits=18, decimal_places=2)
     period_balance_local = models.DecimalField(max_digits=18, decimal_places=2)
 
+    objects = ReadOnlyManager()
+
     class Meta:
-        managed = False
+        managed = False  # plain view over mv_jl_agg_period (0050)
         db_table = "mv_trial_balance_period"
+        default_permissions = ()  # read-only: no add/change/delete/view rows
         verbose_name = "Trial Balance Period"
         verbose_name_plural = "Trial Balance Period Records"
-        constraints = [
-            models.UniqueConstraint(
+        # unique index ux_mv_trial_balance_period_company_period_account lives in SQL;
+        # a plain Index here (no validate_unique() SELECTs)
+        indexes = [
+            models.Index(
                 fields=["company_id", "period_id", "account_id"],
-                name="ux_mv_trial_balance_period_company_period_account",
+                name="mv_tbp_co_period_acct",
             ),
         ]
 
+    @classmethod
+    def aggregate_by_type(cls, company_id, period_id):
+        """{account_type: period_balance_local total} for one period.
+        Grouped and summed in SQL: one row per type comes back,
+        not one per account."""
+        rows = cls.objects.filter(
+            company_id=company_id, period_id=period_id
+        ).values("account_type").annotate(
+            total=Sum("period_balance_local")
+        ).order_by()
+        return {row["account_type"]: row["total"] for row in rows}
+
 
 """ Running Trial Balance (point-in-time) """
 
 
-class TrialBalanceRunning(models.Model):
+class TrialBalanceRunning(ReadOnlyModelMixin, ColumnScanMixin, models.Model):
     id = models.CharField(max_length=32, primary_key=True) # set id as primary key
-    company_id = models.IntegerField()
-    account_id = models.IntegerField()
+    company_id = models.BigIntegerField()
+    account_id = models.BigIntegerField()
     account_code = models.CharField(max_length=50)
     account_name = models.CharField(max_length=255)
     account_type = models.CharField(max_length=50)
@@ -94,15 +180,20 @@ class TrialBalanceRunning(models.Model):
     balance_to_date_local = models.DecimalField(
         max_digits=18, decimal_places=2)
 
+    objects = ReadOnlyManager()
+
     class Meta:
         managed = False
         db_table = "mv_trial_balance_running"
+        default_permissions = ()  # read-only: no add/change/delete/view rows
         verbose_name = "Trial Balance Running"
         verbose_name_plural = "Trial Balance Running Records"
-        constraints = [
-            models.UniqueConstraint(
+        # unique index ux_mv_trial_balance_running_company_account lives in SQL;
+        # a plain Index here (no validate_unique() SELECTs)
+        indexes = [
+            models.Index(
                 fields=["company_id", "account_id"],
-                name="ux_mv_trial_balance_running_company_account",
+                name="mv_tbr_co_acct",
             ),
         ]
 
@@ -110,10 +201,10 @@ class TrialBalanceRunning(models.Model):
 """ Profit & Loss (period-based) """
 
 
-class ProfitLossPeriod(models.Model):
+class ProfitLossPeriod(ReadOnlyModelMixin, ColumnScanMixin, models.Model):
     id = models.CharField(max_length=32, primary_key=True) # set id as primary key
-    company_id = models.IntegerField()
-    period_id = models.IntegerField()
+    company_id = models.BigIntegerField()
+    period_id = models.BigIntegerField()
     total_income_original = models.DecimalField(
         max_digits=18, decimal_places=2)
     total_expense_original = models.DecimalField(
@@ -123,15 +214,20 @@ class ProfitLossPeriod(models.Model):
     total_expense_local = models.DecimalField(max_digits=18, decimal_places=2)
     net_profit_local = models.DecimalField(max_digits=18, decimal_places=2)
 
+    objects = ReadOnlyManager()
+
     class Meta:
-        managed = False
+        managed = False  # plain view over mv_jl_agg_period (0050)
         db_table = "mv_pl_period"
+        default_permissions = ()  # read-only: no add/change/delete/view rows
         verbose_name = "Profit & Loss Period"
         verbose_name_plural = "Profit & Loss Period Records"
-        constraints = [
-            models.UniqueConstraint(
+        # unique index ux_mv_pl_period_company_period lives in SQL;
+        # a plain Index here (no validate_unique() SELECTs)
+        indexes = [
+            models.Index(
                 fields=["company_id", "period_id"],
-                name="ux_mv_pl_period_company_period",
+                name="mv_pl_co_period",
             ),
         ]
 
@@ -139,10 +235,10 @@ class ProfitLossPeriod(models.Model):
 """ Balance Sheet (snapshot) """
 
 
-class BalanceSheetRunning(models.Model):
+class BalanceSheetRunning(ReadOnlyModelMixin, ColumnScanMixin, models.Model):
     id = models.CharField(max_length=32, primary_key=True) # set id as primary key
-    company_id = models.IntegerField()
-    account_id = models.IntegerField()
+    company_id = models.BigIntegerField()
+    account_id = models.BigIntegerField()
     account_code = models.CharField(max_length=50)
     account_name = models.CharField(max_length=255)
     account_type = models.CharField(max_length=50)
@@ -151,14 +247,19 @@ class BalanceSheetRunning(models.Model):
     balance_to_date_local = models.DecimalField(
         max_digits=18, decimal_places=2)
 
+    objects = ReadOnlyManager()
+
     class Meta:
         managed = False
         db_table = "mv_balance_sheet_running"
+        default_permissions = ()  # read-only: no add/change/delete/view rows
         verbose_name = "Balance Sheet Running"
         verbose_name_plural = "Balance Sheet Running Records"
-        constraints = [
-            models.UniqueConstraint(
+        # unique index ux_mv_balance_sheet_running_company_account lives in SQL;
+        # a plain Index here (no validate_unique() SELECTs)
+        indexes = [
+            models.Index(
                 fields=["company_id", "account_id"],
-                name="ux_mv_balance_sheet_running_company_account",
+                name="mv_bs_co_acct",
             ),
         ]
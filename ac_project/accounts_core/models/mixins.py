@@ -0,0 +1,59 @@
+from django.db import models
+from django.db.models import Value
+
+
+class TenantFKMixin:
+    """
+    company_id of a model's related rows, for friendly tenancy errors.
+    Uses a related object the caller already attached, else reads the
+    one column. Results are memoized per (field, fk value), so a changed
+    FK is looked up again instead of reusing the old parent's company.
+    """
+
+    def _fk_memo(self):
+        return self.__dict__.setdefault("_fk_company_memo", {})
+
+    def _prime_fk_company_id(self, name, company_id):
+        # bulk_validate(): company_id already read for many rows at once
+        self._fk_memo()[(name, getattr(self, f"{name}_id"))] = company_id
+
+    def _fk_company_id(self, name, fetch=True):
+        """company_id behind FK `name` (None if unset or not found);
+        fetch=False: only what's already in memory, never a query"""
+        return self._fk_company_ids(name, fetch=fetch)[name]
+
+    def _fk_company_ids(self, *names, fetch=True):
+        """{name: company_id} for several FKs: one UNION ALL query for
+        every one not already in memory"""
+        memo = self._fk_memo()
+        result, missing = {}, []
+        for name in names:
+            fk_value = getattr(self, f"{name}_id")
+            key = (name, fk_value)
+            descriptor = getattr(type(self), name)
+            if fk_value is None:
+                result[name] = None
+            elif key in memo:
+                result[name] = memo[key]
+            elif descriptor.is_cached(self) and \
+                    getattr(self, name).pk == fk_value:
+                result[name] = memo[key] = getattr(self, name).company_id
+            elif fetch:
+                missing.append(name)
+            else:
+                result[name] = None
+        if missing:
+            query = None
+            for name in missing:
+                model = self._meta.get_field(name).related_model
+                part = model._base_manager.filter(
+                    pk=getattr(self, f"{name}_id")
+                ).annotate(
+                    fk=Value(name, output_field=models.CharField())
+                ).values_list("fk", "company_id")
+                query = part if query is None else query.union(part, all=True)
+            found = dict(query)
+            for name in missing:
+                result[name] = memo[(name, getattr(self, f"{name}_id"))] = \
+                    found.get(name)
+        return result
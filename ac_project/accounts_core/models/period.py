@@ -41,7 +41,12 @@ class Period(models.Model):  # Each Period represents a time bucket
         # for filtering open periods
         indexes = [
             models.Index(fields=["company", "start_date"]),
-            models.Index(fields=["company", "is_closed"]),
+            # open (or closed) periods in date order: filter + sort
+            # from one index, no re-sort
+            models.Index(
+                fields=["company", "is_closed", "start_date"],
+                name="ix_period_co_closed_start",
+            ),
         ]
 
         # Prevent duplicate period names inside the same company
@@ -49,11 +54,14 @@ class Period(models.Model):  # Each Period represents a time bucket
             models.UniqueConstraint(
                 fields=["company", "name"], name="uq_company_period_name"
             ),
+            # + CHECK (start_date < end_date) "ck_period_dates",
+            # created in migration 0048 (DB-only: full_clean() would
+            # otherwise run an extra query to evaluate it)
         ]
 
-        # Default query ordering:
-        # periods are returned sorted by company, then chronologically
-        ordering = ("company", "start_date")  # no need to sort manually
+        # No default ordering: an implicit ORDER BY on every query
+        # (exists(), count(), lookups) is wasted sort work.
+        # Callers that need chronological order use .order_by()
 
     def __str__(self):
         return f"{self.company.slug} {self.name}"  # Example: "acme 2025-07".
@@ -62,6 +70,15 @@ class Period(models.Model):  # Each Period represents a time bucket
         if self.start_date >= self.end_date:
             raise ValidationError("start_date must be before end_date")
 
-    def save(self, *args, **kwargs):
-        self.full_clean()  # run validations before saving
+    @classmethod
+    def bulk_validate(cls, periods):
+        # Pure in-memory checks; uniqueness and dates are also
+        # enforced by the DB (uq_company_period_name, ck_period_dates)
+        for period in periods:
+            period.clean()
+
+    # skip_validation=True: caller already ran bulk_validate()
+    def save(self, *args, skip_validation=False, **kwargs):
+        if not skip_validation:
+            self.full_clean()  # run validations before saving
         return super().save(*args, **kwargs)
@@ -1,6 +1,7 @@
 from decimal import Decimal
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from ..exceptions import is_constraint_violation
 from ..managers import TenantManager
 from .account import Account
 from .entitymembership import Company
@@ -17,6 +18,8 @@ class AccountBalanceSnapshot(
     # (like Cash, Accounts Payable, Sales)
     # on_delete= CASCADE: If you delete an Account,
     # you don’t need orphaned snapshots floating around
+    # Tenancy (account.company == company) is enforced by Postgres:
+    # composite FK fk_abs_account_company (migration 0054), no clean() fetch
     account = models.ForeignKey(Account, on_delete=models.CASCADE)
     # The date snapshot is taken
     # (daily, monthly, or at reporting cutoffs (e.g., end of period))
@@ -68,13 +71,48 @@ class AccountBalanceSnapshot(
         cb = self.credit_balance
         return f"{slug} {snpd} | {acc} {acn}: D {db} / C {cb}"
 
-    def clean(self):
-        # Tenancy check
-        # Ensure account chosen belongs to the same company
-        ac = self.account
-        if ac and ac.company != self.company:
-            raise ValidationError("Account must belong to the same company.")
+    @classmethod
+    def bulk_validate(cls, snapshots):
+        # Batch pre-check (friendly error before a bulk INSERT):
+        # one IN query for every account's company, then id comparisons
+        account_companies = dict(
+            Account.objects.filter(
+                pk__in={s.account_id for s in snapshots}
+            ).values_list("pk", "company_id"))
+        for snapshot in snapshots:
+            if account_companies.get(snapshot.account_id) != \
+                    snapshot.company_id:
+                raise ValidationError(
+                    "Account must belong to the same company.")
 
-    def save(self, *args, **kwargs):
-        self.full_clean()  # run validations before saving
-        return super().save(*args, **kwargs)
+    @classmethod
+    def bulk_create_validated(cls, rows, batch_size=1000):
+        # End-of-day ingest: field validators per row, one account lookup
+        # for the whole batch, then batched INSERTs (no per-row save())
+        for row in rows:
+            row.clean_fields(exclude=["company", "account"])
+        cls.bulk_validate(rows)
+        return cls.objects.bulk_create(rows, batch_size=batch_size)
+
+    # skip_validation=True: caller already ran bulk_validate()
+    def save(self, *args, skip_validation=False, **kwargs):
+        if skip_validation:
+            return super().save(*args, **kwargs)
+        # run validations before saving; the composite FK already
+        # proves the account exists, so skip the FK's own query
+        self.full_clean(exclude=["account"])
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and \
+                {"account", "account_id", "company", "company_id"}.isdisjoint(
+                    update_fields):
+            # FK columns not written: fk_abs_account_company can't fire
+            return super().save(*args, **kwargs)
+        try:
+            # savepoint keeps the caller's transaction usable on failure
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            if not is_constraint_violation(exc, "fk_abs_account_company"):
+                raise
+            raise ValidationError(
+                "Account must belong to the same company.") from exc
@@ -13,7 +13,7 @@ class Vendor(models.Model):  # Mirrors Customer but for Accounts Payable (AP)
     # Same fields as Customer, but now for suppliers/vendors
     name = models.CharField(max_length=200)
     contact_email = models.EmailField(null=True, blank=True)
-    payment_terms_days = models.IntegerField(default=30)
+    payment_terms_days = models.PositiveSmallIntegerField(default=30)  # 0–32767 days
 
     # FK to the Accounts Payable account in Chart of Accounts
     """ If set: when creating a Bill for this vendor,
@@ -34,7 +34,12 @@ class Vendor(models.Model):  # Mirrors Customer but for Accounts Payable (AP)
     class Meta:
         indexes = [
             models.Index(fields=["company", "name"]),
-            models.Index(fields=["company", "default_ap_account"]),
+            # Only vendors with an AP account configured (NULLs skipped)
+            models.Index(
+                fields=["company", "default_ap_account"],
+                name="ix_vendor_co_apacct_nn",
+                condition=models.Q(default_ap_account__isnull=False),
+            ),
         ]
 
         # Vendor names must be unique per company
@@ -48,22 +53,51 @@ class Vendor(models.Model):  # Mirrors Customer but for Accounts Payable (AP)
         return self.name
 
     def clean(self):
-        # Ensure AR account belongs to the same company
-        if (
-            self.default_ap_account
-            and self.default_ap_account.company_id != self.company_id
-        ):
+        # One narrow read of the AP account (or the attached instance)
+        dap = self._default_ap_account()
+        if self.default_ap_account_id and dap is None:
+            raise ValidationError("Default AP account does not exist")
+
+        # Ensure AP account belongs to the same company
+        if dap and dap.company_id != self.company_id:
             raise ValidationError(
                 "Default AP account and vendor must belong to same company"
             )
 
         # Only control accounts can be set as default AP (Vendor)
-        dap = self.default_ap_account
         if dap and not dap.is_control_account:
             raise ValidationError(
                 "Default AP account must be a control account")
         return super().clean()
 
-    def save(self, *args, **kwargs):
-        self.full_clean()  # run validations before saving
+    def _default_ap_account(self):
+        """AP account with just the columns clean() needs:
+        cached instance if attached, else one query"""
+        if not self.default_ap_account_id:
+            return None
+        if Vendor.default_ap_account.is_cached(self):
+            return self.default_ap_account
+        return Account.objects.only(
+            "company_id", "is_control_account"
+        ).filter(pk=self.default_ap_account_id).first()
+
+    @classmethod
+    def bulk_validate(cls, vendors):
+        # One IN query for every AP account, then in-memory clean() per row
+        accounts = Account.objects.only(
+            "company_id", "is_control_account").in_bulk(
+            {v.default_ap_account_id for v in vendors
+             if v.default_ap_account_id})
+        for vendor in vendors:
+            if vendor.default_ap_account_id in accounts:
+                vendor.default_ap_account = accounts[
+                    vendor.default_ap_account_id]
+            vendor.clean()
+
+    # skip_validation=True: caller already ran bulk_validate()
+    def save(self, *args, skip_validation=False, **kwargs):
+        if not skip_validation:
+            # run validations before saving; clean() already reads the AP
+            # account, so skip the FK's separate existence query
+            self.full_clean(exclude=["default_ap_account"])
         return super().save(*args, **kwargs)
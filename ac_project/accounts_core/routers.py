@@ -0,0 +1,33 @@
+from django.conf import settings
+
+
+# -----------------------------------------
+# Send reporting reads to the analytics DB
+# -----------------------------------------
+ANALYTICS_DB = "analytics"
+
+
+class MatViewRouter:
+    """ Route reads of the mv_* models (models/matview.py) to the
+        "analytics" database (read replica / columnar copy) when
+        it is configured; everything else stays on "default". """
+
+    def _is_matview(self, model):
+        return model.__module__.endswith("models.matview")
+
+    def db_for_read(self, model, **hints):
+        if self._is_matview(model) and ANALYTICS_DB in settings.DATABASES:
+            return ANALYTICS_DB
+        return None  # let Django fall back to "default"
+
+    def db_for_write(self, model, **hints):
+        return None  # views are refreshed on the primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replica is read-only: schema comes from the primary
+        if db == ANALYTICS_DB:
+            return False
+        return None
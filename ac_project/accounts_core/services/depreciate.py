@@ -5,11 +5,35 @@ from django.utils import timezone
 from ..services.audit_helper import log_action
 # Import models
 from ..models import (Account, FixedAsset, Period, JournalEntry, JournalLine)
+from .posting import _credit_line, _debit_line
+
+# Decimal constants built once at import, not per call
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
 
 
 # ----------------------------
 # Fixed Asset workflows
 # ----------------------------
+def _account_id_by_code(company_id, code):
+    # pk only; resolved once per call / batch run and passed down
+    # (not cached across calls: other workers may re-code accounts)
+    return Account.objects.values_list("pk", flat=True).get(
+        company_id=company_id, code=code)
+
+
+def _depreciation_amount(asset):
+    """This run's straight-line (per-year) depreciation, in cents,
+    capped to the asset's remaining book value"""
+    per_period = (asset.purchase_cost / Decimal(asset.useful_life_years)).quantize(
+        CENT, rounding=ROUND_HALF_UP
+    )
+    remaining = (asset.purchase_cost - asset.accumulated_depreciation).quantize(
+        CENT, rounding=ROUND_HALF_UP
+    )
+    return per_period if per_period <= remaining else remaining
+
+
 def depreciate_asset(asset_id, period_id, user=None):
     """
     Record depreciation for a fixed asset into the ledger.
@@ -24,38 +48,29 @@ def depreciate_asset(asset_id, period_id, user=None):
         6. Return created JournalEntry.  
     """
     with transaction.atomic():
-        # lock asset row
-        asset = FixedAsset.objects.select_for_update().get(pk=asset_id)
+        # lock asset row (NO KEY UPDATE: journal lines can still
+        # reference it via their fixed_asset FK meanwhile)
+        asset = FixedAsset.objects.select_for_update(no_key=True).get(pk=asset_id)
         period = Period.objects.get(pk=period_id)
 
         if not asset.useful_life_years or asset.useful_life_years <= 0:
             raise ValidationError("Asset must have a valid useful life")
 
-        # calculate straight-line (per-year) depreciation and quantize to cents
-        per_period = (asset.purchase_cost / Decimal(asset.useful_life_years)).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
-
-        # remaining book value
-        remaining = (asset.purchase_cost - asset.accumulated_depreciation).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
-
         # If nothing left to depreciate, abort
-        if remaining <= Decimal("0.00"):
+        if asset.accumulated_depreciation >= asset.purchase_cost:
             raise ValidationError("Asset already fully depreciated")
 
-        # actual amount to record this run (cap to remaining)
-        depreciation_amount = per_period if per_period <= remaining else remaining
+        # actual amount to record this run (capped to remaining)
+        depreciation_amount = _depreciation_amount(asset)
 
-        if depreciation_amount <= Decimal("0.00"):
+        if depreciation_amount <= ZERO:
             raise ValidationError("Computed depreciation amount is zero")
 
         # Fetch GL accounts 
         # Account for Depreciation Expense
-        expense_acct = Account.objects.get(company=asset.company, code="6400")
+        expense_acct_id = _account_id_by_code(asset.company_id, "6400")
         # Account for Accumulated Depreciation
-        accum_dep_acct = Account.objects.get(company=asset.company, code="1220")
+        accum_dep_acct_id = _account_id_by_code(asset.company_id, "1220")
 
         # depreciation entry + lines are either all committed or all rolled back
         # 1. Create JournalEntry header
@@ -71,28 +86,21 @@ def depreciate_asset(asset_id, period_id, user=None):
                 source_id=asset.id,
         )
 
-        # 2. Add JournalLines
-        JournalLine.objects.create(
-                company=asset.company,
-                journal=je,
-                account=expense_acct,
+        # 2. Add JournalLines (one batched INSERT)
+        JournalLine.bulk_create_for(je, [
+            _debit_line(
+                expense_acct_id, depreciation_amount,
                 description=f"Depreciation Expense for {asset.asset_code or asset.id}",
-                debit_original=depreciation_amount,    
-                credit_original=Decimal("0.00"),
                 currency=je.company.default_currency,
                 fixed_asset=asset,
-            )
-
-        JournalLine.objects.create(
-                company=asset.company,
-                journal=je,
-                account=accum_dep_acct,
+            ),
+            _credit_line(
+                accum_dep_acct_id, depreciation_amount,
                 description=f"Accumulated Depreciation for {asset.asset_code or asset.id}",
-                debit_original=Decimal("0.00"),
-                credit_original=depreciation_amount,
                 currency=je.company.default_currency,
                 fixed_asset=asset,
-            )
+            ),
+        ])
 
         # 3. Post (validate balance)
         je.post(user=user)
@@ -100,7 +108,7 @@ def depreciate_asset(asset_id, period_id, user=None):
         # Update the asset
         asset.accumulated_depreciation = (
             (asset.accumulated_depreciation + depreciation_amount)
-            .quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            .quantize(CENT, rounding=ROUND_HALF_UP)
         )
 
         # On first depreciation, set to 'capitalized' 
@@ -117,4 +125,104 @@ def depreciate_asset(asset_id, period_id, user=None):
             changes={"Status": str(asset.status), 
                      "Accumulated depreciation": str(asset.accumulated_depreciation)}
         )
-        return je
\ No newline at end of file
+        return je
+
+def depreciate_assets_for_period(period_id, company_id, user=None):
+    """
+    depreciate_asset() for every depreciable asset of a company in one
+    run (month-/year-end). Same amounts, lines and posting per asset, but:
+        - assets locked and read in one query; period and GL accounts
+          resolved once
+        - every JournalEntry header in one INSERT, assets written back
+          with one bulk_update
+    Lines go through JournalLine.bulk_create_for() and each entry through
+    JournalEntry.post(), as in depreciate_asset() (line, balance, period,
+    fingerprint and snapshot rules live there).
+    Disposed and fully depreciated assets are skipped, not raised on.
+    Returns the created JournalEntries.
+    """
+    with transaction.atomic():
+        # lock every asset of the run in pk order (consistent lock order)
+        assets = list(
+            FixedAsset.objects.select_for_update(no_key=True).filter(
+                company_id=company_id, useful_life_years__gt=0
+            ).exclude(status="disposed").order_by("pk")
+        )
+        period = Period.objects.select_related("company").get(pk=period_id)
+        if period.company_id != company_id:
+            raise ValidationError(
+                "Period must belong to the same company as the assets.")
+        currency_id = period.company.default_currency_id
+        expense_acct_id = _account_id_by_code(company_id, "6400")
+        accum_dep_acct_id = _account_id_by_code(company_id, "1220")
+
+        # same amount depreciate_asset() would record for each asset
+        runs = []
+        for asset in assets:
+            depreciation_amount = _depreciation_amount(asset)
+            if depreciation_amount > ZERO:
+                runs.append((asset, depreciation_amount))
+        if not runs:
+            return []
+
+        # 1. JournalEntry headers, one INSERT (pks returned by Postgres)
+        today = timezone.now().date()
+        jes = JournalEntry.objects.bulk_create([
+            JournalEntry(
+                company_id=company_id,
+                period=period,
+                date=today,
+                description=f"Depreciation for asset {asset.asset_code or asset.id}",
+                status="draft",
+                created_by=user,
+                source_type="FixedAsset",  # link back to FixedAsset
+                source_id=asset.id,
+            )
+            for asset, _ in runs
+        ])
+
+        # 2. JournalLines, validated like depreciate_asset()'s
+        for je, (asset, amount) in zip(jes, runs):
+            JournalLine.bulk_create_for(je, [
+                _debit_line(
+                    expense_acct_id, amount,
+                    description=f"Depreciation Expense for {asset.asset_code or asset.id}",
+                    currency_id=currency_id,
+                    fixed_asset=asset,
+                ),
+                _credit_line(
+                    accum_dep_acct_id, amount,
+                    description=f"Accumulated Depreciation for {asset.asset_code or asset.id}",
+                    currency_id=currency_id,
+                    fixed_asset=asset,
+                ),
+            ])
+
+        # 3. Post (validate balance)
+        for je in jes:
+            je.post(user=user)
+
+        # Update the assets in one statement
+        for asset, amount in runs:
+            asset.accumulated_depreciation = (
+                (asset.accumulated_depreciation + amount)
+                .quantize(CENT, rounding=ROUND_HALF_UP)
+            )
+            # On first depreciation, set to 'capitalized'
+            if asset.status == "draft":
+                asset.status = "capitalized"
+        FixedAsset.objects.bulk_update(
+            [asset for asset, _ in runs],
+            ["accumulated_depreciation", "status"],
+        )
+
+        # Record an audit log entry per asset
+        for asset, _ in runs:
+            log_action(
+                action="depreciate",
+                instance=asset,
+                user=user,
+                changes={"Status": str(asset.status),
+                         "Accumulated depreciation": str(asset.accumulated_depreciation)}
+            )
+        return jes
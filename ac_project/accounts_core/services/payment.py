@@ -1,20 +1,69 @@
+import logging
 from decimal import Decimal
 from typing import Dict, List
-from django.db.models.functions import Coalesce
-from django.db.models import Sum
+from django.db.models import Case, F, Value, When, prefetch_related_objects
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.db import transaction
 # Import models
 from ..models import (BankTransaction, BankTransactionBill,
                      BankTransactionInvoice, Bill, Invoice,
                      JournalEntry,)
-from .posting import create_payment_journal
+from .posting import _ar_account_id, _do_create_payment_journal
 from .audit_helper import log_action
 
+# Decimal constants built once at import, not per call
+ZERO = Decimal("0.00")
+
+logger = logging.getLogger(__name__)
+
 
 # ----------------------------
 # Payment-related workflows
 # ----------------------------
+def lock_rows(*model_pks):
+    """
+    Lock rows FOR NO KEY UPDATE in one global order: by table name, then
+    by pk (ORDER BY pk inside each locking query), so concurrent workers
+    never wait on each other's locks in opposite orders (no deadlocks).
+    Takes (Model, pk) pairs; returns {Model: {pk: instance}}.
+    """
+    pks = {}
+    for model, pk in model_pks:
+        pks.setdefault(model, set()).add(pk)
+    locked = {}
+    for model in sorted(pks, key=lambda m: m._meta.db_table):
+        locked[model] = {
+            row.pk: row for row in model.objects.filter(pk__in=pks[model])
+            .select_for_update(no_key=True).order_by("pk")
+        }
+        if len(locked[model]) != len(pks[model]):
+            raise model.DoesNotExist(
+                f"{model.__name__} matching query does not exist.")
+    return locked
+
+
+def _sync_bt_status(bt_id):
+    """
+    Set BankTransaction.status from its applied_total_cached (already
+    bumped by the join-row triggers, migration 0059) in one UPDATE;
+    the WHERE guard rejects over-allocation atomically.
+    """
+    updated = BankTransaction.objects.filter(
+        pk=bt_id, applied_total_cached__lte=F("amount")
+    ).update(
+        status=Case(
+            When(applied_total_cached=F("amount"),
+                 then=Value("fully_applied")),
+            When(applied_total_cached__gt=0,
+                 then=Value("partially_applied")),
+            default=F("status"),  # nothing applied yet
+        ),
+    )
+    if not updated:
+        raise ValidationError(
+            "Applied amounts exceed bank transaction amount")
+
+
 def apply_inv_payment(bt_id: int, invoice_id: int, amount: float):
     """
     Apply part (or all) of a bank transaction to an invoice.
@@ -23,122 +72,319 @@ def apply_inv_payment(bt_id: int, invoice_id: int, amount: float):
     # Everything inside either succeeds
     # as one unit or rolls back if something fails
     with transaction.atomic():
-        # Lock the bank transaction and invoice rows
-        # until the transaction finishes
-        bt = BankTransaction.objects.select_for_update().get(pk=bt_id)
-        inv = Invoice.objects.select_for_update().get(pk=invoice_id)
-
-        # Validate invoice outstanding
-        if amount > inv.outstanding_amount:
-            raise ValidationError("Payment exceeds invoice outstanding amount")
-
-        # Validate bank transaction remaining capacity
-        total_applied = bt.banktransactioninvoice_set.aggregate(
-            total=models.Sum("applied_amount")
-        )["total"] or Decimal("0")
-
-        # Validation: prevent over-allocation
-        if total_applied + amount > bt.amount:
-            raise ValidationError(
-                "Applied amounts exceed bank transaction amount")
-
-        # Create join row
-        """ This represents X amount of this
-              bank transaction settles this invoice """
-
-        # Create join record in M2M table
-        BankTransactionInvoice.objects.create(
-            bank_transaction=bt,
-            invoice=inv,
-            applied_amount=amount,
-            company=bt.company,  # enforce tenancy
-        )
-
-        # Update invoice outstanding
-        inv.outstanding_amount -= amount
-        if inv.outstanding_amount <= 0:
-            inv.status = "paid"
-        inv.save(update_fields=["outstanding_amount", "status"])
-
-        # Update bank transaction status
-        total_applied += amount
-        if total_applied >= bt.amount:
-            bt.status = "fully_applied"
-        else:
-            bt.status = "partially_applied"
-        bt.save(update_fields=["status"])
-
-        return bt, inv
+        return _do_apply_inv_payment(bt_id, invoice_id, amount)
+
+
+def _do_apply_inv_payment(bt_id: int, invoice_id: int, amount: float):
+    """apply_inv_payment() without its own transaction (caller's atomic())"""
+    # Lock both rows until the transaction finishes, in lock_rows() order
+    # (NO KEY UPDATE: the key never changes, so concurrent inserts of
+    # join rows / journal lines referencing them aren't blocked)
+    locked = lock_rows((BankTransaction, bt_id), (Invoice, invoice_id))
+    bt = locked[BankTransaction][bt_id]
+    inv = locked[Invoice][invoice_id]
+
+    # Validate invoice outstanding (early, friendly error)
+    if amount > inv.outstanding_amount:
+        raise ValidationError("Payment exceeds invoice outstanding amount")
+
+    # Validation: prevent over-allocation
+    # (cached running total, no SUM over the join rows)
+    if bt.applied_total_cached + amount > bt.amount:
+        raise ValidationError(
+            "Applied amounts exceed bank transaction amount")
+
+    # Create join row
+    """ This represents X amount of this
+          bank transaction settles this invoice """
+
+    # Create join record in M2M table; its save() applies the
+    # payment (journal entry + atomic invoice and bank transaction UPDATEs)
+    BankTransactionInvoice.objects.create(
+        bank_transaction=bt,
+        invoice=inv,
+        applied_amount=amount,
+        company=bt.company,  # enforce tenancy
+    )
+    # Pick up the outstanding/status/applied total those UPDATEs wrote
+    inv.refresh_from_db(fields=["outstanding_amount", "status"])
+    bt.refresh_from_db(fields=["applied_total_cached", "status"])
+
+    return bt, inv
 
 
 def apply_bank_tx_to_inv(bank_tx_id: int, invoice_applications: List[Dict]):
+    """
+    Apply one bank transaction to many invoices in a single pass.
+    Same rules and messages as apply_inv_payment(), but the bank
+    transaction and all invoices are locked once, the join rows are
+    inserted in one statement and the bank transaction is UPDATEd once.
+    """
     with transaction.atomic():
-        results = []
+        # Lock the bank transaction once and every target invoice in one
+        # query, in lock_rows() order (no deadlocks between batches)
+        ids = sorted({ap["invoice_id"] for ap in invoice_applications})
+        locked = lock_rows(
+            (BankTransaction, bank_tx_id), *((Invoice, pk) for pk in ids))
+        bt = locked[BankTransaction][bank_tx_id]
+        invs = locked[Invoice]
+        # customer/company for every payment JE in two queries, not 2 per
+        # invoice (kept out of the locking query: no extra rows locked)
+        prefetch_related_objects(list(invs.values()), "company", "customer")
+
+        total_applied = bt.applied_total_cached
+
+        # unique_bank_tx_invoice: one join row per (bank tx, invoice),
+        # within the batch and against rows already applied (one query)
+        if len(ids) != len(invoice_applications) or \
+                BankTransactionInvoice.objects.filter(
+                    bank_transaction_id=bank_tx_id, invoice_id__in=ids,
+                ).exists():
+            raise ValidationError(
+                "Bank transaction invoice with this Bank transaction "
+                "and Invoice already exists.")
+
+        # Validate everything in memory first (running totals, so the
+        # bank transaction capacity is checked cumulatively)
+        remaining = {pk: inv.outstanding_amount for pk, inv in invs.items()}
+        btis = []
         for ap in invoice_applications:
-            invoice_id = ap["invoice_id"]
+            inv = invs[ap["invoice_id"]]
             amount = ap["amount"]
-            bt, inv = apply_inv_payment(bank_tx_id, invoice_id, amount)
-            results.append((bt, inv))
-        return results
+            if inv.company_id != bt.company_id:
+                raise ValidationError(
+                    "Invoice must belong to the same company.")
+            if amount < 0:
+                raise ValidationError("Applied must be non-negative")
+            if amount > remaining[inv.pk]:
+                raise ValidationError(
+                    "Payment exceeds invoice outstanding amount")
+            if total_applied + amount > bt.amount:
+                raise ValidationError(
+                    "Applied amounts exceed bank transaction amount")
+            remaining[inv.pk] -= amount
+            total_applied += amount
+            bti = BankTransactionInvoice(
+                bank_transaction=bt,
+                invoice=inv,
+                applied_amount=amount,
+                company=bt.company,  # enforce tenancy
+            )
+            # the model's own rules, on the locked parents (no queries)
+            bti.clean()
+            btis.append(bti)
+
+        # Create join records in one INSERT (validated above)
+        BankTransactionInvoice.objects.bulk_create(btis)
+        # What BankTransactionInvoice.save() does after insert: post the
+        # payment JournalEntry per application (locks already held;
+        # invoices and bank transaction are written once, below)
+        # company AR fallback: one lookup for the batch, and only if a
+        # paying customer has no default_ar_account
+        company_ar_id = None
+        if any(bti.applied_amount > 0
+               and not bti.invoice.customer.default_ar_account_id
+               for bti in btis):
+            company_ar_id = _ar_account_id(bt.company_id)
+        paid = set()
+        for bti in btis:
+            if bti.applied_amount > 0:
+                apply_payment_to_invoice(
+                    bti, batched=True, company_ar_id=company_ar_id)
+                paid.add(bti.invoice_id)
+
+        # outstanding/status of every paid invoice in one bulk UPDATE
+        # (same values the per-invoice conditional UPDATE would write)
+        mutated = [invs[pk] for pk in sorted(paid)]
+        for inv in mutated:
+            inv.outstanding_amount = remaining[inv.pk]
+            inv.status = "paid" if inv.outstanding_amount == 0 \
+                else "partially_paid"
+        Invoice.objects.bulk_update(
+            mutated, ["outstanding_amount", "status"], batch_size=500)
+        for inv in mutated:
+            log_action(
+                action="update",
+                instance=inv,
+                user=None,
+                changes={
+                    "outstanding_amount": str(inv.outstanding_amount),
+                    "status": inv.status,
+                },
+            )
+
+        # whole batch already added to applied_total_cached by the
+        # join-row triggers: status in one guarded UPDATE
+        _sync_bt_status(bt.pk)
+        # mirror _sync_bt_status(): nothing applied keeps the status
+        bt.applied_total_cached = total_applied
+        if total_applied >= bt.amount:
+            bt.status = "fully_applied"
+        elif total_applied > 0:
+            bt.status = "partially_applied"
+        log_action(
+            action="update",
+            instance=bt,
+            user=None,
+            changes={
+                "applied_total": str(bt.applied_total_cached),
+                "status": bt.status,
+            },
+        )
+
+        return [(bt, invs[ap["invoice_id"]]) for ap in invoice_applications]
 
 
 def apply_bill_payment(bt_id: int, bill_id: int, amount: float):
 
     with transaction.atomic():
+        return _do_apply_bill_payment(bt_id, bill_id, amount)
+
+
+def _do_apply_bill_payment(bt_id: int, bill_id: int, amount: float):
+    """apply_bill_payment() without its own transaction (caller's atomic())"""
+    # bank transaction + bill locked in lock_rows() order; the bill's
+    # balance is still validated by the conditional UPDATE below
+    locked = lock_rows((BankTransaction, bt_id), (Bill, bill_id))
+    bt = locked[BankTransaction][bt_id]
+    bill = locked[Bill][bill_id]
+
+    if bt.applied_total_cached + amount > bt.amount:
+        raise ValidationError(
+            "Applied amounts exceed bank transaction amount")
+
+    # Join row first: its clean() checks against the bill as loaded
+    BankTransactionBill.objects.create(
+        bank_transaction=bt,
+        bill=bill,
+        applied_amount=amount,
+        company=bt.company,
+    )
+
+    # Validate + apply in one statement: the WHERE guard rejects
+    # overpayment atomically
+    updated = Bill.objects.filter(
+        pk=bill_id, outstanding_amount__gte=amount
+    ).update(
+        outstanding_amount=F("outstanding_amount") - amount,
+        status=Case(
+            When(outstanding_amount=amount, then=Value("paid")),
+            default=F("status"),
+        ),
+    )
+    if not updated:
+        raise ValidationError("Payment exceeds bill outstanding amount")
+
+    # mirror the UPDATE on the locked bill (returned to callers)
+    bill.outstanding_amount -= amount
+    if bill.outstanding_amount <= 0:
+        bill.status = "paid"
+
+    # the join row's trigger added amount to applied_total_cached:
+    # status in one guarded UPDATE (no SUM, no full_clean save)
+    _sync_bt_status(bt.pk)
+    bt.applied_total_cached += amount
+    if bt.applied_total_cached >= bt.amount:
+        bt.status = "fully_applied"
+    else:
+        bt.status = "partially_applied"
+
+    return bt, bill
 
-        bt = BankTransaction.objects.select_for_update().get(pk=bt_id)
-        bill = Bill.objects.select_for_update().get(pk=bill_id)
-
-        if amount > bill.outstanding_amount:
-            raise ValidationError("Payment exceeds bill outstanding amount")
 
-        total_applied = bt.banktransactionbill_set.aggregate(
-            total=models.Sum("applied_amount")
-        )["total"] or Decimal("0")
-
-        if total_applied + amount > bt.amount:
+def apply_bank_tx_to_bill(bank_tx_id: int, bill_applications: List[Dict]):
+    """
+    Apply one bank transaction to many bills in a single pass:
+    one lock per table, one aggregate, one INSERT, one UPDATE
+    (same rules and messages as apply_bill_payment()).
+    """
+    with transaction.atomic():
+        # lock_rows() order: consistent across concurrent batches
+        ids = sorted({ap["bill_id"] for ap in bill_applications})
+        locked = lock_rows(
+            (BankTransaction, bank_tx_id), *((Bill, pk) for pk in ids))
+        bt = locked[BankTransaction][bank_tx_id]
+        bills = locked[Bill]
+        # company of every bill in one query, for the join rows' clean()
+        prefetch_related_objects(list(bills.values()), "company")
+
+        total_applied = bt.applied_total_cached
+
+        # unique_bank_tx_bill: one join row per (bank tx, bill), within
+        # the batch and against rows already applied (one query)
+        if len(ids) != len(bill_applications) or \
+                BankTransactionBill.objects.filter(
+                    bank_transaction_id=bank_tx_id, bill_id__in=ids,
+                ).exists():
             raise ValidationError(
-                "Applied amounts exceed bank transaction amount")
-
-        BankTransactionBill.objects.create(
-            bank_transaction=bt,
-            bill=bill,
-            applied_amount=amount,
-            company=bt.company,
-        )
+                "Bank transaction bill with this Bank transaction "
+                "and Bill already exists.")
 
-        bill.outstanding_amount -= amount
-        if bill.outstanding_amount <= 0:
-            bill.status = "paid"
-        bill.save(update_fields=["outstanding_amount", "status"])
-
-        total_applied += amount
+        remaining = {pk: bill.outstanding_amount for pk, bill in bills.items()}
+        btbs = []
+        for ap in bill_applications:
+            bill = bills[ap["bill_id"]]
+            amount = ap["amount"]
+            if bill.company_id != bt.company_id:
+                raise ValidationError(
+                    "Bill and BankTransaction must belong to same company")
+            if amount < 0:
+                raise ValidationError("Applied must be non-negative")
+            if amount > remaining[bill.pk]:
+                raise ValidationError("Payment exceeds bill outstanding amount")
+            if total_applied + amount > bt.amount:
+                raise ValidationError(
+                    "Applied amounts exceed bank transaction amount")
+            remaining[bill.pk] -= amount
+            total_applied += amount
+            btb = BankTransactionBill(
+                bank_transaction=bt,
+                bill=bill,
+                applied_amount=amount,
+                company=bt.company,
+            )
+            # the model's own rules, on the locked parents (no queries)
+            btb.clean()
+            btbs.append(btb)
+
+        BankTransactionBill.objects.bulk_create(btbs)
+
+        # only the bills something was applied to, in pk order
+        paid = {btb.bill_id for btb in btbs if btb.applied_amount > 0}
+        mutated = [bills[pk] for pk in sorted(paid)]
+        for bill in mutated:
+            bill.outstanding_amount = remaining[bill.pk]
+            if bill.outstanding_amount <= 0:
+                bill.status = "paid"
+        Bill.objects.bulk_update(
+            mutated, ["outstanding_amount", "status"], batch_size=500)
+
+        # whole batch already added to applied_total_cached by the
+        # join-row triggers: status in one guarded UPDATE
+        _sync_bt_status(bt.pk)
+        # mirror _sync_bt_status(): nothing applied keeps the status
+        bt.applied_total_cached = total_applied
         if total_applied >= bt.amount:
             bt.status = "fully_applied"
-        else:
+        elif total_applied > 0:
             bt.status = "partially_applied"
-        bt.save(update_fields=["status"])
 
-        return bt, bill
+        return [(bt, bills[ap["bill_id"]]) for ap in bill_applications]
 
 
-def apply_bank_tx_to_bill(bank_tx_id: int, bill_applications: List[Dict]):
-    with transaction.atomic():
-        results = []
-        for ap in bill_applications:
-            bill_id = ap["bill_id"]
-            amount = ap["amount"]
-            bt, bill = apply_bill_payment(bank_tx_id, bill_id, amount)
-            results.append((bt, bill))
-        return results
-    
-
-def apply_payment_to_invoice(bank_tx_invoice: "BankTransactionInvoice", user=None) -> JournalEntry:
+def apply_payment_to_invoice(bank_tx_invoice: "BankTransactionInvoice", user=None, batched=False,
+                             company_ar_id=None) -> JournalEntry:
     """
     Apply a payment (BankTransactionInvoice instance) to its invoice.
     Creates JournalEntry (cash receipt), updates invoice outstanding/status,
     updates bank_transaction applied totals and status, and persists the BankTransactionInvoice link.
-    Should be executed under transaction.atomic() and uses select_for_update for safety.
+    Should be executed under transaction.atomic(); locks the bank transaction
+    and invoice in lock_rows() order, the invoice balance is guarded by a
+    conditional UPDATE (outstanding_amount >= amount).
+    batched=True (apply_bank_tx_to_inv): the caller already holds the locks,
+    has validated the amounts, and writes the invoices (bulk_update) and the
+    bank transaction once for the whole batch.
+    company_ar_id: the company's AR control account, if already resolved.
     Returns the created (or existing) JournalEntry.
     """
     from ..models import BankTransaction, Invoice, BankTransactionInvoice  # avoid cyc import
@@ -149,70 +395,73 @@ def apply_payment_to_invoice(bank_tx_invoice: "BankTransactionInvoice", user=Non
     if not bt or not inv:
         raise ValidationError("Both bank_transaction and invoice must be set")
 
-    if amt is None or amt <= Decimal("0.00"):
+    if amt is None or amt <= ZERO:
         raise ValidationError("Applied amount must be positive")
 
     if bt.company_id != inv.company_id:
         raise ValidationError("Bank transaction and invoice must belong to same company")
 
-    with transaction.atomic():
-        # lock invoice row to avoid race conditions
-        inv = Invoice.objects.select_for_update().get(pk=inv.pk)
-
-        print("applied_amount:", amt)
-        print("outstanding_amount:", inv.outstanding_amount)
-
-        if amt > inv.outstanding_amount:
-            raise ValidationError("Applied amount exceeds invoice outstanding")
-
-        # persist the BankTransactionInvoice record if not saved
+    # Normally nested (BankTransactionInvoice.save() inside a payment
+    # workflow): join the caller's transaction instead of a SAVEPOINT;
+    # any error here propagates and rolls the whole unit back anyway
+    with transaction.atomic(savepoint=False):
+        # persist the BankTransactionInvoice record if not saved;
+        # its save() calls back in here and applies the payment
         if not bank_tx_invoice.pk:
             bank_tx_invoice.company = bank_tx_invoice.company or bt.company or inv.company
             bank_tx_invoice.save()
-
-        # idempotency: don't apply twice
-        existing_je = JournalEntry.objects.filter(
-            source_type='bank_transaction',
-            source_id=bt.pk,
-            lines__invoice=inv,
-            lines__credit_original=amt
-        ).distinct()
-        if existing_je.exists():
-            je = existing_je.first()
-        else:
-            # create payment JE
-            je = create_payment_journal(bt, inv, amt, user=user)
-
-        # update invoice outstanding and status
-        inv.outstanding_amount = (inv.outstanding_amount - amt).quantize(Decimal("0.01"))
-        if inv.outstanding_amount <= Decimal("0.00"):
-            inv.status = "paid"
-            inv.outstanding_amount = Decimal("0.00")
-        else:
-            inv.status = "partially_paid"
-        inv.save(update_fields=['outstanding_amount', 'status'])
-
-        # update bank transaction applied_total and status
-        # assume BankTransaction has methods applied_total() and a status field
-        bt = BankTransaction.objects.select_for_update().get(pk=bt.pk)
-        # Cached column check
-        if hasattr(bt, 'applied_total_cached'):
-            bt.applied_total_cached = bt.applied_total_cached + amt
-        # Set status by comparing applied_total() vs amount_received or bank_tx.amount
-        total_applied = getattr(bt, 'applied_total', lambda: None)()
-        # If applied_total() is a method and returns None when not implemented, compute by DB:
-        if total_applied is None:
-            total_applied = BankTransactionInvoice.objects.filter(bank_transaction=bt).aggregate(
-                total=Coalesce(Sum('applied_amount'), Decimal('0.00'))
-            )['total']
-        # Set status
-        if total_applied >= getattr(bt, 'amount', total_applied):
-            bt.status = 'fully_applied'
-        elif total_applied > Decimal("0.00"):
-            bt.status = 'partially_applied'
-        else:
-            bt.status = 'unapplied'
-        bt.save(update_fields=['status', 'applied_total_cached'] if hasattr(bt, 'applied_total_cached') else ['status'])
+            if bank_tx_invoice.journal_entry_id:
+                return bank_tx_invoice.journal_entry
+
+        # lazy %-formatting: nothing is rendered unless DEBUG is enabled
+        logger.debug("apply_payment bt=%s inv=%s amt=%s outstanding=%s",
+                     bt.pk, inv.pk, amt, inv.outstanding_amount)
+
+        if not batched:
+            # Same lock order as every other payment path (bank transaction,
+            # then invoice) before either row is UPDATEd: no AB/BA deadlock.
+            # Taken once, up front: the locked rows are the only re-reads
+            locked = lock_rows((BankTransaction, bt.pk), (Invoice, inv.pk))
+            locked_bt = locked[BankTransaction][bt.pk]
+            locked_inv = locked[Invoice][inv.pk]
+
+            # Validate + apply in one statement: the WHERE guard rejects
+            # overpayment atomically
+            updated = Invoice.objects.filter(
+                pk=inv.pk, outstanding_amount__gte=amt
+            ).update(
+                outstanding_amount=F("outstanding_amount") - amt,
+                status=Case(
+                    When(outstanding_amount=amt, then=Value("paid")),
+                    default=Value("partially_paid"),
+                ),
+            )
+            if not updated:
+                raise ValidationError("Applied amount exceeds invoice outstanding")
+            # mirror the UPDATE on the locked row (no re-read)
+            locked_inv.outstanding_amount -= amt
+            locked_inv.status = "paid" if locked_inv.outstanding_amount == 0 \
+                else "partially_paid"
+
+        # create payment JE; idempotent: an existing JE for the same
+        # bank transaction / invoice / amount is returned via its
+        # payment_fingerprint (already inside this function's atomic():
+        # no extra savepoint)
+        je = _do_create_payment_journal(
+            bt, inv, amt, user=user, company_ar_id=company_ar_id)
+
+        if not batched:
+            # bank transaction status in one guarded UPDATE; the join
+            # row's trigger already added amt to applied_total_cached,
+            # and the locked row was read after that insert
+            _sync_bt_status(bt.pk)
+            locked_bt.status = "fully_applied" \
+                if locked_bt.applied_total_cached >= locked_bt.amount \
+                else "partially_applied"
+
+            # values as written, for the audit log (bank_tx_invoice's own
+            # instances are left as the caller passed them)
+            bt, inv = locked_bt, locked_inv
 
         # AUDIT LOGS
         log_action(
@@ -226,25 +475,25 @@ def apply_payment_to_invoice(bank_tx_invoice: "BankTransactionInvoice", user=Non
             },
         )
 
-        log_action(
-            action="update",
-            instance=inv,
-            user=user,
-            changes={
-                "outstanding_amount": str(inv.outstanding_amount),
-                "status": inv.status,
-            },
-        )
-
-        log_action(
-            action="update",
-            instance=bt,
-            user=user,
-            changes={
-                "applied_total": str(bt.applied_total()),
-                "status": bt.status,
-            },
-        )
+        if not batched:
+            log_action(
+                action="update",
+                instance=inv,
+                user=user,
+                changes={
+                    "outstanding_amount": str(inv.outstanding_amount),
+                    "status": inv.status,
+                },
+            )
+            log_action(
+                action="update",
+                instance=bt,
+                user=user,
+                changes={
+                    "applied_total": str(bt.applied_total_cached),
+                    "status": bt.status,
+                },
+            )
 
         # mark BankTransactionInvoice as applied/persisted fields
         bank_tx_invoice.journal_entry = je  # keep reference
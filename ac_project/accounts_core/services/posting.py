@@ -1,11 +1,31 @@
+import hashlib
 from decimal import Decimal
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Min, Sum
 
 # Import models
 from ..models import (Account, BankTransaction, Invoice,
                      JournalEntry, JournalLine)
 
+# Decimal constants built once at import, not per call
+ZERO = Decimal("0.00")
+
+
+# JournalLine.bulk_create_for() specs for the one-sided line shapes;
+# account may be an Account or its pk
+def _debit_line(account, amount, **extra):
+    key = "account" if isinstance(account, Account) else "account_id"
+    return {key: account, "debit_original": amount,
+            "credit_original": ZERO, **extra}
+
+
+def _credit_line(account, amount, **extra):
+    key = "account" if isinstance(account, Account) else "account_id"
+    return {key: account, "debit_original": ZERO,
+            "credit_original": amount, **extra}
+
+
 # ----------------------------
 # Journal-related workflows
 # ----------------------------
@@ -15,23 +35,55 @@ def post_journal_entry(journal_entry_id, user=None):
     """
     with transaction.atomic():
         # Lock the row to avoid race conditions
-        je = JournalEntry.objects.select_for_update().get(pk=journal_entry_id)
+        # (FOR UPDATE, same lock JournalEntry.post() takes)
+        je = JournalEntry.objects.select_for_update().get(
+            pk=journal_entry_id)
         # call posting logic and update state
         je.transition_to("posted", user=user) # user=None means this parameter is optional
     return je
 
 
-def _get_ar_account_for_company(company):
+def _ar_account_id(company_id):
     # Prefer Customer.default_ar_account if present, else fallback to a known control code like '1130'
     # Adjust this lookup to match data (Account with is_control_account True, code '1130', etc.)
-    ar = Account.objects.filter(company=company, is_control_account=True, code__startswith="113").first()
-    if not ar:
+    # Read per call (pk only, never an instance): a per-process cache
+    # would keep posting to a changed account in every other worker.
+    # Batch callers resolve it once and pass it down (company_ar_id)
+    ar_id = Account.objects.filter(
+        company_id=company_id, is_control_account=True, code__startswith="113"
+    ).values_list("pk", flat=True).first()
+    if ar_id is None:
         raise ValidationError("No AR control account configured for company")
-    return ar
+    return ar_id
+
+def _invoice_credits(invoice: Invoice) -> dict:
+    """{revenue account_id: summed line_total} in one GROUP BY query"""
+    # one row per revenue account, no InvoiceLine objects (the NULL group,
+    # if any, carries the lowest offending line pk for the error message)
+    credits = {}
+    for account_id, total, first_pk in invoice.lines.values(
+            "account_id").annotate(
+                total=Sum("line_total"), first_pk=Min("pk")).order_by(
+                    "account_id").values_list("account_id", "total", "first_pk"):
+        if not account_id:
+            raise ValidationError(f"InvoiceLine {first_pk} has no revenue account")
+        credits[account_id] = total
+    return credits
+
 
 def create_invoice_journal(invoice: Invoice, user=None) -> JournalEntry:
+    """Create & post the invoice JE in its own transaction."""
+    with transaction.atomic():
+        return _do_create_invoice_journal(invoice, user=user)
+
+
+def _do_create_invoice_journal(invoice: Invoice, user=None, credits=None,
+                               company_ar_id=None) -> JournalEntry:
     """
     Create & post JE for invoice (revenue recognition).
+    No transaction of its own: run it inside the caller's atomic().
+    credits: _invoice_credits(invoice) if the caller already has it.
+    company_ar_id: _ar_account_id(company) if the caller already has it.
     Produces:
       Debit: Accounts Receivable (control) = invoice.total
       Credit: Revenue accounts (per line) = amounts per line
@@ -39,56 +91,52 @@ def create_invoice_journal(invoice: Invoice, user=None) -> JournalEntry:
     if invoice.total <= 0:
         raise ValidationError("Invoice total must be > 0 to post revenue JE")
 
+    # Bound once, not per line: company (one FK fetch at most) and the
+    # currency by id (bulk_create_for only needs currency_id)
+    company = invoice.company
+    currency_id = company.default_currency_id
+
     # pick AR control account
-    ar_account = invoice.customer.default_ar_account or _get_ar_account_for_company(invoice.company)
+    ar_account_id = (invoice.customer.default_ar_account_id or company_ar_id
+                     or _ar_account_id(invoice.company_id))
 
-    # Prepare credits aggregated by line.account
-    credits = {}
-    for line in invoice.lines.all():
-        if not line.account:
-            raise ValidationError(f"InvoiceLine {line.pk} has no revenue account")
-        credits.setdefault(line.account, Decimal("0.00"))
-        credits[line.account] += line.line_total
+    # Prepare credits aggregated by account in the DB
+    if credits is None:
+        credits = _invoice_credits(invoice)
 
     if not credits:
         raise ValidationError("Invoice has no lines to post")
 
-    with transaction.atomic():
-        je = JournalEntry.objects.create(
-            company=invoice.company,
-            date=invoice.date,
-            reference=f"Inv {invoice.invoice_number or invoice.pk}",
-            description=f"Invoice {invoice.invoice_number or invoice.pk}",
-            status="draft",
-            source_type="invoice",            
-            source_id=invoice.pk,          
-            created_by=user,
-        )
-        # Debit AR (single line)
-        JournalLine.objects.create(
-            company=invoice.company,
-            journal=je,
-            account=ar_account,
-            description=f"AR for Invoice {invoice.invoice_number or invoice.pk}",
-            currency=invoice.company.default_currency,
-            debit_original=invoice.total,
-            credit_original=Decimal("0.00"),
-            invoice=invoice, 
+    je = JournalEntry.objects.create(
+        company=company,
+        date=invoice.date,
+        reference=f"Inv {invoice.invoice_number or invoice.pk}",
+        description=f"Invoice {invoice.invoice_number or invoice.pk}",
+        status="draft",
+        source_type="invoice",            
+        source_id=invoice.pk,          
+        created_by=user,
+    )
+    # Debit AR (single line) + credit revenue per account:
+    # all lines validated together and written in one INSERT
+    specs = [_debit_line(
+        ar_account_id, invoice.total,
+        description=f"AR for Invoice {invoice.invoice_number or invoice.pk}",
+        currency_id=currency_id,
+        invoice=invoice,
+    )]
+    specs += [
+        _credit_line(
+            acct_id, amt,
+            description=f"Revenue: invoice {invoice.invoice_number or invoice.pk}",
+            currency_id=currency_id,
+            invoice=invoice,
         )
-        # Credit revenue per account
-        for acct, amt in credits.items():
-            JournalLine.objects.create(
-                company=invoice.company,
-                journal=je,
-                account=acct,
-                description=f"Revenue: invoice {invoice.invoice_number or invoice.pk}",
-                currency=invoice.company.default_currency,
-                debit_original=Decimal("0.00"),
-                credit_original=amt,
-                invoice=invoice, 
-            )
-        # Post (this runs validations & marks lines posted)
-        je.post(user=user)
+        for acct_id, amt in credits.items()
+    ]
+    JournalLine.bulk_create_for(je, specs)
+    # Post (this runs validations & marks lines posted)
+    je.post(user=user)
     return je
 
 def _resolve_bank_ledger_account(bank_account):
@@ -111,11 +159,27 @@ def _resolve_bank_ledger_account(bank_account):
     )
 
 
+def _payment_fingerprint(bank_tx_id, invoice_id, amount) -> bytes:
+    # Idempotency key of one payment application (JournalEntry.payment_fingerprint)
+    payload = f"{bank_tx_id}|{invoice_id}|{amount:.2f}"
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
 def create_payment_journal(bank_tx: BankTransaction, invoice: Invoice, amount: Decimal, user=None) -> JournalEntry:
+    """Create & post the payment JE in its own transaction."""
+    with transaction.atomic():
+        return _do_create_payment_journal(bank_tx, invoice, amount, user=user)
+
+
+def _do_create_payment_journal(bank_tx: BankTransaction, invoice: Invoice, amount: Decimal, user=None,
+                               company_ar_id=None) -> JournalEntry:
     """
     Create & post payment JE: debit bank account, credit AR control account.
+    No transaction of its own: run it inside the caller's atomic().
+    company_ar_id: _ar_account_id(company) if the caller already has it
+    (batch payment runs resolve it once).
     This should be called inside the same transaction that creates BankTransactionInvoice.
-    Idempotent-ish: check if a JE with same source_type/source_id and same fingerprint exists.
+    Idempotent: returns the JE already stored under the same payment_fingerprint.
     """
     if amount <= 0:
         raise ValidationError("Applied amount must be positive")
@@ -133,52 +197,48 @@ def create_payment_journal(bank_tx: BankTransaction, invoice: Invoice, amount: D
         raise ValidationError("Cannot resolve ledger account for bank transaction's bank_account")
 
 
-    ar_account = invoice.customer.default_ar_account or _get_ar_account_for_company(invoice.company)
+    ar_account_id = (invoice.customer.default_ar_account_id or company_ar_id
+                     or _ar_account_id(invoice.company_id))
+    # Bound once for both lines (currency by id, no Currency fetch)
+    company = invoice.company
+    currency_id = company.default_currency_id
 
-    # idempotency: try to find existing JE matching this bank_tx + invoice + amount
+    # idempotency: JE already posted for this bank_tx + invoice + amount?
+    # (one unique-index probe, no join through lines + DISTINCT)
+    fingerprint = _payment_fingerprint(bank_tx.pk, invoice.pk, amount)
     existing = JournalEntry.objects.filter(
-        source_type='bank_transaction',
-        source_id=bank_tx.pk,
-        lines__invoice=invoice,
-        lines__credit_original=amount,
-    ).distinct()
-    if existing.exists():
-        return existing.first()
+        payment_fingerprint=fingerprint).first()
+    if existing:
+        return existing
     
-    with transaction.atomic():
-        je = JournalEntry.objects.create(
-            company=invoice.company,
-            date=bank_tx.payment_date,
-            reference=f"Payment BT:{bank_tx.pk} → Inv:{invoice.invoice_number or invoice.pk}",
-            description=f"Payment for invoice {invoice.invoice_number or invoice.pk}",
-            status="draft",
-            source_type="bank_transaction",
-            source_id=bank_tx.pk,
-            created_by=user,
-        )
+    je = JournalEntry.objects.create(
+        company=company,
+        date=bank_tx.payment_date,
+        reference=f"Payment BT:{bank_tx.pk} → Inv:{invoice.invoice_number or invoice.pk}",
+        description=f"Payment for invoice {invoice.invoice_number or invoice.pk}",
+        status="draft",
+        source_type="bank_transaction",
+        source_id=bank_tx.pk,
+        created_by=user,
+        payment_fingerprint=fingerprint,
+    )
+    JournalLine.bulk_create_for(je, [
         # Debit bank account
-        JournalLine.objects.create(
-            company=invoice.company,
-            journal=je,
-            account=bank_account.ledger_account,  # bank_account is an Account in some designs; adapt if BankAccount and Account are different
+        _debit_line(
+            ledger_account, amount,  # bank_account is an Account in some designs; adapt if BankAccount and Account are different
             description=f"Bank receipt for invoice {invoice.invoice_number or invoice.pk}",
-            currency=invoice.company.default_currency,
-            debit_original=amount,
-            credit_original=Decimal("0.00"),
+            currency_id=currency_id,
             bank_transaction=bank_tx,
             invoice=invoice,
-        )
+        ),
         # Credit AR
-        JournalLine.objects.create(
-            company=invoice.company,
-            journal=je,
-            account=ar_account,
+        _credit_line(
+            ar_account_id, amount,
             description=f"Clear AR for invoice {invoice.invoice_number or invoice.pk}",
-            currency=invoice.company.default_currency,
-            debit_original=Decimal("0.00"),
-            credit_original=amount,
+            currency_id=currency_id,
             invoice=invoice,
-        )
+        ),
+    ])
 
-        je.post(user=user)
+    je.post(user=user)
     return je
@@ -1,19 +1,30 @@
+from decimal import Decimal
 from django.apps import apps
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 # Import models
-from ..models import (Bill, Invoice, JournalEntry)
-from .posting import create_invoice_journal
-from .payment import apply_inv_payment, apply_bill_payment
+from ..models import (Bill, Invoice, JournalEntry, JournalLine)
+from .posting import _do_create_invoice_journal, _invoice_credits
+from .payment import _do_apply_bill_payment, _do_apply_inv_payment
 from .audit_helper import log_action
 
+# Decimal constants built once at import, not per call
+ZERO = Decimal("0.00")
+
+MONEY = models.DecimalField(max_digits=18, decimal_places=2)
+
 
 # ----------------------------------------------
 # Invoice status update workflows
 # ----------------------------------------------
 """Move invoice from draft → open (after validation)."""
 def open_invoice(invoice: Invoice, user=None):
-    if not invoice.lines.exists():
+    # one GROUP BY over the lines serves both this check and the
+    # journal's revenue credits below (no separate exists() query)
+    credits = _invoice_credits(invoice)
+    if not credits:
         raise ValidationError("Cannot open invoice with no lines")
 
     # idempotency: don't post twice
@@ -23,8 +34,14 @@ def open_invoice(invoice: Invoice, user=None):
         return invoice
 
     # create the invoice/revenue JE and transition in one atomic operation
+    # (_do_*: runs in this transaction, no nested savepoint)
     with transaction.atomic():
-        create_invoice_journal(invoice, user=user)
+        # one query for the invoice + the company/customer the JE reads
+        # (instead of lazy FK fetches on whatever instance was passed in)
+        posting_invoice = Invoice.objects.select_related(
+            "company", "customer").get(pk=invoice.pk)
+        _do_create_invoice_journal(
+            posting_invoice, user=user, credits=credits)
         # Log Invoice creation
         log_action(
             action="create",
@@ -71,8 +88,9 @@ def pay_bill(bill: Bill):
 """ Apply payment to invoice and update transition statuses safely """
 def pay_inv_and_update_status(bt_id, invoice_id, amount):
 
+    # one transaction, no nested savepoint (_do_* skips its own atomic())
     with transaction.atomic():
-        bt, inv = apply_inv_payment(bt_id, invoice_id, amount)
+        bt, inv = _do_apply_inv_payment(bt_id, invoice_id, amount)
 
         """ update invoice status if needed """
         if inv.outstanding_amount == 0:
@@ -81,14 +99,18 @@ def pay_inv_and_update_status(bt_id, invoice_id, amount):
             inv.transition_to("open")
 
         """  update bank transaction status """
-        # Call BankTransaction.applied_total()
-        # to find how much of this transaction has been applied to invoices
-        if bt.applied_total() == 0:
-            bt.transition_to("unapplied")
-        elif bt.applied_total() < bt.amount:
-            bt.transition_to("partially_applied")
+        # applied_total_cached: how much of this transaction has been
+        # applied, kept by the payment UPDATE (no SUM aggregate here)
+        applied = bt.applied_total_cached
+        if applied == 0:
+            new_status = "unapplied"
+        elif applied < bt.amount:
+            new_status = "partially_applied"
         else:
-            bt.transition_to("fully_applied")
+            new_status = "fully_applied"
+        # that same UPDATE normally set it already
+        if bt.status != new_status:
+            bt.transition_to(new_status)
 
         return bt, inv
 
@@ -96,8 +118,9 @@ def pay_inv_and_update_status(bt_id, invoice_id, amount):
 """ Apply payment to bill and update transition statuses safely """
 def pay_bill_and_update_status(bt_id, bill_id, amount):
 
+    # one transaction, no nested savepoint (_do_* skips its own atomic())
     with transaction.atomic():
-        bt, bill = apply_bill_payment(bt_id, bill_id, amount)
+        bt, bill = _do_apply_bill_payment(bt_id, bill_id, amount)
 
         """ update bill status if needed """
         if bill.outstanding_amount == 0:
@@ -106,14 +129,18 @@ def pay_bill_and_update_status(bt_id, bill_id, amount):
             bill.transition_to("posted")
 
         """  update bank transaction status """
-        # Call BankTransaction.applied_total()
-        # to find how much of this transaction has been applied to bills
-        if bt.applied_total() == 0:
-            bt.transition_to("unapplied")
-        elif bt.applied_total() < bt.amount:
-            bt.transition_to("partially_applied")
+        # applied_total_cached: how much of this transaction has been
+        # applied, kept by the payment UPDATE (no SUM aggregate here)
+        applied = bt.applied_total_cached
+        if applied == 0:
+            new_status = "unapplied"
+        elif applied < bt.amount:
+            new_status = "partially_applied"
         else:
-            bt.transition_to("fully_applied")
+            new_status = "fully_applied"
+        # that same UPDATE normally set it already
+        if bt.status != new_status:
+            bt.transition_to(new_status)
 
         return bt, bill
 
@@ -122,28 +149,65 @@ def pay_bill_and_update_status(bt_id, bill_id, amount):
 # Snapshot update workflows
 # ------------------------------------
 def update_snapshots_for_journal(journal: JournalEntry):
-    """Recalculate balances for accounts touched by this journal."""
+    """Recalculate balances for accounts touched by this journal.
+
+    Set-based: read the touched account ids, bulk INSERT the missing
+    (company, account, date) rows, then one UPDATE adding each account's
+    line totals, instead of get_or_create() + save() per line.
+    Runs once per journal (snapshots_applied): calling it again adds
+    nothing.
+    """
     # Prevent circular import issue
     # Fetch models dynamically from Django app registry
     AccountBalanceSnapshot = apps.get_model(
         "accounts_core", "AccountBalanceSnapshot")
 
-    # Loop over each child JournalLine
-    # to update snapshot of corresponding account
-    for line in journal.lines.all():
-        # journal.journalline_set.all() works
-        # because Django automatically gives you reverse relation manager
-        # from (journal: JournalEntry) → JournalLine
-        snapshot, _ = AccountBalanceSnapshot.objects.get_or_create(
-            # Grab snapshot row for (company, account, date) or
-            # create one if missing
-            company=journal.company,
-            account=line.account,
+    account_ids = set(
+        journal.lines.values_list("account_id", flat=True).distinct())
+    if not account_ids:
+        return
+
+    with transaction.atomic():
+        # Claim the journal: only the first run adds its lines; a retried
+        # or duplicated task finds the flag set (the UPDATE's row lock
+        # serializes concurrent runs) and leaves the balances alone
+        claimed = JournalEntry.objects.filter(
+            pk=journal.pk, snapshots_applied=False,
+        ).update(snapshots_applied=True)
+        if not claimed:
+            return
+
+        # Create the zero rows for (company, account, date) if missing
+        AccountBalanceSnapshot.objects.bulk_create(
+            [
+                AccountBalanceSnapshot(
+                    company_id=journal.company_id,
+                    account_id=account_id,
+                    snapshot_date=journal.date,
+                )
+                for account_id in account_ids
+            ],
+            ignore_conflicts=True,  # uq_company_account_snapshot_date
+        )
+
+        # Add this journal's debit/credit per account to running balance
+        # for that day, in one UPDATE (correlated sums per snapshot row)
+        lines = JournalLine.objects.filter(
+            journal_id=journal.pk, account_id=OuterRef("account_id")
+        ).values("account_id")
+        zero = Value(ZERO, output_field=MONEY)
+
+        def line_sum(field):
+            return Coalesce(
+                Subquery(lines.annotate(total=Sum(field)).values("total")),
+                zero,
+            )
+
+        AccountBalanceSnapshot.objects.filter(
+            company_id=journal.company_id,
             snapshot_date=journal.date,
+            account_id__in=account_ids,
+        ).update(
+            debit_balance=F("debit_balance") + line_sum("debit_local"),
+            credit_balance=F("credit_balance") + line_sum("credit_local"),
         )
-        # Update debit/credit aggregates
-        # Add this line’s debit/credit to running balance for that day
-        # don’t try to add None
-        snapshot.debit_balance += line.debit_local or 0
-        snapshot.credit_balance += line.credit_local or 0
-        snapshot.save()  # Save updated snapshot
\ No newline at end of file
@@ -1,9 +1,9 @@
-from decimal import Decimal
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
 # Import models
 from ..models import (Bill, Invoice,
                      JournalEntry, JournalLine)
+from .posting import _credit_line, _debit_line
 
 
 # ------------------------------------
@@ -25,26 +25,17 @@ def post_invoice_to_journal(invoice: Invoice, user=None):
     )
 
     # Debit AR control account
-    JournalLine.objects.create(
-        journal=journal,
-        company=invoice.company,
-        account=ar_account,
-        debit_amount=invoice.total,
-        credit_amount=Decimal("0.00"),
-    )
+    specs = [_debit_line(ar_account, invoice.total)]
 
     # Credit revenue accounts from lines
     for line in invoice.lines.all():
         if not line.account or line.account.ac_type != "Income":
             raise ValidationError(
                 "Invoice line must point to an Income account.")
-        JournalLine.objects.create(
-            journal=journal,
-            company=invoice.company,
-            account=line.account,
-            debit_amount=Decimal("0.00"),
-            credit_amount=line.line_total,
-        )
+        specs.append(_credit_line(line.account, line.line_total))
+
+    # all lines in one batched INSERT
+    JournalLine.bulk_create_for(journal, specs)
     return journal
 
 
@@ -65,26 +56,18 @@ def post_bill_to_journal(bill: Bill, user=None):
         )
 
         # Debit expenses account from lines
+        specs = []
         for line in bill.lines.all():
             if not line.account or line.account.ac_type != "Expense":
                 raise ValidationError(
                     "Bill line must point to an Expense account.")
-            JournalLine.objects.create(
-                journal=journal,
-                company=bill.company,
-                account=line.account,
-                debit_amount=line.line_total,
-                credit_amount=Decimal("0.00"),
-            )
+            specs.append(_debit_line(line.account, line.line_total))
 
         # Credit AP control account
-        JournalLine.objects.create(
-            journal=journal,
-            company=bill.company,
-            account=ap_account,
-            debit_amount=Decimal("0.00"),
-            credit_amount=bill.total,
-        )
+        specs.append(_credit_line(ap_account, bill.total))
+
+        # all lines in one batched INSERT
+        JournalLine.bulk_create_for(journal, specs)
 
         bill.status = "posted"  # finalized & journal entry created
         bill.save(update_fields=["status"])
@@ -107,15 +90,6 @@ def post_fixed_asset_to_journal(asset, user=None):
             status="draft",
         )
 
-        # Debit the asset account
-        JournalLine.objects.create(
-            journal=journal,
-            company=asset.company,
-            account=asset.account,
-            debit_amount=asset.purchase_cost,
-            credit_amount=Decimal("0.00"),
-        )
-
         # Credit AP or Bank
         if asset.vendor and asset.vendor.default_ap_account:
             credit_account = asset.vendor.default_ap_account
@@ -126,13 +100,11 @@ def post_fixed_asset_to_journal(asset, user=None):
                 "Fixed asset must specify vendor (AP) or bank account."
             )
 
-        JournalLine.objects.create(
-            journal=journal,
-            company=asset.company,
-            account=credit_account,
-            debit_amount=Decimal("0.00"),
-            credit_amount=asset.purchase_cost,
-        )
+        # Debit the asset account, credit AP / bank: one batched INSERT
+        JournalLine.bulk_create_for(journal, [
+            _debit_line(asset.account, asset.purchase_cost),
+            _credit_line(credit_account, asset.purchase_cost),
+        ])
 
         asset.status = "capitalized"  # update lifecycle state
         asset.save(update_fields=["status"])
@@ -22,20 +22,14 @@ def prevent_delete_invoice_with_payments(sender, instance, **kwargs):
 
 """
     Recalculate invoice totals when a line is added/updated/removed.
-    Use update via model methods to keep validation/consistency.
+    One UPDATE with correlated sums, instead of fetch + 2 aggregates + save.
 """
 
 
 @receiver((post_save, post_delete), sender=InvoiceLine)
 def invoice_line_changed(sender, instance, **kwargs):
-    try:
-        inv = Invoice.objects.get(pk=instance.invoice_id)
-    except Invoice.DoesNotExist:
-        return
-    # recompute and save only the changed fields to reduce churn
-    inv.recalc_totals()
-    # save totals, no need to revalidate lines here
-    inv.save(update_fields=["total", "outstanding_amount"])
+    # a deleted (cascaded) invoice simply matches no rows
+    Invoice.refresh_totals_in_db(instance.invoice_id)
 
 
 """Block bill deletion if any payments are applied."""
@@ -64,3 +58,15 @@ def prevent_delete_period_with_posted_journals(sender, instance, **kwargs):
     if JournalEntry.objects.filter(period=instance, status="posted").exists():
         raise ValidationError(
             "Cannot delete a period with posted journal entries.")
+
+
+"""Let a journal's delete take its posted lines with it."""
+
+
+@receiver(pre_delete, sender=JournalEntry)
+def release_posted_lines_of_deleted_journal(sender, instance, **kwargs):
+    # The collector deletes lines before their journal, while the journal
+    # row still exists, so journalline_posted_undeletable (migration 0061)
+    # can't see the cascade: unmark them in the delete's transaction
+    JournalLine.objects.filter(
+        journal_id=instance.pk, is_posted=True).update(is_posted=False)
@@ -34,3 +34,16 @@ def recompute_all_snapshots(company_id):
             debit_balance=agg["debit"] or 0,
             credit_balance=agg["credit"] or 0,
         )
+
+
+@shared_task
+def update_journal_snapshots(journal_id):
+    # Snapshot refresh for one posted journal, queued by
+    # JournalEntry.post() on commit when ACCOUNTS_SNAPSHOTS_ASYNC is set
+    # Safe to retry/redeliver: a journal already applied is skipped
+    from .models import JournalEntry
+    from .services.update import update_snapshots_for_journal
+
+    journal = JournalEntry.objects.filter(pk=journal_id).first()
+    if journal is not None:
+        update_snapshots_for_journal(journal)
@@ -2,11 +2,14 @@ import datetime
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.test import TransactionTestCase
 
-from ..models import (BankAccount, BankTransaction, BankTransactionInvoice,
-                      Company, Currency, Invoice)
-from ..services import apply_bank_tx_to_inv
+from ..models import (Account, BankAccount, BankTransaction,
+                      BankTransactionBill, BankTransactionInvoice, Bill,
+                      Company, Currency, Customer, Invoice, JournalEntry,
+                      Period)
+from ..services.payment import apply_bank_tx_to_inv
 
 
 class ApplyBankTxTests(TransactionTestCase):
@@ -111,3 +114,230 @@ class ApplyBankTxTests(TransactionTestCase):
         # invoice1 outstanding must remain unchanged
         self.inv1.refresh_from_db()
         self.assertEqual(self.inv1.outstanding_amount, Decimal("200.00"))
+
+
+class BatchApplyTests(TransactionTestCase):
+    """Batched payment runs, with everything a payment JE posts to"""
+
+    reset_sequences = True
+
+    def setUp(self):
+        self.usd = Currency.objects.create(code="USD", name="US Dollar")
+        self.company = Company.objects.create(
+            name="Test Co", default_currency=self.usd)
+        Period.objects.create(
+            company=self.company,
+            name="2025-09",
+            start_date=datetime.date(2025, 9, 1),
+            end_date=datetime.date(2025, 9, 30),
+        )
+        # payment lines reference the invoice: control accounts only
+        self.cash = Account.objects.create(
+            company=self.company,
+            code="1110",
+            name="Bank",
+            ac_type="Asset",
+            normal_balance="debit",
+            is_control_account=True,
+        )
+        self.ar = Account.objects.create(
+            company=self.company,
+            code="1130",
+            name="Accounts Receivable",
+            ac_type="Asset",
+            normal_balance="debit",
+            is_control_account=True,
+        )
+        self.customer = Customer.objects.create(
+            company=self.company, name="Customer A",
+            default_ar_account=self.ar)
+        self.bank_account = BankAccount.objects.create(
+            company=self.company, name="Bank A", ledger_account=self.cash
+        )
+        self.bt = BankTransaction.objects.create(
+            company=self.company,
+            bank_account=self.bank_account,
+            payment_date=datetime.date(2025, 9, 17),
+            amount=Decimal("100.00"),
+            currency_code="USD",
+        )
+        self.inv1 = self.make_invoice("INV-1", Decimal("60.00"))
+        self.inv2 = self.make_invoice("INV-2", Decimal("150.00"))
+
+    def make_invoice(self, number, total):
+        return Invoice.objects.create(
+            company=self.company,
+            customer=self.customer,
+            invoice_number=number,
+            date=datetime.date(2025, 9, 17),
+            status="open",
+            total=total,
+            outstanding_amount=total,
+        )
+
+    def assertNothingApplied(self):
+        self.assertFalse(BankTransactionInvoice.objects.filter(
+            bank_transaction=self.bt).exists())
+        self.bt.refresh_from_db()
+        self.assertEqual(self.bt.applied_total_cached, Decimal("0.00"))
+        self.assertEqual(self.bt.status, "unapplied")
+
+    def test_negative_amount_is_rejected(self):
+        with self.assertRaisesMessage(
+                ValidationError, "Applied must be non-negative"):
+            apply_bank_tx_to_inv(self.bt.id, [
+                {"invoice_id": self.inv1.id, "amount": Decimal("10.00")},
+                {"invoice_id": self.inv2.id, "amount": Decimal("-5.00")},
+            ])
+
+        self.assertNothingApplied()
+
+    def test_duplicate_invoice_in_batch_is_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "already exists"):
+            apply_bank_tx_to_inv(self.bt.id, [
+                {"invoice_id": self.inv2.id, "amount": Decimal("10.00")},
+                {"invoice_id": self.inv2.id, "amount": Decimal("20.00")},
+            ])
+
+        self.assertNothingApplied()
+
+    def test_invoice_already_applied_is_rejected(self):
+        apply_bank_tx_to_inv(self.bt.id, [
+            {"invoice_id": self.inv2.id, "amount": Decimal("10.00")},
+        ])
+
+        # ValidationError, not the unique constraint's IntegrityError
+        with self.assertRaisesMessage(ValidationError, "already exists"):
+            apply_bank_tx_to_inv(self.bt.id, [
+                {"invoice_id": self.inv2.id, "amount": Decimal("20.00")},
+            ])
+
+        self.assertEqual(BankTransactionInvoice.objects.filter(
+            bank_transaction=self.bt).count(), 1)
+
+    def test_zero_amount_batch_keeps_status(self):
+        [(bt, _)] = apply_bank_tx_to_inv(self.bt.id, [
+            {"invoice_id": self.inv1.id, "amount": Decimal("0.00")},
+        ])
+
+        # nothing applied: neither the DB row nor the returned
+        # instance claim partially_applied
+        self.assertEqual(bt.status, "unapplied")
+        self.bt.refresh_from_db()
+        self.assertEqual(self.bt.status, "unapplied")
+
+    def test_batch_updates_bank_transaction_once_with_running_total(self):
+        [(bt, _), _] = apply_bank_tx_to_inv(self.bt.id, [
+            {"invoice_id": self.inv1.id, "amount": Decimal("60.00")},
+            {"invoice_id": self.inv2.id, "amount": Decimal("30.00")},
+        ])
+
+        # returned instance mirrors the row the triggers + UPDATE wrote
+        self.bt.refresh_from_db()
+        self.assertEqual(self.bt.applied_total_cached, Decimal("90.00"))
+        self.assertEqual(self.bt.status, "partially_applied")
+        self.assertEqual(bt.applied_total_cached, Decimal("90.00"))
+        self.assertEqual(bt.status, "partially_applied")
+
+        apply_bank_tx_to_inv(self.bt.id, [
+            {"invoice_id": self.make_invoice(
+                "INV-3", Decimal("10.00")).id, "amount": Decimal("10.00")},
+        ])
+        self.bt.refresh_from_db()
+        self.assertEqual(self.bt.applied_total_cached, Decimal("100.00"))
+        self.assertEqual(self.bt.status, "fully_applied")
+
+    def test_batch_over_bank_transaction_amount_is_rejected(self):
+        with self.assertRaisesMessage(
+                ValidationError,
+                "Applied amounts exceed bank transaction amount"):
+            apply_bank_tx_to_inv(self.bt.id, [
+                {"invoice_id": self.inv1.id, "amount": Decimal("60.00")},
+                {"invoice_id": self.inv2.id, "amount": Decimal("50.00")},
+            ])
+
+        self.assertNothingApplied()
+
+    def test_batch_writes_invoice_balances_and_statuses(self):
+        apply_bank_tx_to_inv(self.bt.id, [
+            {"invoice_id": self.inv1.id, "amount": Decimal("60.00")},
+            {"invoice_id": self.inv2.id, "amount": Decimal("40.00")},
+        ])
+
+        self.inv1.refresh_from_db()
+        self.inv2.refresh_from_db()
+        self.assertEqual(self.inv1.outstanding_amount, Decimal("0.00"))
+        self.assertEqual(self.inv1.status, "paid")
+        self.assertEqual(self.inv2.outstanding_amount, Decimal("110.00"))
+        self.assertEqual(self.inv2.status, "partially_paid")
+        # one posted payment JE per application
+        jes = JournalEntry.objects.filter(
+            source_type="bank_transaction", source_id=self.bt.pk)
+        self.assertEqual(jes.filter(status="posted").count(), 2)
+        self.assertTrue(all(je.is_balanced() for je in jes))
+
+    def test_single_application_over_bank_transaction_amount_raises(self):
+        apply_bank_tx_to_inv(self.bt.id, [
+            {"invoice_id": self.inv1.id, "amount": Decimal("60.00")},
+        ])
+
+        # No service pre-check on this path: the join row is inserted,
+        # then the guarded status UPDATE sees 110 > 100 and raises
+        # (as BankTransaction.clean() did before); the caller's
+        # transaction rolls the insert back
+        with self.assertRaisesMessage(
+                ValidationError,
+                "Applied amounts exceed bank transaction amount"):
+            with transaction.atomic():
+                BankTransactionInvoice.objects.create(
+                    company=self.company,
+                    bank_transaction=self.bt,
+                    invoice=self.inv2,
+                    applied_amount=Decimal("50.00"),
+                )
+
+        self.bt.refresh_from_db()
+        self.inv2.refresh_from_db()
+        self.assertEqual(self.bt.applied_total_cached, Decimal("60.00"))
+        self.assertEqual(self.inv2.outstanding_amount, Decimal("150.00"))
+        self.assertFalse(BankTransactionInvoice.objects.filter(
+            invoice=self.inv2).exists())
+
+    def test_applied_total_follows_join_rows_written_anywhere(self):
+        stale = BankTransaction.objects.get(pk=self.bt.pk)
+        apply_bank_tx_to_inv(self.bt.id, [
+            {"invoice_id": self.inv1.id, "amount": Decimal("60.00")},
+        ])
+        bill = Bill.objects.create(
+            company=self.company,
+            bill_number="BILL-1",
+            date=datetime.date(2025, 9, 17),
+            total=Decimal("30.00"),
+            outstanding_amount=Decimal("30.00"),
+        )
+
+        # bill application outside the payment services (e.g. admin)
+        btb = BankTransactionBill.objects.create(
+            company=self.company,
+            bank_transaction=self.bt,
+            bill=bill,
+            applied_amount=Decimal("20.00"),
+        )
+        self.bt.refresh_from_db()
+        self.assertEqual(self.bt.applied_total_cached, Decimal("80.00"))
+
+        # editing and deleting join rows move it too
+        btb.applied_amount = Decimal("25.00")
+        btb.save()
+        self.bt.refresh_from_db()
+        self.assertEqual(self.bt.applied_total_cached, Decimal("85.00"))
+        btb.delete()
+        self.bt.refresh_from_db()
+        self.assertEqual(self.bt.applied_total_cached, Decimal("60.00"))
+
+        # an instance loaded before the payment doesn't write back 0
+        stale.description = "edited"
+        stale.save()
+        self.bt.refresh_from_db()
+        self.assertEqual(self.bt.applied_total_cached, Decimal("60.00"))
+        self.assertEqual(self.bt.applied_total(), Decimal("60.00"))
@@ -67,7 +67,6 @@ class BillLifecycleTests(TestCase):
                     description=desc,
                     quantity=1,
                     unit_price=Decimal(amt),
-                    line_total=Decimal(amt),
                 )
         return bill
 
@@ -153,3 +152,30 @@ class BillLifecycleTests(TestCase):
             pay_bill(bill)
         bill.refresh_from_db()
         self.assertEqual(bill.status, "posted")
+
+    def test_apply_bank_tx_to_bill_rejects_duplicate_application(self):
+        bill = self.make_bill(
+            lines=[("Item", "50.00")],
+            total=Decimal("50.00"),
+            outstanding_amount=Decimal("50.00"),
+        )
+        post_bill(bill)
+        apply_bank_tx_to_bill(
+            self.bt.id, [{"bill_id": bill.id, "amount": Decimal("10.00")}])
+
+        # same bank transaction + bill again: rejected before any INSERT
+        message = ("Bank transaction bill with this Bank transaction "
+                   "and Bill already exists.")
+        with self.assertRaisesMessage(ValidationError, message):
+            apply_bank_tx_to_bill(
+                self.bt.id,
+                [{"bill_id": bill.id, "amount": Decimal("10.00")}])
+        # ... or twice within one batch
+        with self.assertRaisesMessage(ValidationError, message):
+            apply_bank_tx_to_bill(self.bt.id, [
+                {"bill_id": bill.id, "amount": Decimal("5.00")},
+                {"bill_id": bill.id, "amount": Decimal("5.00")},
+            ])
+
+        bill.refresh_from_db()
+        self.assertEqual(bill.outstanding_amount, Decimal("40.00"))
@@ -0,0 +1,114 @@
+import datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from ..models import (Account, Company, Currency, FixedAsset, JournalEntry,
+                      Period)
+from ..services.depreciate import depreciate_asset, depreciate_assets_for_period
+
+
+class DepreciationRunTests(TestCase):
+    def setUp(self):
+        self.usd = Currency.objects.create(code="USD", name="US Dollar")
+        self.company = Company.objects.create(
+            name="Test Co", default_currency=self.usd)
+        today = datetime.date.today()
+        self.period = Period.objects.create(
+            company=self.company,
+            name="current",
+            start_date=today - datetime.timedelta(days=1),
+            end_date=today + datetime.timedelta(days=1),
+        )
+        # fixed asset postings must use control accounts
+        self.expense = Account.objects.create(
+            company=self.company,
+            code="6400",
+            name="Depreciation Expense",
+            ac_type="Expense",
+            normal_balance="debit",
+            is_control_account=True,
+        )
+        Account.objects.create(
+            company=self.company,
+            code="1220",
+            name="Accumulated Depreciation",
+            ac_type="Asset",
+            normal_balance="credit",
+            is_control_account=True,
+        )
+
+    def make_asset(self, code, accumulated="0.00", status="draft"):
+        return FixedAsset.objects.create(
+            company=self.company,
+            asset_code=code,
+            description=f"Asset {code}",
+            purchase_cost=Decimal("1000.00"),
+            useful_life_years=3,
+            accumulated_depreciation=Decimal(accumulated),
+            status=status,
+        )
+
+    def test_run_posts_one_entry_per_depreciable_asset(self):
+        fresh = self.make_asset("FA-1")
+        almost_done = self.make_asset("FA-2", accumulated="900.00",
+                                      status="capitalized")
+        self.make_asset("FA-3", accumulated="1000.00", status="capitalized")
+        self.make_asset("FA-4", status="disposed")
+
+        jes = depreciate_assets_for_period(self.period.pk, self.company.pk)
+
+        # fully depreciated and disposed assets are skipped
+        self.assertEqual(len(jes), 2)
+        for je in JournalEntry.objects.filter(pk__in=[je.pk for je in jes]):
+            self.assertEqual(je.status, "posted")
+            self.assertTrue(je.is_balanced())
+        fresh.refresh_from_db()
+        almost_done.refresh_from_db()
+        # 1000 / 3 rounded half-up; the second one capped to what's left
+        self.assertEqual(fresh.accumulated_depreciation, Decimal("333.33"))
+        self.assertEqual(fresh.status, "capitalized")
+        self.assertEqual(
+            almost_done.accumulated_depreciation, Decimal("1000.00"))
+
+    def test_run_matches_single_asset_depreciation(self):
+        batched = self.make_asset("FA-1")
+        single = self.make_asset("FA-2")
+
+        depreciate_asset(single.pk, self.period.pk)
+        single.refresh_from_db()
+        # the run must not depreciate `single` twice in this comparison
+        single.status = "disposed"
+        single.save()
+        depreciate_assets_for_period(self.period.pk, self.company.pk)
+
+        batched.refresh_from_db()
+        self.assertEqual(
+            batched.accumulated_depreciation,
+            single.accumulated_depreciation)
+
+    def test_run_validates_lines_like_depreciate_asset(self):
+        asset = self.make_asset("FA-1")
+        self.expense.is_control_account = False
+        self.expense.save()
+
+        with self.assertRaisesMessage(
+                ValidationError,
+                "Fixed asset postings must use a control account."):
+            depreciate_assets_for_period(self.period.pk, self.company.pk)
+
+        # nothing of the run is kept
+        self.assertFalse(JournalEntry.objects.filter(
+            source_type="FixedAsset", source_id=asset.pk).exists())
+        asset.refresh_from_db()
+        self.assertEqual(asset.accumulated_depreciation, Decimal("0.00"))
+
+    def test_run_rejects_period_of_another_company(self):
+        other = Company.objects.create(
+            name="Other Co", slug="other_co", default_currency=self.usd)
+
+        with self.assertRaisesMessage(
+                ValidationError,
+                "Period must belong to the same company as the assets."):
+            depreciate_assets_for_period(self.period.pk, other.pk)
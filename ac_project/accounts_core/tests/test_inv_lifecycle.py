@@ -2,6 +2,7 @@ import datetime
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from django.test import TestCase
 
 from ..models import (Account, BankAccount, BankTransaction, Company, Currency,
@@ -67,7 +68,6 @@ class InvoiceLifecycleTests(TestCase):
                     description=desc,
                     quantity=1,
                     unit_price=Decimal(amt),
-                    line_total=Decimal(amt),
                 )
         return invoice
 
@@ -122,6 +122,31 @@ class InvoiceLifecycleTests(TestCase):
         with self.assertRaises(ValidationError):
             invoice.save()  # triggers model-level immutability
 
+    def test_paying_cannot_change_immutable_fields_in_same_save(self):
+        invoice = self.make_invoice(
+            lines=[("Item", "100.00")],
+            total=Decimal("100.00"),
+            outstanding_amount=Decimal("100.00"),
+        )
+        open_invoice(invoice)
+        apply_bank_tx_to_inv(
+            self.bt.id,
+            [{"invoice_id": invoice.id, "amount": Decimal("100.00")}],
+        )
+
+        # loaded as open: the paid trigger won't see this UPDATE
+        invoice = Invoice.objects.get(pk=invoice.pk)
+        invoice.status = "paid"
+        invoice.invoice_number = "INV-CHANGED"
+        with self.assertRaisesMessage(
+                ValidationError,
+                "Cannot modify ['invoice_number'] on a paid invoice."):
+            invoice.save()
+
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.status, "open")
+        self.assertEqual(invoice.invoice_number, "INV-001")
+
     def test_invalid_transition_directly_raises(self):
         invoice = self.make_invoice(
             lines=[("Item", "10.00")],
@@ -153,3 +178,86 @@ class InvoiceLifecycleTests(TestCase):
             pay_invoice(invoice)
         invoice.refresh_from_db()
         self.assertEqual(invoice.status, "open")
+
+    def test_bulk_create_for_inserts_lines_and_syncs_totals(self):
+        invoice = self.make_invoice()
+
+        created = InvoiceLine.bulk_create_for(invoice, [
+            {"item": self.item, "account": self.account,
+             "quantity": 2, "unit_price": Decimal("10.00")},
+            {"item": self.item, "account": self.account,
+             "quantity": 1, "unit_price": Decimal("5.00")},
+        ])
+
+        self.assertEqual(len(created), 2)
+        self.assertEqual(invoice.lines.count(), 2)
+        # bulk_create skips the line signals: totals synced once instead
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.total, Decimal("25.00"))
+        self.assertEqual(invoice.outstanding_amount, Decimal("25.00"))
+
+    def test_bulk_create_for_rejects_whole_batch_on_invalid_line(self):
+        invoice = self.make_invoice()
+        other = Company.objects.create(
+            name="Other Co", slug="other_co", default_currency=self.usd)
+        other_account = Account.objects.create(
+            company=other,
+            code="1140",
+            name="Inventory",
+            ac_type="Asset",
+            normal_balance="debit",
+        )
+
+        with self.assertRaises(ValidationError):
+            InvoiceLine.bulk_create_for(invoice, [
+                {"item": self.item, "account": self.account,
+                 "quantity": 1, "unit_price": Decimal("10.00")},
+                # account of another tenant
+                {"item": self.item, "account": other_account,
+                 "quantity": 1, "unit_price": Decimal("10.00")},
+            ])
+
+        self.assertFalse(invoice.lines.exists())
+
+    def make_paid_invoice(self):
+        # inserted as paid: invoice_paid_immutable guards its UPDATEs
+        Invoice.objects.create(
+            company=self.company,
+            invoice_number="INV-PAID",
+            total=Decimal("100.00"),
+            outstanding_amount=Decimal("0.00"),
+            status="paid",
+            date=datetime.date.today(),
+        )
+        return Invoice.objects.get(invoice_number="INV-PAID")
+
+    def test_paid_invoice_trigger_error_becomes_validationerror(self):
+        invoice = self.make_paid_invoice()
+
+        # model check skipped: the DB trigger is what rejects it
+        invoice.invoice_number = "INV-CHANGED"
+        with self.assertRaisesMessage(
+                ValidationError, "on a paid invoice"):
+            invoice.save(skip_validation=True)
+
+        # set-based path: no lines → total would drop to 0
+        with self.assertRaisesMessage(
+                ValidationError, "Cannot modify total on a paid invoice."):
+            Invoice.bulk_recalc_totals([invoice.pk])
+
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.invoice_number, "INV-PAID")
+        self.assertEqual(invoice.total, Decimal("100.00"))
+
+    def test_other_integrity_errors_are_not_reported_as_paid(self):
+        self.make_invoice()  # INV-001
+        other = Invoice.objects.create(
+            company=self.company,
+            invoice_number="INV-002",
+            date=datetime.date.today(),
+        )
+
+        # uq_invoice_company_number, not the paid-invoice trigger
+        other.invoice_number = "INV-001"
+        with self.assertRaises(IntegrityError):
+            other.save(skip_validation=True)
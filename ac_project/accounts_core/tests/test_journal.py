@@ -6,8 +6,8 @@ from django.core.exceptions import \
 from django.db.models.deletion import ProtectedError
 from django.test import TestCase
 
-from accounts_core.models import (Account, Company, Currency, JournalEntry,
-                                  JournalLine, User)
+from accounts_core.models import (Account, Company, Currency, Invoice,
+                                  JournalEntry, JournalLine, Period, User)
 
 from ..exceptions import AlreadyPostedDifferentPayload, UnbalancedJournalError
 
@@ -351,3 +351,131 @@ class JournalEntryFreezeTests(TestCase):
             line.delete()
 
         self.assertTrue(je.lines.filter(pk=line.pk).exists())
+
+
+class JournalLineBulkCreateTests(TestCase):
+    def setUp(self):
+        self.usd = Currency.objects.create(code="USD", name="US Dollar")
+        self.eur = Currency.objects.create(code="EUR", name="Euro")
+        self.company = Company.objects.create(
+            name="Test Co", default_currency=self.usd)
+        self.asset = Account.objects.create(
+            company=self.company,
+            code="1000",
+            name="Cash",
+            ac_type="Asset",
+            normal_balance="debit",
+        )
+        self.revenue = Account.objects.create(
+            company=self.company,
+            code="4000",
+            name="Revenue",
+            ac_type="Income",
+            normal_balance="credit",
+        )
+        self.je = JournalEntry.objects.create(
+            company=self.company, date=datetime.date.today(), status="draft"
+        )
+
+    def test_bulk_create_for_computes_local_amounts(self):
+        JournalLine.bulk_create_for(self.je, [
+            {"account": self.asset, "currency_id": self.eur.pk,
+             "fx_rate": Decimal("1.5"),
+             "debit_original": Decimal("100.00"),
+             "credit_original": Decimal("0.00")},
+            {"account": self.revenue, "currency_id": self.usd.pk,
+             "debit_original": Decimal("0.00"),
+             "credit_original": Decimal("150.00")},
+        ])
+
+        debit = self.je.lines.get(account=self.asset)
+        self.assertEqual(debit.debit_local, Decimal("150.00"))
+        self.assertTrue(self.je.is_balanced())
+
+    def test_bulk_create_for_rejects_unbalanced_line_shape(self):
+        with self.assertRaisesMessage(
+                ValidationError,
+                "JournalLine should not have both debit and credit > 0"):
+            JournalLine.bulk_create_for(self.je, [
+                {"account": self.asset, "currency_id": self.usd.pk,
+                 "debit_original": Decimal("10.00"),
+                 "credit_original": Decimal("10.00")},
+            ])
+
+        self.assertFalse(self.je.lines.exists())
+
+    def test_control_account_message_matches_clean(self):
+        invoice = Invoice.objects.create(
+            company=self.company, date=datetime.date.today())
+        spec = {"account": self.revenue, "currency_id": self.usd.pk,
+                "invoice": invoice,
+                "debit_original": Decimal("0.00"),
+                "credit_original": Decimal("10.00")}
+        message = "Invoice postings must use a control AR account."
+
+        # same rule, same message: one line through clean() ...
+        with self.assertRaisesMessage(ValidationError, message):
+            JournalLine(
+                journal=self.je, company=self.company, **spec).full_clean()
+        # ... and a batch through bulk_create_for()
+        with self.assertRaisesMessage(ValidationError, message):
+            JournalLine.bulk_create_for(self.je, [spec])
+
+
+class PostedJournalLineDeleteTests(TestCase):
+    def setUp(self):
+        self.usd = Currency.objects.create(code="USD", name="US Dollar")
+        self.company = Company.objects.create(
+            name="Test Co", default_currency=self.usd)
+        today = datetime.date.today()
+        Period.objects.create(
+            company=self.company,
+            name="current",
+            start_date=today - datetime.timedelta(days=1),
+            end_date=today + datetime.timedelta(days=1),
+        )
+        self.asset = Account.objects.create(
+            company=self.company,
+            code="1000",
+            name="Cash",
+            ac_type="Asset",
+            normal_balance="debit",
+        )
+        self.revenue = Account.objects.create(
+            company=self.company,
+            code="4000",
+            name="Revenue",
+            ac_type="Income",
+            normal_balance="credit",
+        )
+        self.je = JournalEntry.objects.create(
+            company=self.company, date=today, status="draft"
+        )
+        JournalLine.objects.create(
+            company=self.company, journal=self.je, account=self.asset,
+            currency=self.usd, debit_original=100
+        )
+        JournalLine.objects.create(
+            company=self.company, journal=self.je, account=self.revenue,
+            currency=self.usd, credit_original=100
+        )
+        self.je.post()
+
+    def test_posted_line_cannot_be_deleted(self):
+        line = self.je.lines.first()
+
+        # journalline_posted_undeletable trigger, reported as such
+        with self.assertRaisesMessage(
+                ValidationError, "parent JournalEntry is posted"):
+            line.delete()
+
+        self.assertTrue(JournalLine.objects.filter(pk=line.pk).exists())
+
+    def test_deleting_the_journal_takes_its_posted_lines(self):
+        line_pks = list(self.je.lines.values_list("pk", flat=True))
+
+        # cascade is not a "posted line delete"
+        self.je.delete()
+
+        self.assertFalse(JournalEntry.objects.filter(pk=self.je.pk).exists())
+        self.assertFalse(JournalLine.objects.filter(pk__in=line_pks).exists())
@@ -3,9 +3,11 @@ import json
 from decimal import Decimal
 
 import pytest
+from django.core.exceptions import ValidationError
 from django.test import RequestFactory, TestCase
 
-from accounts_core.models import Company, Currency, Invoice
+from accounts_core.models import (Account, Company, Currency, Invoice,
+                                  InvoiceLine, Item)
 from accounts_core.views import invoice_list
 
 
@@ -63,6 +65,79 @@ class TenantIsolationManagerTests(TestCase):
             Invoice.objects.for_company(self.company_a).get(pk=self.inv_b.pk)
 
 
+class InvoiceLineBulkValidateTests(TestCase):
+    def setUp(self):
+        self.usd = Currency.objects.create(code="USD", name="US Dollar")
+        self.company_a = Company.objects.create(
+            name="Company A", default_currency=self.usd
+        )
+        self.company_b = Company.objects.create(
+            name="Company B", default_currency=self.usd, slug="com_b"
+        )
+        self.inv_a = Invoice.objects.create(
+            invoice_number="A-1",
+            company=self.company_a,
+            date=datetime.date.today(),
+        )
+        self.revenue_a = Account.objects.create(
+            company=self.company_a,
+            code="4000",
+            name="Revenue A",
+            ac_type="Income",
+            normal_balance="credit",
+        )
+        self.revenue_b = Account.objects.create(
+            company=self.company_b,
+            code="4000",
+            name="Revenue B",
+            ac_type="Income",
+            normal_balance="credit",
+        )
+
+    def test_fills_company_from_invoice(self):
+        line = InvoiceLine(
+            invoice_id=self.inv_a.pk, account_id=self.revenue_a.pk)
+
+        InvoiceLine.bulk_validate([line])
+
+        self.assertEqual(line.company_id, self.company_a.pk)
+
+    def test_rejects_account_of_another_company(self):
+        lines = [
+            InvoiceLine(invoice_id=self.inv_a.pk,
+                        account_id=self.revenue_a.pk),
+            InvoiceLine(invoice_id=self.inv_a.pk,
+                        account_id=self.revenue_b.pk),  # other tenant
+        ]
+
+        with self.assertRaisesMessage(
+                ValidationError,
+                "InvoiceLine.company must match Account.company"):
+            InvoiceLine.bulk_validate(lines)
+
+    def test_rejects_unknown_invoice(self):
+        with self.assertRaisesMessage(
+                ValidationError, "Invoice 9999999 does not exist"):
+            InvoiceLine.bulk_validate([InvoiceLine(invoice_id=9999999)])
+
+    def test_checks_in_one_query_per_table(self):
+        item = Item.objects.create(
+            company=self.company_a,
+            sku="SKU-1",
+            name="Widget",
+            default_unit_price=Decimal("10.00"),
+        )
+        lines = [
+            InvoiceLine(invoice_id=self.inv_a.pk, item_id=item.pk,
+                        account_id=self.revenue_a.pk)
+            for _ in range(5)
+        ]
+
+        # invoices, items, accounts: not one lookup per line
+        with self.assertNumQueries(3):
+            InvoiceLine.bulk_validate(lines)
+
+
 @pytest.mark.django_db
 def test_invoice_list_returns_only_tenant_data(client, django_user_model):
     usd = Currency.objects.create(code="USD", name="US Dollar")